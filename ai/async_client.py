@@ -0,0 +1,331 @@
+"""
+Couche asynchrone des services web et IA de Zodiac OS
+Une boucle asyncio unique tourne dans un thread d'arrière-plan: les requêtes
+d'une même réponse (Wikipédia + recherche web + météo...) partent en même
+temps et la latence totale devient celle de la plus lente au lieu de la
+somme. Les appelants synchrones (interface Tk, assistant) passent par
+run() / research() sans toucher à asyncio.
+
+Les appels réseau restent ceux des clients existants (requests, session
+partagée de ai.http_client), exécutés dans un pool de threads dédié: pas de
+dépendance supplémentaire, et la limite de concurrence par hôte s'applique.
+"""
+
+import asyncio
+import functools
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeout
+from datetime import datetime
+from typing import Any, AsyncIterator, Awaitable, Dict, List, Optional
+
+_DONE = object()
+
+
+class AsyncRunner:
+    """Boucle asyncio dans un thread d'arrière-plan, avec façade synchrone"""
+
+    def __init__(self, workers: int = 8):
+        """
+        Args:
+            workers: Appels bloquants simultanés (requests, feedparser)
+        """
+        self.workers = workers
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        with self._lock:
+            if self.loop is not None:
+                return
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="zodiac-io")
+            self.loop = asyncio.new_event_loop()
+            self.loop.set_default_executor(self._executor)
+            ready = threading.Event()
+
+            def _run():
+                asyncio.set_event_loop(self.loop)
+                self.loop.call_soon(ready.set)
+                self.loop.run_forever()
+
+            self._thread = threading.Thread(target=_run, daemon=True, name="zodiac-asyncio")
+            self._thread.start()
+            ready.wait()
+
+    def stop(self):
+        with self._lock:
+            if self.loop is None:
+                return
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            self._thread.join(timeout=2.0)
+            self._executor.shutdown(wait=False)
+            self.loop = None
+
+    def submit(self, coro: Awaitable) -> Future:
+        """Planifie une coroutine sur la boucle (depuis n'importe quel thread)"""
+        self.start()
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def run(self, coro: Awaitable, timeout: Optional[float] = None) -> Any:
+        """Façade synchrone: exécute la coroutine et attend son résultat"""
+        if threading.current_thread() is self._thread:
+            raise RuntimeError("run() appelé depuis la boucle asyncio: utiliser await")
+        future = self.submit(coro)
+        try:
+            return future.result(timeout)
+        except FutureTimeout:
+            future.cancel()
+            raise
+
+    async def call(self, func, *args, **kwargs) -> Any:
+        """Exécute une fonction bloquante dans le pool sans bloquer la boucle"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, functools.partial(func, *args, **kwargs))
+
+
+_runner: Optional[AsyncRunner] = None
+_runner_lock = threading.Lock()
+
+
+def get_runner() -> AsyncRunner:
+    """Boucle asyncio partagée (démarrée au premier appel)"""
+    global _runner
+    if _runner is None:
+        with _runner_lock:
+            if _runner is None:
+                from ai.http_client import get_http_client
+                # Deux fois les requêtes simultanées du client HTTP: un appel abandonné par
+                # wait_for garde son thread jusqu'au délai HTTP, les suivants ont de la place
+                _runner = AsyncRunner(workers=get_http_client().max_concurrency * 2)
+    return _runner
+
+
+class _AsyncService:
+    """Variante asynchrone d'un client synchrone existant"""
+
+    def __init__(self, service, runner: Optional[AsyncRunner] = None):
+        self.service = service
+        self.runner = runner or get_runner()
+
+    async def _call(self, method: str, *args, **kwargs):
+        return await self.runner.call(getattr(self.service, method), *args, **kwargs)
+
+
+class AsyncWikiParser(_AsyncService):
+    """WikiParser asynchrone"""
+
+    def __init__(self, lang: str = "fr", runner: Optional[AsyncRunner] = None):
+        from ai.wiki_parser import WikiParser
+        super().__init__(WikiParser(lang), runner)
+
+    async def get_summary(self, query: str, sentences: int = 3) -> Optional[Dict]:
+        return await self._call("get_summary", query, sentences)
+
+    async def search_multiple(self, queries: List[str], sentences: int = 2) -> Dict:
+        """Résumés de plusieurs sujets en parallèle"""
+        results = await asyncio.gather(*(self.get_summary(q, sentences) for q in queries),
+                                       return_exceptions=True)
+        return {q: (r if not isinstance(r, Exception) else {"error": str(r)}) for q, r in zip(queries, results)}
+
+    async def get_random_article(self) -> Optional[Dict]:
+        return await self._call("get_random_article")
+
+
+class AsyncWebSearchAgent(_AsyncService):
+    """WebSearchAgent asynchrone"""
+
+    def __init__(self, max_results: int = 5, runner: Optional[AsyncRunner] = None):
+        from ai.web_search import WebSearchAgent
+        super().__init__(WebSearchAgent(max_results), runner)
+
+    async def search(self, query: str, engine: str = "duckduckgo") -> List[Dict]:
+        return await self._call("search", query, engine)
+
+    async def get_quick_answer(self, query: str) -> Optional[str]:
+        return await self._call("get_quick_answer", query)
+
+    async def search_engines(self, query: str, engines=("duckduckgo", "bing")) -> List[Dict]:
+        """Interroge plusieurs moteurs en parallèle et fusionne (sans doublons)"""
+        results = await asyncio.gather(*(self.search(query, e) for e in engines), return_exceptions=True)
+        merged, seen = [], set()
+        for batch in results:
+            if isinstance(batch, Exception):
+                continue
+            for item in batch:
+                url = item.get("url") or item.get("link")
+                if url not in seen:
+                    seen.add(url)
+                    merged.append(item)
+        return merged[:self.service.max_results]
+
+
+class AsyncWeatherModule(_AsyncService):
+    """WeatherModule asynchrone"""
+
+    def __init__(self, api_key: Optional[str] = None, runner: Optional[AsyncRunner] = None):
+        from ai.weather import WeatherModule
+        super().__init__(WeatherModule(api_key), runner)
+
+    async def get_weather(self, location: str, provider: Optional[str] = None) -> Optional[Dict]:
+        provider = provider or ("openweather" if self.service.api_key else "wttr")
+        return await self._call("get_weather", location, provider)
+
+    async def get_many(self, locations: List[str]) -> Dict[str, Optional[Dict]]:
+        """Météo de plusieurs villes en parallèle"""
+        results = await asyncio.gather(*(self.get_weather(loc) for loc in locations), return_exceptions=True)
+        return {loc: (r if not isinstance(r, Exception) else None) for loc, r in zip(locations, results)}
+
+
+def _published_timestamp(article: Dict) -> float:
+    """Date d'un article (struct_time de feedparser ou datetime par défaut)"""
+    published = article.get('published_parsed')
+    try:
+        if isinstance(published, datetime):
+            return published.timestamp()
+        return time.mktime(published)
+    except (TypeError, ValueError, OverflowError):
+        return 0.0
+
+
+class AsyncNewsFeed(_AsyncService):
+    """NewsFeed asynchrone: les flux RSS sont lus en parallèle"""
+
+    def __init__(self, cache_dir: str = "data/news", runner: Optional[AsyncRunner] = None):
+        from ai.news_feed import NewsFeed
+        super().__init__(NewsFeed(cache_dir), runner)
+
+    async def fetch_news(self, source: str = "all", limit: int = 10) -> List[Dict]:
+        if source != "all":
+            return await self._call("fetch_news", source, limit)
+
+        cached = self.service.load_from_cache(source, limit)
+        if cached:
+            return cached
+
+        feeds = list(self.service.feeds.items())
+        batches = await asyncio.gather(*(self._call("parse_feed", url, name) for name, url in feeds),
+                                       return_exceptions=True)
+        articles = []
+        for (name, _), batch in zip(feeds, batches):
+            if isinstance(batch, Exception):
+                print(f"✗ Erreur feed {name}: {batch}")
+                continue
+            articles.extend(batch)
+
+        articles.sort(key=_published_timestamp, reverse=True)
+        articles = articles[:limit]
+        self.service.save_to_cache(source, limit, articles)
+        return articles
+
+    async def search_news(self, query: str, limit: int = 10) -> List[Dict]:
+        return await self._call("search_news", query, limit)
+
+
+class AsyncChatClient(_AsyncService):
+    """Client de chat (DeepSeekAPI, GeminiAPI, ProviderRouter...) asynchrone"""
+
+    async def chat(self, message: str, context: Optional[str] = None):
+        return await self._call("chat", message, context)
+
+    async def chat_stream(self, message: str, context: Optional[str] = None) -> AsyncIterator[str]:
+        """Jetons de chat_stream() remis à la boucle au fil de l'eau"""
+        loop = asyncio.get_running_loop()
+        queue: asyncio.Queue = asyncio.Queue()
+
+        def _pump():
+            try:
+                for token in self.service.chat_stream(message, context):
+                    loop.call_soon_threadsafe(queue.put_nowait, token)
+            except Exception as e:
+                loop.call_soon_threadsafe(queue.put_nowait, f"❌ Erreur: {e}")
+            finally:
+                loop.call_soon_threadsafe(queue.put_nowait, _DONE)
+
+        pump = loop.run_in_executor(None, _pump)
+        while True:
+            token = await queue.get()
+            if token is _DONE:
+                break
+            yield token
+        await pump
+
+
+# --- Requêtes composées ---
+
+_services: Dict[tuple, _AsyncService] = {}
+_services_lock = threading.Lock()
+
+
+def _shared_service(cls, runner: AsyncRunner, *args) -> _AsyncService:
+    """Service asynchrone partagé (un WikiParser, un WebSearchAgent... par configuration)"""
+    key = (cls, runner, args)
+    service = _services.get(key)
+    if service is None:
+        with _services_lock:
+            service = _services.get(key)
+            if service is None:
+                service = _services[key] = cls(*args, runner=runner)
+    return service
+
+
+async def research_async(query: str, city: Optional[str] = None, lang: str = "fr",
+                         weather_api_key: Optional[str] = None, timeout: float = 12.0,
+                         runner: Optional[AsyncRunner] = None) -> Dict:
+    """
+    Wikipédia, réponse rapide DuckDuckGo, recherche web (et météo) en parallèle
+
+    Une source trop lente ou en erreur donne None sans retarder les autres.
+
+    Returns:
+        {"wiki", "quick_answer", "web", "weather", "timings_ms", "total_ms"}
+    """
+    runner = runner or get_runner()
+    wiki = _shared_service(AsyncWikiParser, runner, lang)
+    web = _shared_service(AsyncWebSearchAgent, runner)
+    tasks = {
+        "wiki": wiki.get_summary(query, 2),
+        "quick_answer": web.get_quick_answer(query),
+        "web": web.search(query),
+    }
+    if city:
+        tasks["weather"] = _shared_service(AsyncWeatherModule, runner, weather_api_key).get_weather(city)
+
+    timings: Dict[str, float] = {}
+    start = time.perf_counter()
+
+    async def timed(name, coro):
+        # Toutes les sources partent ensemble: durée propre = fin - départ commun
+        try:
+            return await asyncio.wait_for(coro, timeout)
+        except Exception as e:
+            print(f"⚠️ Source {name} indisponible: {e}")
+            return None
+        finally:
+            timings[name] = round((time.perf_counter() - start) * 1000, 1)
+
+    results = await asyncio.gather(*(timed(name, coro) for name, coro in tasks.items()))
+    answer = dict(zip(tasks, results))
+    answer.setdefault("weather", None)
+    answer["timings_ms"] = timings
+    answer["total_ms"] = round((time.perf_counter() - start) * 1000, 1)
+    return answer
+
+
+def research(query: str, city: Optional[str] = None, **options) -> Dict:
+    """Façade synchrone de research_async (pour les appelants hors asyncio)"""
+    runner = options.pop("runner", None) or get_runner()
+    timeout = options.get("timeout", 12.0)
+    return runner.run(research_async(query, city, runner=runner, **options), timeout=timeout + 2.0)
+
+
+if __name__ == "__main__":
+    import sys
+
+    query = " ".join(sys.argv[1:]) or "Tour Eiffel"
+    result = research(query, city="Paris")
+    print(f"Total: {result['total_ms']} ms (sources en parallèle)")
+    for name, ms in result["timings_ms"].items():
+        print(f"  {name}: {ms} ms, {'ok' if result.get(name) else 'vide'}")
+    print(f"En séquentiel: ~{sum(result['timings_ms'].values()):.0f} ms")
@@ -0,0 +1,353 @@
+"""
+Construction du contexte des requêtes IA pour Zodiac OS
+Un budget de jetons est réparti entre le contexte système, un résumé des
+anciens échanges, des extraits de fichiers pertinents et les derniers
+échanges. Les résumés et les découpages de fichiers sont gardés en cache
+pour ne pas être recalculés à chaque message.
+"""
+
+import hashlib
+import os
+import re
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Tuple
+
+_TOKEN_RE = re.compile(r"\w+|[^\w\s]", re.UNICODE)
+_SENTENCE_RE = re.compile(r"(?<=[.!?])\s+")
+
+# Extensions lues comme du texte
+TEXT_EXTENSIONS = ('.txt', '.py', '.js', '.html', '.css', '.json', '.md', '.xml', '.csv', '.log', '.ini', '.yaml', '.yml')
+
+# Mots ignorés pour juger de la pertinence d'un extrait
+STOP_WORDS = frozenset((
+    "le", "la", "les", "un", "une", "des", "de", "du", "et", "ou", "à", "au", "aux", "en",
+    "dans", "pour", "par", "sur", "avec", "est", "que", "qui", "quoi", "ce", "cette",
+    "il", "elle", "je", "tu", "vous", "nous", "mon", "ma", "mes", "the", "a", "of", "to", "is",
+))
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimation du nombre de jetons d'un texte (sans tokenizer)
+
+    Mots et signes de ponctuation comptés un par un, +30% pour les mots
+    découpés en plusieurs jetons: assez proche pour le français et l'anglais.
+    """
+    if not text:
+        return 0
+    return int(len(_TOKEN_RE.findall(text)) * 1.3) + 1
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """Coupe un texte pour qu'il tienne dans max_tokens (à la fin d'un mot)"""
+    if max_tokens <= 0:
+        return ""
+    if estimate_tokens(text) <= max_tokens:
+        return text
+    # Recherche dichotomique de la longueur qui tient dans le budget
+    low, high = 0, len(text)
+    while low < high:
+        middle = (low + high + 1) // 2
+        if estimate_tokens(text[:middle]) + 1 <= max_tokens:
+            low = middle
+        else:
+            high = middle - 1
+    cut = text[:low]
+    space = cut.rfind(" ")
+    if space > low // 2:
+        cut = cut[:space]
+    return cut.rstrip() + "…"
+
+
+def _keywords(text: str) -> set:
+    return {word for word in re.findall(r"\w+", text.lower()) if len(word) > 2 and word not in STOP_WORDS}
+
+
+class BuiltContext:
+    """Contexte prêt à envoyer"""
+
+    __slots__ = ("system", "history", "tokens", "dropped", "summarized")
+
+    def __init__(self, system: str, history: List[Dict], tokens: int, dropped: int, summarized: int):
+        self.system = system          # contexte, résumé et extraits de fichiers
+        self.history = history        # derniers échanges conservés tels quels
+        self.tokens = tokens          # estimation totale (message compris)
+        self.dropped = dropped        # messages ni gardés ni résumés
+        self.summarized = summarized  # messages remplacés par le résumé
+
+    def messages(self, message: str) -> List[Dict]:
+        """Messages au format OpenAI/DeepSeek (system, historique, message)"""
+        messages = [{"role": "system", "content": self.system}] if self.system else []
+        messages.extend({"role": msg["role"], "content": msg["content"]} for msg in self.history)
+        messages.append({"role": "user", "content": message})
+        return messages
+
+
+class ContextBuilder:
+    """Répartit un budget de jetons entre contexte, résumé, fichiers et historique"""
+
+    def __init__(self, max_tokens: int = 3000, reserve_reply: int = 1000,
+                 summary_tokens: int = 250, file_share: float = 0.35,
+                 min_recent: int = 2, summarizer: Optional[Callable[[Dict], str]] = None,
+                 cache_size: int = 512, retriever: Optional[Callable[[str, int, List[Dict]], str]] = None,
+                 memory_share: float = 0.15):
+        """
+        Args:
+            max_tokens: Fenêtre totale du modèle utilisée (requête + réponse)
+            reserve_reply: Jetons gardés pour la réponse
+            summary_tokens: Taille maximale du résumé des anciens échanges
+            file_share: Part maximale du budget pour les extraits de fichiers
+            min_recent: Derniers messages gardés en priorité (tronqués au besoin)
+            summarizer: Résumé d'un message {"role", "content"} -> texte
+                (par défaut: première phrase, raccourcie)
+            cache_size: Résumés et fichiers gardés en cache
+            retriever: Souvenirs liés au message (message, jetons max, historique) -> texte
+                (ex: LongTermMemory.retrieve)
+            memory_share: Part maximale du budget pour les souvenirs du retriever
+        """
+        self.max_tokens = max_tokens
+        self.reserve_reply = reserve_reply
+        self.summary_tokens = summary_tokens
+        self.file_share = file_share
+        self.min_recent = min_recent
+        self.summarizer = summarizer or self._summarize_message
+        self.cache_size = cache_size
+        self.retriever = retriever
+        self.memory_share = memory_share
+
+        self._summary_cache: "OrderedDict[str, str]" = OrderedDict()
+        self._file_cache: "OrderedDict[tuple, List[str]]" = OrderedDict()
+        self.stats = {"builds": 0, "summary_hits": 0, "summary_misses": 0, "file_hits": 0, "file_misses": 0,
+                      "recalls": 0, "recall_errors": 0}
+
+    # --- Résumés des anciens échanges ---
+
+    @staticmethod
+    def _summarize_message(message: Dict) -> str:
+        first = _SENTENCE_RE.split(message["content"].strip(), 1)[0]
+        return truncate_to_tokens(" ".join(first.split()), 30)
+
+    def _summary_line(self, message: Dict) -> str:
+        key = hashlib.sha1(f"{message['role']}\x00{message['content']}".encode("utf-8")).hexdigest()
+        line = self._summary_cache.get(key)
+        if line is not None:
+            self._summary_cache.move_to_end(key)
+            self.stats["summary_hits"] += 1
+            return line
+
+        self.stats["summary_misses"] += 1
+        prefix = "Utilisateur" if message["role"] == "user" else "Assistant"
+        line = f"- {prefix}: {self.summarizer(message)}"
+        self._summary_cache[key] = line
+        if len(self._summary_cache) > self.cache_size:
+            self._summary_cache.popitem(last=False)
+        return line
+
+    def summarize(self, messages: List[Dict], max_tokens: int) -> Tuple[str, int]:
+        """
+        Résumé des messages, les plus récents en priorité
+
+        Returns:
+            (résumé, nombre de messages résumés)
+        """
+        header = "Résumé des échanges précédents:"
+        used = estimate_tokens(header)
+        lines = []
+        for message in reversed(messages):
+            line = self._summary_line(message)
+            cost = estimate_tokens(line)
+            if used + cost > max_tokens:
+                break
+            lines.append(line)
+            used += cost
+        if not lines:
+            return "", 0
+        lines.reverse()
+        return "\n".join([header] + lines), len(lines)
+
+    # --- Extraits de fichiers ---
+
+    def _file_chunks(self, path: str) -> List[str]:
+        """Paragraphes d'un fichier texte (découpage gardé en cache tant que le fichier ne change pas)"""
+        stat = os.stat(path)
+        key = (path, stat.st_mtime, stat.st_size)
+        chunks = self._file_cache.get(key)
+        if chunks is not None:
+            self._file_cache.move_to_end(key)
+            self.stats["file_hits"] += 1
+            return chunks
+
+        self.stats["file_misses"] += 1
+        with open(path, "r", encoding="utf-8", errors="replace") as f:
+            content = f.read(200_000)
+
+        chunks = []
+        for paragraph in re.split(r"\n\s*\n", content):
+            paragraph = paragraph.strip()
+            # Paragraphes longs redécoupés en morceaux d'environ 600 caractères
+            while len(paragraph) > 800:
+                cut = paragraph.rfind("\n", 0, 600)
+                cut = cut if cut > 200 else 600
+                chunks.append(paragraph[:cut].strip())
+                paragraph = paragraph[cut:].strip()
+            if paragraph:
+                chunks.append(paragraph)
+
+        self._file_cache[key] = chunks
+        if len(self._file_cache) > 32:
+            self._file_cache.popitem(last=False)
+        return chunks
+
+    def file_excerpts(self, files: List[str], query: str, max_tokens: int) -> str:
+        """
+        Extraits des fichiers les plus proches de la requête, dans le budget
+
+        Le début de chaque fichier est toujours proposé (titre, en-tête),
+        puis les paragraphes qui partagent le plus de mots avec la requête.
+        """
+        if not files or max_tokens <= 0:
+            return ""
+        per_file = max(max_tokens // len(files), 40)
+        keywords = _keywords(query)
+        sections = []
+
+        for path in files:
+            name = os.path.basename(path)
+            if not os.path.exists(path):
+                sections.append(f"- {path} - Fichier non trouvé")
+                continue
+            ext = os.path.splitext(path)[1].lower()
+            if ext not in TEXT_EXTENSIONS:
+                sections.append(f"- {name} (fichier binaire, extension: {ext})")
+                continue
+            try:
+                chunks = self._file_chunks(path)
+            except OSError:
+                sections.append(f"- {name} - Impossible de lire")
+                continue
+
+            ranked = sorted(
+                range(len(chunks)),
+                key=lambda i: (-len(keywords & _keywords(chunks[i])), i) if i else (-1_000, 0)
+            )
+            budget = per_file - estimate_tokens(name) - 4
+            chosen = []
+            for index in ranked:
+                cost = estimate_tokens(chunks[index])
+                if cost > budget:
+                    if not chosen:
+                        chosen.append((index, truncate_to_tokens(chunks[index], budget)))
+                    continue
+                chosen.append((index, chunks[index]))
+                budget -= cost
+            excerpt = "\n[...]\n".join(text for _, text in sorted(chosen))
+            sections.append(f"- {name}:\n```\n{excerpt}\n```")
+
+        return "Fichiers fournis:\n" + "\n".join(sections)
+
+    # --- Souvenirs ---
+
+    def recall(self, message: str, history: List[Dict], max_tokens: int) -> str:
+        """Souvenirs du retriever, coupés au budget (une erreur n'empêche pas la requête)"""
+        if self.retriever is None or max_tokens <= 0:
+            return ""
+        try:
+            memories = self.retriever(message, max_tokens, history) or ""
+        except Exception as e:
+            self.stats["recall_errors"] += 1
+            print(f"⚠️ Souvenirs indisponibles: {e}")
+            return ""
+        if memories:
+            self.stats["recalls"] += 1
+        return truncate_to_tokens(memories, max_tokens)
+
+    # --- Assemblage ---
+
+    def build(self, message: str, history: List[Dict], system: Optional[str] = None,
+              files: Optional[List[str]] = None) -> BuiltContext:
+        """
+        Assemble le contexte d'une requête
+
+        Priorités: contexte système, derniers messages (min_recent), extraits
+        de fichiers, souvenirs du retriever, autres messages récents, résumé
+        de ce qui ne tient plus.
+
+        Args:
+            message: Nouveau message de l'utilisateur
+            history: Historique complet [{"role", "content"}, ...], du plus ancien au plus récent
+            system: Contexte système optionnel
+            files: Fichiers joints
+        """
+        self.stats["builds"] += 1
+        budget = self.max_tokens - self.reserve_reply - estimate_tokens(message)
+
+        system = truncate_to_tokens(system or "", max(budget // 4, 0))
+        budget -= estimate_tokens(system)
+
+        # Derniers messages gardés quoi qu'il arrive (tronqués si très longs)
+        recent: List[Dict] = []
+        for msg in history[-self.min_recent:] if self.min_recent else []:
+            content = truncate_to_tokens(msg["content"], max(budget // (self.min_recent + 1), 0))
+            recent.append({"role": msg["role"], "content": content})
+        budget -= sum(estimate_tokens(msg["content"]) for msg in recent)
+
+        excerpts = self.file_excerpts(files or [], message, int(budget * self.file_share))
+        budget -= estimate_tokens(excerpts)
+
+        memories = self.recall(message, history, int(budget * self.memory_share))
+        budget -= estimate_tokens(memories)
+
+        # Messages plus anciens tant qu'il reste de la place (résumé compris)
+        older = history[:-self.min_recent] if self.min_recent else list(history)
+        summary_budget = min(self.summary_tokens, budget // 3) if older else 0
+        kept = len(older)
+        remaining = budget - summary_budget
+        for msg in reversed(older):
+            cost = estimate_tokens(msg["content"])
+            if cost > remaining:
+                break
+            remaining -= cost
+            kept -= 1
+        recent = [dict(role=m["role"], content=m["content"]) for m in older[kept:]] + recent
+
+        # Les échanges gardés commencent par un message de l'utilisateur (Gemini
+        # refuse une conversation qui s'ouvre sur le modèle): une réponse en tête
+        # passe dans le résumé
+        to_summarize = older[:kept]
+        while recent and recent[0]["role"] != "user":
+            recent.pop(0)
+            if kept < len(older):
+                kept += 1
+                to_summarize = older[:kept]
+            else:
+                to_summarize = to_summarize + [history[len(history) - len(recent) - 1]]
+
+        summary, summarized = self.summarize(to_summarize, summary_budget) if to_summarize else ("", 0)
+
+        system_text = "\n\n".join(part for part in (system, summary, memories, excerpts) if part)
+        tokens = (estimate_tokens(system_text) + estimate_tokens(message)
+                  + sum(estimate_tokens(msg["content"]) for msg in recent))
+        return BuiltContext(system_text, recent, tokens, len(to_summarize) - summarized, summarized)
+
+    def get_stats(self) -> Dict:
+        return dict(self.stats, cached_summaries=len(self._summary_cache), cached_files=len(self._file_cache))
+
+
+if __name__ == "__main__":
+    import time
+
+    builder = ContextBuilder(max_tokens=1500, reserve_reply=500)
+    history = []
+    for i in range(40):
+        history.append({"role": "user", "content": f"Question {i}: peux-tu m'expliquer le point numéro {i} du projet ? " * 3})
+        history.append({"role": "assistant", "content": f"Réponse {i}. Voici une explication détaillée du point {i}. " * 8})
+
+    for attempt in ("froid", "chaud"):
+        start = time.perf_counter()
+        built = builder.build("Et le point 39 ?", history, system="Tu es Exocortex, assistant de Zodiac OS.")
+        elapsed = (time.perf_counter() - start) * 1000
+        print(f"{attempt}: {elapsed:.1f} ms, {built.tokens} jetons estimés, "
+              f"{len(built.history)} messages gardés, {built.summarized} résumés, {built.dropped} écartés")
+    naive = sum(estimate_tokens(m["content"]) for m in history)
+    print(f"Historique complet: {naive} jetons estimés")
+    print(builder.get_stats())
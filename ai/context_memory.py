@@ -3,29 +3,48 @@ Module 15: Context Memory
 Gestion de la mémoire contextuelle pour conversations
 """
 
-import json
 import os
+import threading
 from datetime import datetime
 from collections import deque
 from typing import List, Dict, Optional
+from ai.conversation_log import ConversationLog
 
 class ContextMemory:
-    def __init__(self, max_history: int = 5, data_dir: str = "data"):
+    def __init__(self, max_history: int = 50, data_dir: str = "data"):
         """
         Initialise la mémoire contextuelle
         
         Args:
-            max_history: Nombre maximum de messages à conserver
+            max_history: Nombre maximum de messages à conserver (ce qui est envoyé
+                à l'IA est choisi par build_context selon le budget de jetons)
             data_dir: Répertoire de stockage des données
         """
         self.max_history = max_history
         self.data_dir = data_dir
         self.conversation_history = deque(maxlen=max_history)
         self.conversation_file = os.path.join(data_dir, "conversations.json")
+        self.context_builder = None
+        self.session_id = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
         
         # Créer le dossier data s'il n'existe pas
         os.makedirs(data_dir, exist_ok=True)
         
+        # Journal des messages (une ligne par message, écrit en arrière-plan);
+        # des mois d'historique restent consultables par search_in_memory
+        self.log = ConversationLog(os.path.join(data_dir, "conversations.jsonl"),
+                                   keep_sessions=1000, compact_above=50_000_000)
+        
+        # Index plein texte de tout le journal (construit à la première recherche)
+        self._index = None
+        self._index_lock = threading.Lock()
+        self._index_build_lock = threading.Lock()
+        # Messages ajoutés pendant la construction de l'index (None hors construction)
+        self._index_backlog = None
+        
+        # Mémoire à long terme (souvenirs par proximité de sens), activée par enable_long_term
+        self.long_term = None
+        
         # Charger l'historique précédent
         self.load_history()
     
@@ -48,10 +67,14 @@ class ContextMemory:
         }
         
         self.conversation_history.append(message)
-        
-        # Sauvegarder périodiquement
-        if len(self.conversation_history) % 3 == 0:
-            self.save_history()
+        with self._index_lock:
+            self.log.append(self.session_id, message)
+            if self._index is not None:
+                self._index.add(message, self.session_id)
+            elif self._index_backlog is not None:
+                self._index_backlog.append((self.session_id, message))
+        if self.long_term is not None:
+            self.long_term.add_message(role, content, self.session_id, timestamp)
     
     def get_recent_context(self, n: Optional[int] = None) -> List[Dict]:
         """
@@ -67,6 +90,49 @@ class ContextMemory:
             return list(self.conversation_history)
         return list(self.conversation_history)[-n:]
     
+    def build_context(self, message: str, builder=None, system: Optional[str] = None,
+                      files: Optional[List[str]] = None):
+        """
+        Contexte à envoyer avec un message, dans le budget de jetons du builder
+        
+        Args:
+            message: Nouveau message de l'utilisateur
+            builder: ContextBuilder (celui de la mémoire par défaut)
+            system: Contexte système optionnel
+            files: Fichiers joints
+        
+        Returns:
+            BuiltContext (contexte système + résumé, derniers messages)
+        """
+        if builder is None:
+            if self.context_builder is None:
+                from ai.context_builder import ContextBuilder
+                self.context_builder = ContextBuilder(
+                    retriever=self.long_term.retrieve if self.long_term is not None else None)
+            builder = self.context_builder
+        return builder.build(message, list(self.conversation_history), system=system, files=files)
+    
+    def enable_long_term(self, notes_dir: Optional[str] = None, **options):
+        """
+        Active la mémoire à long terme: échanges du journal et notes indexés en
+        arrière-plan, puis chaque nouvel échange au fil de l'eau
+        
+        Args:
+            notes_dir: Dossier des notes (par défaut: data/notes)
+            options: Paramètres de LongTermMemory (k, budget_ms...)
+        
+        Returns:
+            LongTermMemory, dont retrieve() se branche sur un ContextBuilder
+        """
+        if self.long_term is None:
+            from ai.vector_memory import LongTermMemory
+            self.log.flush()
+            self.long_term = LongTermMemory(self.log, notes_dir or os.path.join(self.data_dir, "notes"), **options)
+            self.long_term.start(live_session=self.session_id)
+            if self.context_builder is not None:
+                self.context_builder.retriever = self.long_term.retrieve
+        return self.long_term
+    
     def get_conversation_summary(self) -> str:
         """
         Génère un résumé de la conversation
@@ -95,74 +161,88 @@ class ContextMemory:
     def clear_memory(self):
         """Efface la mémoire contextuelle"""
         self.conversation_history.clear()
+        # Nouvelle session: les messages effacés ne reviennent pas au prochain démarrage
+        self.session_id = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+        self.log.start_session(self.session_id)
         print("✓ Mémoire contextuelle effacée")
     
     def save_history(self):
-        """Sauvegarde l'historique dans un fichier JSON"""
-        try:
-            # Charger l'historique existant
-            all_conversations = []
-            if os.path.exists(self.conversation_file):
-                with open(self.conversation_file, 'r', encoding='utf-8') as f:
-                    all_conversations = json.load(f)
-            
-            # Ajouter la conversation actuelle
-            session_data = {
-                "session_id": datetime.now().strftime("%Y%m%d_%H%M%S"),
-                "timestamp": datetime.now().isoformat(),
-                "messages": list(self.conversation_history)
-            }
-            
-            # Conserver les 10 dernières sessions maximum
-            all_conversations.append(session_data)
-            if len(all_conversations) > 10:
-                all_conversations = all_conversations[-10:]
-            
-            # Sauvegarder
-            with open(self.conversation_file, 'w', encoding='utf-8') as f:
-                json.dump(all_conversations, f, ensure_ascii=False, indent=2)
-            
-            return True
-        except Exception as e:
-            print(f"✗ Erreur sauvegarde historique: {e}")
-            return False
+        """Attend l'écriture sur disque des messages ajoutés (ils sont journalisés au fil de l'eau)"""
+        return self.log.flush()
     
     def load_history(self):
-        """Charge l'historique depuis le fichier JSON"""
+        """
+        Recharge les derniers messages du journal, sessions précédentes
+        comprises (reprend l'ancien conversations.json une fois)
+        """
         try:
-            if os.path.exists(self.conversation_file):
-                with open(self.conversation_file, 'r', encoding='utf-8') as f:
-                    all_conversations = json.load(f)
-                
-                if all_conversations:
-                    # Charger la dernière session
-                    last_session = all_conversations[-1]
-                    self.conversation_history.extend(last_session["messages"])
-                    print(f"✓ Historique chargé: {len(self.conversation_history)} messages")
-                    return True
+            if not os.path.exists(self.log.path) and os.path.exists(self.conversation_file):
+                count = self.log.import_snapshots(self.conversation_file)
+                print(f"✓ Ancien historique importé: {count} messages")
+            
+            messages = self.log.recent_messages(self.max_history)
+            if messages:
+                self.conversation_history.extend(messages)
+                print(f"✓ Historique chargé: {len(self.conversation_history)} messages")
+                return True
         except Exception as e:
             print(f"✗ Erreur chargement historique: {e}")
         
         return False
     
-    def search_in_memory(self, keyword: str) -> List[Dict]:
+    def _get_index(self):
+        """
+        Index de l'historique complet, construit depuis le journal au premier
+        appel (hors du verrou d'add_message: l'interface n'attend pas)
+        """
+        if self._index is not None:
+            return self._index
+        with self._index_build_lock:
+            if self._index is not None:
+                return self._index
+            from ai.history_index import HistoryIndex
+            with self._index_lock:
+                self._index_backlog = []
+            index = HistoryIndex()
+            sessions = {}
+            try:
+                self.log.flush()
+                sessions = self.log.read_sessions()
+                for session_id, messages in sessions.items():
+                    index.add_many((session_id, msg) for msg in messages)
+            except Exception as e:
+                print(f"⚠️ Index de l'historique incomplet: {e}")
+            
+            with self._index_lock:
+                backlog, self._index_backlog = self._index_backlog, None
+                # Les messages ajoutés pendant la lecture peuvent déjà être dans le journal lu
+                read = {(session_id, msg.get("timestamp"), msg.get("role"), msg.get("content"))
+                        for session_id, messages in sessions.items()
+                        for msg in messages[-len(backlog):]} if backlog else set()
+                for session_id, message in backlog:
+                    key = (session_id, message.get("timestamp"), message.get("role"), message.get("content"))
+                    if key not in read:
+                        index.add(message, session_id)
+                self._index = index
+            return self._index
+    
+    def search_in_memory(self, keyword: str, limit: int = 20, role: Optional[str] = None) -> List[Dict]:
         """
-        Recherche des messages contenant un mot-clé
+        Recherche dans tout l'historique (toutes sessions), accents et
+        majuscules indifférents; une période dans la requête ("hier",
+        "la semaine dernière", "il y a 3 jours") limite la recherche
         
         Args:
-            keyword: Mot-clé à rechercher
+            keyword: Mots-clés ou question ("météo la semaine dernière")
+            limit: Nombre maximum de résultats
+            role: 'user' ou 'assistant' pour filtrer
         
         Returns:
-            Liste des messages correspondants
+            Liste des messages correspondants (avec "session" et "score"), du plus pertinent au moins pertinent
         """
-        results = []
-        keyword_lower = keyword.lower()
-        
-        for msg in self.conversation_history:
-            if keyword_lower in msg["content"].lower():
-                results.append(msg)
-        
-        return results
+        from ai.history_index import parse_period
+        text, since, until = parse_period(keyword)
+        return self._get_index().search(text, limit=limit, role=role, since=since, until=until)
 
 # Test du module
 if __name__ == "__main__":
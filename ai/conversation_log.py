@@ -0,0 +1,240 @@
+"""
+Journal des conversations de Zodiac OS (JSON Lines, ajout seul)
+Chaque message est une ligne ajoutée en fin de fichier par un thread
+d'écriture: ajouter un message ne coûte qu'une mise en file pour l'appelant
+et une ligne sur le disque, sans relire ni réécrire l'historique. Une ligne
+coupée par un arrêt brutal est ignorée à la lecture; le compactage réécrit
+le journal (fichier temporaire puis remplacement) en ne gardant que les
+dernières sessions.
+"""
+
+import atexit
+import json
+import os
+import queue
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, List, Optional
+
+_STOP = object()
+
+
+class ConversationLog:
+    """Journal des messages, une ligne JSON par message"""
+
+    def __init__(self, path: str = "data/conversations.jsonl", keep_sessions: int = 10,
+                 compact_above: int = 1_000_000, batch_size: int = 64, fsync: bool = True):
+        """
+        Args:
+            path: Fichier du journal
+            keep_sessions: Sessions gardées lors d'un compactage
+            compact_above: Taille (octets) au-delà de laquelle le journal est compacté à l'ouverture
+            batch_size: Lignes écrites au plus par passage du thread d'écriture
+            fsync: Force l'écriture sur disque après chaque lot (résiste aux coupures)
+        """
+        self.path = path
+        self.keep_sessions = keep_sessions
+        self.compact_above = compact_above
+        self.batch_size = batch_size
+        self.fsync = fsync
+
+        self._queue: "queue.Queue" = queue.Queue()
+        self._file = None
+        self._thread = None
+        self._lock = threading.Lock()
+        self.stats = {"appended": 0, "written": 0, "batches": 0, "compactions": 0, "corrupt_lines": 0}
+
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+
+    # --- Écriture ---
+
+    def start(self):
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._writer, daemon=True, name="zodiac-conversation-log")
+            self._thread.start()
+            atexit.register(self.close)
+        if os.path.exists(self.path) and os.path.getsize(self.path) > self.compact_above:
+            self.compact()
+
+    def append(self, session_id: str, message: Dict):
+        """Ajoute un message au journal (retour immédiat, écriture en arrière-plan)"""
+        self.start()
+        record = dict(message, session=session_id)
+        self.stats["appended"] += 1
+        self._queue.put(("write", json.dumps(record, ensure_ascii=False)))
+
+    def start_session(self, session_id: str):
+        """
+        Marque le début d'une session: même vide, elle devient la dernière
+        session du journal (les messages précédents ne sont plus rechargés)
+        """
+        self.start()
+        record = {"session": session_id, "event": "start", "timestamp": datetime.now().isoformat()}
+        self._queue.put(("write", json.dumps(record, ensure_ascii=False)))
+
+    def flush(self, timeout: Optional[float] = 5.0) -> bool:
+        """Attend que tout ce qui a été ajouté soit sur le disque"""
+        if self._thread is None:
+            return True
+        done = threading.Event()
+        self._queue.put(("flush", done))
+        return done.wait(timeout)
+
+    def compact(self, keep_sessions: Optional[int] = None):
+        """Réécrit le journal en ne gardant que les dernières sessions (dans le thread d'écriture)"""
+        self.start()
+        self._queue.put(("compact", keep_sessions or self.keep_sessions))
+
+    def close(self):
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            self._queue.put((_STOP, None))
+            thread.join(timeout=5.0)
+
+    def _open(self):
+        if self._file is None:
+            self._file = open(self.path, "a+b")
+            # Dernière ligne coupée par un arrêt brutal: on repart sur une ligne neuve
+            self._file.seek(0, os.SEEK_END)
+            if self._file.tell() > 0:
+                self._file.seek(-1, os.SEEK_END)
+                if self._file.read(1) != b"\n":
+                    self._file.write(b"\n")
+        return self._file
+
+    def _writer(self):
+        while True:
+            batch = [self._queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            lines = [payload for kind, payload in batch if kind == "write"]
+            if lines:
+                try:
+                    f = self._open()
+                    f.write(("\n".join(lines) + "\n").encode("utf-8"))
+                    f.flush()
+                    if self.fsync:
+                        os.fsync(f.fileno())
+                    self.stats["written"] += len(lines)
+                    self.stats["batches"] += 1
+                except Exception as e:
+                    print(f"✗ Erreur écriture journal des conversations: {e}")
+
+            for kind, payload in batch:
+                if kind == "compact":
+                    self._compact(payload)
+                elif kind == "flush":
+                    payload.set()
+                elif kind is _STOP:
+                    if self._file is not None:
+                        self._file.close()
+                        self._file = None
+                    return
+
+    def _compact(self, keep_sessions: int):
+        try:
+            sessions, started = self._read()
+            kept = list(sessions.items())[-keep_sessions:]
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "wb") as f:
+                for session_id, messages in kept:
+                    if session_id in started:
+                        # Session ouverte par start_session: son marqueur est gardé
+                        f.write((json.dumps({"session": session_id, "event": "start"}) + "\n").encode("utf-8"))
+                    for message in messages:
+                        f.write((json.dumps(dict(message, session=session_id), ensure_ascii=False) + "\n").encode("utf-8"))
+                f.flush()
+                os.fsync(f.fileno())
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+            os.replace(tmp_path, self.path)
+            self.stats["compactions"] += 1
+            print(f"✓ Journal des conversations compacté: {len(kept)} sessions gardées")
+        except Exception as e:
+            print(f"✗ Erreur compactage journal: {e}")
+
+    # --- Lecture ---
+
+    def read_sessions(self) -> "OrderedDict[str, List[Dict]]":
+        """Messages par session, dans l'ordre du journal (les sessions marquées sans message sont vides)"""
+        return self._read()[0]
+
+    def _read(self):
+        """(messages par session, sessions ouvertes par start_session)"""
+        sessions: "OrderedDict[str, List[Dict]]" = OrderedDict()
+        started = set()
+        if not os.path.exists(self.path):
+            return sessions, started
+        with open(self.path, "r", encoding="utf-8", errors="replace") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = json.loads(line)
+                    session_id = record.pop("session")
+                except (ValueError, KeyError):
+                    self.stats["corrupt_lines"] += 1
+                    continue
+                messages = sessions.setdefault(session_id, [])
+                if "event" in record:
+                    started.add(session_id)
+                else:
+                    messages.append(record)
+        return sessions, started
+
+    def last_session(self) -> List[Dict]:
+        sessions = self.read_sessions()
+        return next(reversed(sessions.values())) if sessions else []
+
+    def recent_messages(self, limit: int) -> List[Dict]:
+        """
+        Derniers messages, au plus limit, en remontant les sessions de la plus
+        récente à la plus ancienne; une session ouverte par start_session
+        (mémoire effacée) arrête la remontée
+
+        Returns:
+            Messages dans l'ordre chronologique
+        """
+        sessions, started = self._read()
+        recent: List[Dict] = []
+        for session_id in reversed(sessions):
+            missing = limit - len(recent)
+            if missing <= 0:
+                break
+            recent[:0] = sessions[session_id][-missing:]
+            if session_id in started:
+                break
+        return recent
+
+    def import_snapshots(self, legacy_path: str) -> int:
+        """
+        Reprend l'ancien conversations.json (instantanés de session qui se
+        recouvrent): chaque message n'est importé qu'une fois
+
+        Returns:
+            Nombre de messages importés
+        """
+        with open(legacy_path, "r", encoding="utf-8") as f:
+            snapshots = json.load(f)
+        seen = set()
+        count = 0
+        for snapshot in snapshots:
+            for message in snapshot.get("messages", []):
+                key = (message.get("timestamp"), message.get("role"), message.get("content"))
+                if key in seen:
+                    continue
+                seen.add(key)
+                self.append(snapshot.get("session_id", "import"), message)
+                count += 1
+        self.flush()
+        return count
@@ -1,45 +1,52 @@
-import requests
 import json
+from ai.context_builder import ContextBuilder
+from ai.http_client import get_http_client
+from ai.streaming import iter_sse_json
 
 class DeepSeekAPI:
-    def __init__(self, api_key=None, use_internet=True):
+    def __init__(self, api_key=None, use_internet=True, base_url="https://api.deepseek.com/v1"):
         self.api_key = api_key
         self.use_internet = use_internet
-        self.base_url = "https://api.deepseek.com/v1"
+        self.base_url = base_url
+        self.http = get_http_client()
         self.conversation_history = []
+        self.max_history = 100
+        # Historique, résumé et contexte ramenés à ~7000 jetons par requête
+        self.context_builder = ContextBuilder(max_tokens=8000, reserve_reply=1000)
         
-    def chat(self, message, context=None):
-        """Envoie un message à DeepSeek API"""
-        if not self.use_internet or not self.api_key:
-            return "⚠️ Mode démo - Connectez internet et ajoutez une clé API"
-        
-        headers = {
+    def _headers(self):
+        return {
             "Authorization": f"Bearer {self.api_key}",
             "Content-Type": "application/json"
         }
         
-        # Ajouter le contexte
-        messages = []
-        if context:
-            messages.append({"role": "system", "content": context})
+    def _build_messages(self, message, context=None):
+        """Messages envoyés: contexte et résumé, historique récent puis nouveau message"""
+        built = self.context_builder.build(message, self.conversation_history, system=context)
+        return built.messages(message)
         
-        # Ajouter l'historique
-        for msg in self.conversation_history[-5:]:  # Garder les 5 derniers
-            messages.append(msg)
+    def _remember(self, message, reply):
+        """Met à jour l'historique"""
+        self.conversation_history.append({"role": "user", "content": message})
+        self.conversation_history.append({"role": "assistant", "content": reply})
+        if len(self.conversation_history) > self.max_history:
+            self.conversation_history = self.conversation_history[-self.max_history:]
         
-        # Ajouter le nouveau message
-        messages.append({"role": "user", "content": message})
+    def chat(self, message, context=None):
+        """Envoie un message à DeepSeek API"""
+        if not self.use_internet or not self.api_key:
+            return "⚠️ Mode démo - Connectez internet et ajoutez une clé API"
         
         data = {
             "model": "deepseek-chat",
-            "messages": messages,
+            "messages": self._build_messages(message, context),
             "max_tokens": 1000
         }
         
         try:
-            response = requests.post(
+            response = self.http.post(
                 f"{self.base_url}/chat/completions",
-                headers=headers,
+                headers=self._headers(),
                 json=data,
                 timeout=30
             )
@@ -49,8 +56,7 @@ class DeepSeekAPI:
                 reply = result["choices"][0]["message"]["content"]
                 
                 # Mettre à jour l'historique
-                self.conversation_history.append({"role": "user", "content": message})
-                self.conversation_history.append({"role": "assistant", "content": reply})
+                self._remember(message, reply)
                 
                 return reply
             else:
@@ -59,6 +65,55 @@ class DeepSeekAPI:
         except Exception as e:
             return f"❌ Erreur connexion: {str(e)}"
     
+    def chat_stream(self, message, context=None):
+        """
+        Envoie un message à DeepSeek API et renvoie la réponse au fil de l'eau
+        
+        Yields:
+            Morceaux de texte dans l'ordre d'arrivée (un message d'erreur seul en cas d'échec)
+        """
+        if not self.use_internet or not self.api_key:
+            yield "⚠️ Mode démo - Connectez internet et ajoutez une clé API"
+            return
+        
+        data = {
+            "model": "deepseek-chat",
+            "messages": self._build_messages(message, context),
+            "max_tokens": 1000,
+            "stream": True
+        }
+        
+        parts = []
+        try:
+            # timeout=(connexion, entre deux paquets): la réponse complète peut être plus longue
+            with self.http.post(
+                f"{self.base_url}/chat/completions",
+                headers=self._headers(),
+                json=data,
+                stream=True,
+                timeout=(10, 30)
+            ) as response:
+                if response.status_code != 200:
+                    yield f"❌ Erreur API: {response.status_code}"
+                    return
+                
+                for event in iter_sse_json(response.iter_lines(chunk_size=None)):
+                    choices = event.get("choices") or [{}]
+                    token = (choices[0].get("delta") or {}).get("content")
+                    if token:
+                        parts.append(token)
+                        yield token
+                        
+        except Exception as e:
+            # Réponse coupée en cours de route: l'erreur s'affiche à la suite
+            separator = "\n" if parts else ""
+            yield f"{separator}❌ Erreur connexion: {str(e)}"
+            return
+        
+        # Historique mis à jour seulement pour une réponse complète
+        if parts:
+            self._remember(message, "".join(parts))
+    
     def ask_for_files(self, query):
         """Demande des fichiers si nécessaire"""
         file_keywords = ["fichier", "document", "image", "pdf", "txt", "lire", "ouvrir"]
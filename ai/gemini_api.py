@@ -1,15 +1,66 @@
 import os
-from typing import Optional, List, Dict
+import threading
+from typing import Optional, List, Dict, Iterator, Tuple
+from ai.context_builder import BuiltContext, ContextBuilder
+from ai.http_client import get_http_client
 
 class GeminiAPI:
     """Client pour l'API Gemini (Google)"""
     
-    def __init__(self, api_key: Optional[str] = None, use_internet: bool = True):
+    def __init__(self, api_key: Optional[str] = None, use_internet: bool = True,
+                 base_url: str = "https://generativelanguage.googleapis.com/v1beta"):
         self.api_key = api_key or os.getenv("GEMINI_API_KEY", "")
         self.use_internet = use_internet
+        self.base_url = base_url
+        self.http = get_http_client()
         self.model = "gemini-pro"
         self.conversation_history: List[Dict] = []
-        self.max_history = 10
+        self.max_history = 50
+        # Historique, résumé et extraits de fichiers ramenés à ~6000 jetons par requête
+        self.context_builder = ContextBuilder(max_tokens=8000, reserve_reply=2048)
+        
+        # Modèle configuré une seule fois, session de chat persistante (voir warm_up)
+        self._model = None
+        self._chat_session = None
+        self._session_lock = threading.Lock()
+        
+    def _contents(self, history: List[Dict]) -> List[Dict]:
+        """Historique au format Gemini (rôles "user" / "model")"""
+        return [
+            {"role": "model" if msg["role"] == "assistant" else "user", "parts": [{"text": msg["content"]}]}
+            for msg in history
+        ]
+        
+    def _get_chat_session(self):
+        """
+        Session de chat persistante: google.generativeai importé, configuré et
+        modèle construit au premier appel seulement, l'historique est envoyé
+        par la session elle-même
+        """
+        if self._chat_session is None:
+            with self._session_lock:
+                if self._model is None:
+                    import google.generativeai as genai
+                    
+                    genai.configure(api_key=self.api_key)
+                    self._model = genai.GenerativeModel(self.model)
+                if self._chat_session is None:
+                    # Sans appel réseau: reprend l'historique local
+                    self._chat_session = self._model.start_chat(history=self._contents(self.conversation_history))
+        return self._chat_session
+        
+    def warm_up(self) -> bool:
+        """Prépare la session de chat à l'avance (à appeler hors du thread de l'interface)"""
+        if not self.use_internet or not self.api_key:
+            return False
+        try:
+            self._get_chat_session()
+            return True
+        except ImportError:
+            print("⚠️ google-generativeai non installé: Gemini indisponible")
+        except Exception as e:
+            print(f"⚠️ Préparation Gemini impossible: {e}")
+        return False
         
     def chat(self, message: str, context: Optional[str] = None, files: Optional[List[str]] = None) -> str:
         """
@@ -31,21 +82,21 @@ class GeminiAPI:
         
         # Importation différée de google.generativeai
         try:
-            import google.generativeai as genai
+            chat_session = self._get_chat_session()
         except ImportError:
             return "❌ Le package 'google-generativeai' n'est pas installé. Veuillez l'installer avec 'pip install google-generativeai'"
-        
-        # Configuration de l'API
-        genai.configure(api_key=self.api_key)
-        
-        # Préparer le modèle
-        model = genai.GenerativeModel(self.model)
+        except Exception as e:
+            return f"❌ Erreur Gemini: {str(e)}"
         
         # Préparer le contenu
-        prompt = self._prepare_prompt(message, context, files)
+        prompt, built = self._prepare_prompt(message, context, files)
         
         try:
-            response = model.generate_content(prompt)
+            # La session envoie l'historique choisi par le budget de contexte; elle est
+            # partagée: deux appels simultanés ne doivent pas mêler leurs historiques
+            with self._session_lock:
+                chat_session.history = self._contents(built.history)
+                response = chat_session.send_message(prompt)
             reply = response.text
             
             # Mettre à jour l'historique
@@ -56,47 +107,74 @@ class GeminiAPI:
         except Exception as e:
             return f"❌ Erreur Gemini: {str(e)}"
     
-    def _prepare_prompt(self, message: str, context: Optional[str], files: Optional[List[str]]) -> str:
-        """Prépare le prompt pour Gemini"""
-        prompt_parts = []
+    def chat_stream(self, message: str, context: Optional[str] = None,
+                    files: Optional[List[str]] = None) -> Iterator[str]:
+        """
+        Envoie un message à l'API Gemini et renvoie la réponse au fil de l'eau
         
-        if context:
-            prompt_parts.append(f"Contexte: {context}")
+        Passe par l'API REST (streamGenerateContent en SSE) plutôt que par
+        google-generativeai: pas de dépendance supplémentaire et base_url
+        peut pointer vers un serveur de test local.
         
-        prompt_parts.append(f"Utilisateur: {message}")
+        Yields:
+            Morceaux de texte dans l'ordre d'arrivée (un message d'erreur seul en cas d'échec)
+        """
+        if not self.use_internet:
+            yield "🌐 Veuillez activer l'accès internet pour utiliser Gemini."
+            return
         
-        if files:
-            file_info = self._process_files(files)
-            prompt_parts.append(f"Fichiers fournis:\n{file_info}")
+        if not self.api_key:
+            yield "🔑 Veuillez configurer votre clé API Gemini dans les paramètres."
+            return
         
-        return "\n\n".join(prompt_parts)
-    
-    def _process_files(self, files: List[str]) -> str:
-        """Traite les fichiers et retourne un résumé"""
-        # Pour Gemini, nous ne pouvons pas envoyer les fichiers directement via l'API texte,
-        # donc nous lisons le contenu des fichiers texte et les incluons dans le prompt.
-        file_summary = []
-        
-        for file_path in files:
-            if os.path.exists(file_path):
-                filename = os.path.basename(file_path)
-                size = os.path.getsize(file_path)
-                ext = os.path.splitext(file_path)[1].lower()
+        from ai.streaming import iter_sse_json
+        
+        prompt, built = self._prepare_prompt(message, context, files)
+        contents = self._contents(built.history)
+        contents.append({"role": "user", "parts": [{"text": prompt}]})
+        data = {"contents": contents}
+        
+        parts = []
+        try:
+            with self.http.post(
+                f"{self.base_url}/models/{self.model}:streamGenerateContent",
+                params={"alt": "sse"},
+                headers={"x-goog-api-key": self.api_key, "Content-Type": "application/json"},
+                json=data,
+                stream=True,
+                timeout=(10, 30)
+            ) as response:
+                if response.status_code != 200:
+                    yield f"❌ Erreur Gemini: HTTP {response.status_code}"
+                    return
                 
-                # Lire le contenu des fichiers texte
-                if ext in ['.txt', '.py', '.js', '.html', '.css', '.json', '.md', '.xml']:
-                    try:
-                        with open(file_path, 'r', encoding='utf-8') as f:
-                            content = f.read(2000)  # Limiter la taille
-                            file_summary.append(f"- {filename}:\n```\n{content[:500]}...\n```")
-                    except:
-                        file_summary.append(f"- {filename} - Impossible de lire")
-                else:
-                    file_summary.append(f"- {filename} (fichier binaire, extension: {ext})")
-            else:
-                file_summary.append(f"- {file_path} - Fichier non trouvé")
-        
-        return "\n".join(file_summary)
+                for event in iter_sse_json(response.iter_lines(chunk_size=None)):
+                    for candidate in event.get("candidates", [])[:1]:
+                        for part in candidate.get("content", {}).get("parts", []):
+                            token = part.get("text")
+                            if token:
+                                parts.append(token)
+                                yield token
+                                
+        except Exception as e:
+            separator = "\n" if parts else ""
+            yield f"{separator}❌ Erreur Gemini: {str(e)}"
+            return
+        
+        if parts:
+            self._update_history(message, "".join(parts))
+    
+    def _prepare_prompt(self, message: str, context: Optional[str],
+                        files: Optional[List[str]]) -> Tuple[str, BuiltContext]:
+        """Prépare le prompt pour Gemini (contexte, résumé des anciens échanges, extraits de fichiers)"""
+        built = self.context_builder.build(
+            message, self.conversation_history,
+            system=f"Contexte: {context}" if context else None,
+            files=files
+        )
+        prompt_parts = [built.system] if built.system else []
+        prompt_parts.append(f"Utilisateur: {message}")
+        return "\n\n".join(prompt_parts), built
     
     def _update_history(self, user_message: str, assistant_message: str):
         """Met à jour l'historique de conversation"""
@@ -109,6 +187,9 @@ class GeminiAPI:
     def clear_history(self):
         """Efface l'historique de conversation"""
         self.conversation_history = []
+        if self._chat_session is not None:
+            with self._session_lock:
+                self._chat_session.history = []
         return "✅ Historique Gemini effacé."
     
     def get_instructions(self) -> str:
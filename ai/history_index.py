@@ -0,0 +1,248 @@
+"""
+Index plein texte de l'historique des conversations de Zodiac OS
+Index inversé en mémoire (mot -> messages) sur tout le journal, mis à jour
+à chaque message. Les mots sont repliés (minuscules, sans accents, pluriels
+simples) pour que "météo" trouve "meteo" et "applications" trouve
+"application"; les résultats sont classés par BM25 et peuvent être limités
+à une période ("la semaine dernière", "hier", "il y a 3 jours"...).
+"""
+
+import bisect
+import math
+import re
+import threading
+import time
+import unicodedata
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+_WORD_RE = re.compile(r"\w+", re.UNICODE)
+
+STOP_WORDS = frozenset((
+    "le", "la", "les", "un", "une", "des", "de", "du", "d", "l", "et", "ou", "a", "au", "aux", "en",
+    "dans", "pour", "par", "sur", "avec", "est", "que", "qui", "quoi", "ce", "cette", "ces", "il",
+    "elle", "je", "j", "tu", "vous", "nous", "me", "m", "te", "t", "se", "s", "ne", "pas", "y",
+    "mon", "ma", "mes", "ton", "ta", "tes", "son", "sa", "ses", "c", "qu", "n",
+    "the", "of", "to", "is", "and", "in", "on", "what", "did",
+))
+
+# Mots de la question qui décrivent la recherche elle-même, pas son sujet
+QUERY_WORDS = frozenset((
+    "demande", "demandé", "demandais", "parle", "parlé", "parlait", "dit", "question", "questions",
+    "propos", "sujet", "quand", "quel", "quelle", "quels", "quelles", "ai", "avais", "avons",
+    "asked", "about",
+))
+
+
+def fold(word: str) -> str:
+    """Forme repliée d'un mot: minuscules, sans accents, sans pluriel simple"""
+    word = "".join(c for c in unicodedata.normalize("NFKD", word.lower()) if not unicodedata.combining(c))
+    if len(word) > 4 and word[-1] in "sx" and word[-2] not in "su":
+        word = word[:-1]
+    return word
+
+
+def tokenize(text: str, drop_stop_words: bool = True) -> List[str]:
+    terms = []
+    for word in _WORD_RE.findall(text):
+        term = fold(word)
+        if drop_stop_words and (term in STOP_WORDS or len(term) < 2):
+            continue
+        terms.append(term)
+    return terms
+
+
+_FOLDED_QUERY_WORDS = frozenset(fold(w) for w in QUERY_WORDS)
+
+# Périodes reconnues dans une question, du plus précis au plus large
+_PERIODS = (
+    (r"\baujourd'?hui\b", lambda now: (now.replace(hour=0, minute=0, second=0, microsecond=0), None)),
+    (r"\bhier\b", lambda now: (now.replace(hour=0, minute=0, second=0, microsecond=0) - timedelta(days=1),
+                              now.replace(hour=0, minute=0, second=0, microsecond=0))),
+    (r"\bil y a (\d+) jours?\b", None),
+    (r"\bcette semaine\b", lambda now: (_week_start(now), None)),
+    (r"\b(?:la )?semaine (?:derniere|dernière|passee|passée)\b",
+     lambda now: (_week_start(now) - timedelta(days=7), _week_start(now))),
+    (r"\bce mois(?:-ci)?\b", lambda now: (now.replace(day=1, hour=0, minute=0, second=0, microsecond=0), None)),
+    (r"\b(?:le )?mois (?:dernier|passé|passe)\b", lambda now: (_previous_month_start(now), _month_start(now))),
+    (r"\blast week\b", lambda now: (_week_start(now) - timedelta(days=7), _week_start(now))),
+)
+
+
+def _week_start(now: datetime) -> datetime:
+    return (now - timedelta(days=now.weekday())).replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def _month_start(now: datetime) -> datetime:
+    return now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+
+
+def _previous_month_start(now: datetime) -> datetime:
+    return _month_start(_month_start(now) - timedelta(days=1))
+
+
+def parse_period(text: str, now: Optional[datetime] = None) -> Tuple[str, Optional[datetime], Optional[datetime]]:
+    """
+    Extrait une période d'une question en français
+
+    Returns:
+        (question sans la période, début ou None, fin ou None)
+    """
+    now = now or datetime.now()
+    lowered = text.lower()
+    for pattern, window in _PERIODS:
+        match = re.search(pattern, lowered)
+        if not match:
+            continue
+        if window is None:  # "il y a N jours"
+            start = now - timedelta(days=int(match.group(1)))
+            since, until = start.replace(hour=0, minute=0, second=0, microsecond=0), None
+        else:
+            since, until = window(now)
+        return (lowered[:match.start()] + " " + lowered[match.end():]).strip(), since, until
+    return text, None, None
+
+
+class HistoryIndex:
+    """Index inversé BM25 des messages de conversation"""
+
+    K1 = 1.2
+    B = 0.75
+    # Mots complétant le dernier mot d'une requête, au plus
+    MAX_EXPANSIONS = 50
+
+    def __init__(self):
+        self._docs: List[Dict] = []
+        self._times: List[float] = []
+        self._lengths: List[int] = []
+        self._postings: Dict[str, Dict[int, int]] = defaultdict(dict)
+        # Vocabulaire trié: les mots d'un préfixe forment une tranche contiguë
+        self._vocabulary: List[str] = []
+        self._total_length = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._docs)
+
+    @staticmethod
+    def _timestamp(message: Dict) -> float:
+        try:
+            return datetime.fromisoformat(message.get("timestamp", "")).timestamp()
+        except (TypeError, ValueError):
+            return 0.0
+
+    def add(self, message: Dict, session_id: Optional[str] = None):
+        """Indexe un message (appelé à chaque nouveau message)"""
+        terms = tokenize(message.get("content", ""))
+        with self._lock:
+            doc_id = len(self._docs)
+            self._docs.append(dict(message, session=session_id or message.get("session")))
+            self._times.append(self._timestamp(message))
+            self._lengths.append(len(terms))
+            self._total_length += len(terms)
+            for term in terms:
+                postings = self._postings[term]
+                if not postings:
+                    bisect.insort(self._vocabulary, term)
+                postings[doc_id] = postings.get(doc_id, 0) + 1
+
+    def add_many(self, messages: Iterable[Tuple[str, Dict]]):
+        """Indexe des (session, message) en lot (chargement du journal)"""
+        for session_id, message in messages:
+            self.add(message, session_id)
+
+    def search(self, query: str, limit: int = 10, role: Optional[str] = None,
+               since: Optional[datetime] = None, until: Optional[datetime] = None,
+               prefix: bool = True) -> List[Dict]:
+        """
+        Messages les plus pertinents pour la requête
+
+        Args:
+            query: Mots recherchés (accents, majuscules et pluriels indifférents)
+            role: 'user' ou 'assistant' pour filtrer
+            since / until: Période
+            prefix: Le dernier mot peut être incomplet ("photosynth")
+
+        Returns:
+            Messages (copies) avec "score", du plus au moins pertinent
+        """
+        terms = [t for t in tokenize(query) if t not in _FOLDED_QUERY_WORDS]
+        if not terms:
+            return []
+        since_ts = since.timestamp() if since else None
+        until_ts = until.timestamp() if until else None
+
+        with self._lock:
+            count = len(self._docs)
+            if not count:
+                return []
+            average = self._total_length / count or 1.0
+
+            expanded = [[t] for t in terms]
+            if prefix and len(terms[-1]) >= 3:
+                expanded[-1] = self._expand_prefix(terms[-1])
+
+            scores: Dict[int, float] = defaultdict(float)
+            for variants in expanded:
+                for term in variants:
+                    postings = self._postings.get(term)
+                    if not postings:
+                        continue
+                    idf = math.log(1 + (count - len(postings) + 0.5) / (len(postings) + 0.5))
+                    for doc_id, tf in postings.items():
+                        if role and self._docs[doc_id].get("role") != role:
+                            continue
+                        stamp = self._times[doc_id]
+                        if (since_ts and stamp < since_ts) or (until_ts and stamp >= until_ts):
+                            continue
+                        norm = tf + self.K1 * (1 - self.B + self.B * self._lengths[doc_id] / average)
+                        scores[doc_id] += idf * tf * (self.K1 + 1) / norm
+
+            # Départage des scores égaux: le plus récent d'abord
+            best = sorted(scores.items(), key=lambda item: (-item[1], -self._times[item[0]]))[:limit]
+            return [dict(self._docs[doc_id], score=round(score, 3)) for doc_id, score in best]
+
+    def _expand_prefix(self, term: str) -> List[str]:
+        """Le mot lui-même et les mots qui le prolongent les plus fréquents (verrou tenu)"""
+        start = bisect.bisect_left(self._vocabulary, term)
+        end = bisect.bisect_left(self._vocabulary, term + "\uffff", start)
+        longer = [t for t in self._vocabulary[start:end] if t != term]
+        if len(longer) > self.MAX_EXPANSIONS:
+            longer.sort(key=lambda t: -len(self._postings[t]))
+            longer = longer[:self.MAX_EXPANSIONS]
+        return [term] + longer
+
+    def ask(self, question: str, limit: int = 10, role: Optional[str] = "user") -> List[Dict]:
+        """
+        Recherche en langage naturel: "qu'est-ce que j'ai demandé sur X la semaine dernière"
+        (la période est extraite de la question)
+        """
+        text, since, until = parse_period(question)
+        return self.search(text, limit=limit, role=role, since=since, until=until)
+
+
+if __name__ == "__main__":
+    import random
+
+    index = HistoryIndex()
+    subjects = ["météo à Lyon", "recette de crêpes", "Python asyncio", "photosynthèse", "applications ouvertes",
+                "actualités tech", "traduction en anglais", "rappel rendez-vous", "musique relaxante"]
+    start_day = datetime.now() - timedelta(days=180)
+    messages = []
+    for i in range(50_000):
+        when = start_day + timedelta(minutes=i * 5)
+        subject = random.choice(subjects)
+        messages.append((f"s{i // 40}", {"role": "user" if i % 2 == 0 else "assistant",
+                                          "content": f"Message {i} à propos de {subject}, détails numéro {i % 97}",
+                                          "timestamp": when.isoformat()}))
+
+    t0 = time.perf_counter()
+    index.add_many(messages)
+    t1 = time.perf_counter()
+    results = index.ask("qu'est-ce que j'ai demandé sur les crêpes la semaine dernière")
+    t2 = time.perf_counter()
+    print(f"Indexation: {len(index)} messages en {(t1 - t0) * 1000:.0f} ms")
+    print(f"Recherche: {(t2 - t1) * 1000:.1f} ms, {len(results)} résultats")
+    for result in results[:3]:
+        print(f"  {result['timestamp'][:16]} {result['content']} ({result['score']})")
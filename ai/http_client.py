@@ -0,0 +1,203 @@
+"""
+Client HTTP partagé par les modules réseau de Zodiac OS
+Une seule session requests: connexions gardées ouvertes et réutilisées par
+hôte (pas de poignée de main TCP+TLS à chaque appel), nouvelles tentatives
+avec attente croissante, nombre de requêtes simultanées limité et temps
+de réponse mesurés par hôte.
+"""
+
+import threading
+import time
+from collections import deque
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Codes qui justifient une nouvelle tentative (surcharge ou panne passagère)
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+class SlotTimeout(requests.exceptions.Timeout):
+    """Aucune place libre (hôte ou client saturé) dans le délai de la requête"""
+
+
+class HostStats:
+    """Temps de réponse (jusqu'aux en-têtes) et erreurs d'un hôte"""
+
+    def __init__(self, window: int = 100):
+        self.requests = 0
+        self.errors = 0
+        self._latencies = deque(maxlen=window)
+
+    def record(self, ms: float, ok: bool):
+        self.requests += 1
+        if not ok:
+            self.errors += 1
+        self._latencies.append(ms)
+
+    def snapshot(self) -> Dict:
+        values = sorted(self._latencies)
+        if not values:
+            return {"requests": self.requests, "errors": self.errors}
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "avg_ms": round(sum(values) / len(values), 1),
+            "p50_ms": round(values[len(values) // 2], 1),
+            "p95_ms": round(values[min(len(values) - 1, int(len(values) * 0.95))], 1),
+            "max_ms": round(values[-1], 1),
+        }
+
+
+class HttpClient:
+    """Session HTTP commune (pool de connexions, reprises, limites de concurrence)"""
+
+    def __init__(self, pool_size: int = 10, retries: int = 2, backoff: float = 0.3,
+                 max_concurrency: int = 8, per_host: int = 4, timeout: float = 10.0,
+                 user_agent: str = "ZodiacOS/10.0"):
+        """
+        Args:
+            pool_size: Connexions gardées ouvertes par hôte
+            retries: Nouvelles tentatives (connexion impossible, codes RETRY_STATUSES)
+            backoff: Base de l'attente entre tentatives (0.3, 0.6, 1.2 s...)
+            max_concurrency: Requêtes simultanées, tous hôtes confondus
+            per_host: Requêtes simultanées vers un même hôte
+            timeout: Délai par défaut si l'appelant n'en donne pas (s)
+        """
+        self.timeout = timeout
+        self.max_concurrency = max_concurrency
+        self.per_host = per_host
+
+        # Les POST (chat, traduction) ne sont rejoués que si la connexion a échoué
+        # avant l'envoi: une réponse perdue ne doit pas être facturée deux fois
+        retry = Retry(
+            total=retries,
+            connect=retries,
+            read=retries,
+            status=retries,
+            backoff_factor=backoff,
+            status_forcelist=RETRY_STATUSES,
+            allowed_methods=frozenset({"GET", "HEAD", "OPTIONS"}),
+            respect_retry_after_header=True,
+            raise_on_status=False,
+        )
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+
+        self.session = requests.Session()
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers["User-Agent"] = user_agent
+
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+        self._host_slots: Dict[str, threading.BoundedSemaphore] = {}
+        self._stats: Dict[str, HostStats] = {}
+        self._lock = threading.Lock()
+
+    def _host(self, url: str) -> str:
+        return urlsplit(url).netloc.lower()
+
+    def _acquire(self, host: str, timeout=None):
+        """
+        Réserve une place pour l'hôte puis une place globale
+
+        Args:
+            timeout: Délai de la requête (nombre, (connexion, lecture) ou None):
+                l'attente d'une place ne dépasse pas le délai de connexion
+
+        Raises:
+            SlotTimeout: Aucune place libérée à temps
+        """
+        if isinstance(timeout, tuple):
+            timeout = timeout[0]
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._lock:
+            host_slot = self._host_slots.get(host)
+            if host_slot is None:
+                host_slot = self._host_slots[host] = threading.BoundedSemaphore(self.per_host)
+            stats = self._stats.get(host)
+            if stats is None:
+                stats = self._stats[host] = HostStats()
+        # L'hôte d'abord: une requête en attente d'un hôte saturé ne bloque pas les autres
+        if not host_slot.acquire(timeout=timeout):
+            raise SlotTimeout(f"{host}: {self.per_host} requêtes déjà en cours, "
+                              f"aucune place libérée en {timeout} s")
+        remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+        if not self._slots.acquire(timeout=remaining):
+            host_slot.release()
+            raise SlotTimeout(f"{self.max_concurrency} requêtes déjà en cours, "
+                              f"aucune place libérée en {timeout} s")
+        return host_slot, stats
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """
+        Envoie une requête par la session partagée (mêmes arguments que requests.request)
+
+        Avec stream=True, la place reste occupée jusqu'à la fermeture de la
+        réponse (response.close() ou bloc with).
+        """
+        kwargs.setdefault("timeout", self.timeout)
+        host = self._host(url)
+        host_slot, stats = self._acquire(host, kwargs["timeout"])
+        released = False
+
+        def release():
+            nonlocal released
+            if not released:
+                released = True
+                host_slot.release()
+                self._slots.release()
+
+        start = time.perf_counter()
+        try:
+            response = self.session.request(method, url, **kwargs)
+        except Exception:
+            stats.record((time.perf_counter() - start) * 1000, ok=False)
+            release()
+            raise
+
+        stats.record((time.perf_counter() - start) * 1000, ok=response.status_code < 500)
+
+        if kwargs.get("stream"):
+            close = response.close
+
+            def close_and_release():
+                try:
+                    close()
+                finally:
+                    release()
+
+            response.close = close_and_release
+        else:
+            release()
+        return response
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        return self.request("POST", url, **kwargs)
+
+    def get_stats(self) -> Dict[str, Dict]:
+        """Temps de réponse par hôte"""
+        with self._lock:
+            return {host: stats.snapshot() for host, stats in self._stats.items()}
+
+    def close(self):
+        self.session.close()
+
+
+_client: Optional[HttpClient] = None
+_client_lock = threading.Lock()
+
+
+def get_http_client() -> HttpClient:
+    """Client HTTP partagé (créé au premier appel)"""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = HttpClient()
+    return _client
@@ -4,6 +4,7 @@ Récupération des actualités technologiques
 """
 
 import requests
+from ai.http_client import get_http_client
 import feedparser
 from datetime import datetime, timedelta
 from typing import List, Dict, Optional
@@ -19,6 +20,7 @@ class NewsFeed:
             cache_dir: Répertoire de cache
         """
         self.cache_dir = cache_dir
+        self.http = get_http_client()
         self.cache_file = os.path.join(cache_dir, "news_cache.json")
         self.cache_timeout = 1800  # 30 minutes
         
@@ -150,7 +152,7 @@ class NewsFeed:
                 'sortBy': 'publishedAt'
             }
             
-            response = requests.get(url, params=params, timeout=10)
+            response = self.http.get(url, params=params, timeout=10)
             data = response.json()
             
             if data.get('status') == 'ok':
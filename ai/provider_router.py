@@ -0,0 +1,346 @@
+"""
+Routage des requêtes IA entre fournisseurs pour Zodiac OS
+Les fournisseurs (DeepSeek, Gemini) sont essayés dans l'ordre de préférence,
+ou par latence mesurée: si le premier n'a pas répondu après race_delay, le
+suivant est lancé en parallèle et la première bonne réponse gagne. Erreurs
+et délais dépassés passent au suivant, un disjoncteur écarte un fournisseur
+en panne, et SimpleAI répond localement en dernier recours.
+"""
+
+import functools
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from ai.http_client import HostStats
+
+# Réponses des clients qui signalent un échec (ils renvoient l'erreur en texte)
+ERROR_PREFIXES = ("❌", "⚠️", "🔑", "🌐")
+
+
+def is_error_reply(reply) -> bool:
+    return not reply or not isinstance(reply, str) or reply.lstrip().startswith(ERROR_PREFIXES)
+
+
+class CircuitBreaker:
+    """
+    Disjoncteur: après failure_threshold échecs consécutifs, le fournisseur est
+    écarté pendant reset_timeout, puis une seule requête d'essai est autorisée
+    (une nouvelle si l'essai reste sans réponse plus de trial_timeout)
+    """
+
+    CLOSED, OPEN, HALF_OPEN = "fermé", "ouvert", "essai"
+
+    def __init__(self, failure_threshold: int = 3, reset_timeout: float = 30.0, trial_timeout: float = 60.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.trial_timeout = trial_timeout
+        self.state = self.CLOSED
+        self.failures = 0
+        self._opened_at = 0.0
+        self._trial_at = 0.0
+        self._lock = threading.Lock()
+
+    def _can_try(self, now: float) -> bool:
+        if self.state == self.CLOSED:
+            return True
+        if self.state == self.OPEN:
+            return now - self._opened_at >= self.reset_timeout
+        return now - self._trial_at >= self.trial_timeout
+
+    def available(self) -> bool:
+        """Le fournisseur peut-il être essayé ? (sans changer l'état)"""
+        with self._lock:
+            return self._can_try(time.monotonic())
+
+    def allow(self) -> bool:
+        """
+        Réserve un appel: à appeler au lancement effectif de la requête,
+        qui devra se conclure par record_success() ou record_failure()
+        """
+        with self._lock:
+            now = time.monotonic()
+            if not self._can_try(now):
+                return False
+            if self.state != self.CLOSED:
+                self.state = self.HALF_OPEN
+                self._trial_at = now
+            return True
+
+    def record_success(self):
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                self.state = self.OPEN
+                self._opened_at = time.monotonic()
+
+
+class Provider:
+    """Fournisseur IA: client (chat / chat_stream), disjoncteur et latences"""
+
+    def __init__(self, name: str, client, failure_threshold: int = 3, reset_timeout: float = 30.0):
+        self.name = name
+        self.client = client
+        self.breaker = CircuitBreaker(failure_threshold, reset_timeout)
+        self.latency = HostStats()
+        self.wins = 0
+
+    def chat(self, message: str, context: Optional[str] = None) -> str:
+        start = time.perf_counter()
+        try:
+            reply = self.client.chat(message, context)
+        except Exception as e:
+            reply = f"❌ Erreur {self.name}: {e}"
+        ok = not is_error_reply(reply)
+        self.latency.record((time.perf_counter() - start) * 1000, ok)
+        if ok:
+            self.breaker.record_success()
+        else:
+            self.breaker.record_failure()
+        return reply
+
+
+class ProviderRouter:
+    """Course, bascule et repli local entre fournisseurs IA"""
+
+    def __init__(self, providers: List[Provider], fallback: Optional[Callable[[str], str]] = None,
+                 race_delay: float = 2.0, deadline: float = 25.0, adaptive: bool = True,
+                 min_samples: int = 5, workers: int = 4):
+        """
+        Args:
+            providers: Fournisseurs par ordre de préférence
+            fallback: Réponse locale (ex: SimpleAI().process) si aucun ne répond
+            race_delay: Attente avant de lancer le fournisseur suivant en parallèle (s)
+            deadline: Délai total avant le repli local (s)
+            adaptive: Classe les fournisseurs par latence médiane mesurée
+            min_samples: Mesures nécessaires avant de tenir compte de la latence
+        """
+        self.providers = providers
+        self.fallback = fallback
+        self.race_delay = race_delay
+        self.deadline = deadline
+        self.adaptive = adaptive
+        self.min_samples = min_samples
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="zodiac-ai")
+        self.stats = {"requests": 0, "raced": 0, "failovers": 0, "fallbacks": 0}
+        self._stats_lock = threading.Lock()
+        self.last_provider: Optional[str] = None
+        self.last_failed = False  # la dernière réponse en flux s'est terminée sur une erreur
+
+    def candidates(self) -> List[Provider]:
+        """Fournisseurs disponibles, dans l'ordre d'essai (sans réserver d'essai sur les disjoncteurs)"""
+        available = [p for p in self.providers if p.breaker.available()]
+        if not self.adaptive:
+            return available
+
+        def rank(item):
+            index, provider = item
+            measured = provider.latency.snapshot()
+            if measured["requests"] - measured["errors"] < self.min_samples:
+                return (0.0, index)  # pas encore assez mesuré: ordre de préférence
+            return (measured.get("p50_ms", 0.0), index)
+
+        return [p for _, p in sorted(enumerate(available), key=rank)]
+
+    def _count(self, name: str):
+        """Incrémente un compteur (appelé depuis plusieurs threads)"""
+        with self._stats_lock:
+            self.stats[name] += 1
+
+    def _win(self, provider: Provider):
+        with self._stats_lock:
+            provider.wins += 1
+
+    @staticmethod
+    def _forget_exchange(provider: Provider, message: str, future):
+        """
+        Retire de l'historique du client l'échange d'une course perdue ou
+        abandonnée: l'utilisateur ne l'a jamais vu et les historiques des
+        fournisseurs ne doivent pas diverger
+        """
+        try:
+            reply = future.result()
+        except Exception:
+            return
+        history = getattr(provider.client, "conversation_history", None)
+        if is_error_reply(reply) or not history or len(history) < 2:
+            return
+        if history[-2].get("content") == message and history[-1].get("content") == reply:
+            del history[-2:]
+
+    def _abandon(self, pending: Dict, message: str):
+        """Fournisseurs encore en course: leur réponse sera écartée à l'arrivée"""
+        for future, provider in pending.items():
+            future.add_done_callback(functools.partial(self._forget_exchange, provider, message))
+
+    def _fallback(self, message: str, last_error: Optional[str]) -> Tuple[str, str]:
+        self._count("fallbacks")
+        if self.fallback is not None:
+            try:
+                return self.fallback(message), "local"
+            except Exception as e:
+                print(f"⚠️ Repli local en échec: {e}")
+        return last_error or "❌ Aucun fournisseur IA disponible", "aucun"
+
+    def chat(self, message: str, context: Optional[str] = None) -> Tuple[str, str]:
+        """
+        Réponse du premier fournisseur qui répond correctement
+
+        Les fournisseurs perdants (ou encore en cours au délai total) ne sont
+        pas interrompus; l'échange qu'ils ajoutent à l'historique de leur
+        client est retiré dès leur réponse.
+
+        Returns:
+            (réponse, nom du fournisseur ou "local")
+        """
+        self._count("requests")
+        queue = self.candidates()
+        pending = {}
+        last_error = None
+        end = time.monotonic() + self.deadline
+
+        def launch():
+            # Le disjoncteur n'est consulté qu'au lancement effectif
+            while queue:
+                provider = queue.pop(0)
+                if provider.breaker.allow():
+                    pending[self._executor.submit(provider.chat, message, context)] = provider
+                    return
+
+        if queue:
+            launch()
+        while pending:
+            remaining = end - time.monotonic()
+            if remaining <= 0:
+                break
+            # Sans réponse au bout de race_delay: on lance aussi le suivant
+            timeout = min(self.race_delay, remaining) if queue else remaining
+            done, _ = wait(list(pending), timeout=timeout, return_when=FIRST_COMPLETED)
+
+            if not done:
+                if queue:
+                    self._count("raced")
+                    launch()
+                continue
+
+            for future in done:
+                provider = pending.pop(future)
+                reply = future.result()
+                if not is_error_reply(reply):
+                    self._win(provider)
+                    self.last_provider = provider.name
+                    self._abandon(pending, message)
+                    return reply, provider.name
+                last_error = reply
+                print(f"⚠️ {provider.name} en échec, bascule: {str(reply)[:80]}")
+                if queue:
+                    self._count("failovers")
+                    launch()
+
+        self._abandon(pending, message)
+        self.last_provider = "local"
+        return self._fallback(message, last_error)
+
+    def chat_stream(self, message: str, context: Optional[str] = None) -> Iterator[str]:
+        """
+        Réponse au fil de l'eau: bascule sur le fournisseur suivant si le premier
+        morceau est une erreur (une réponse déjà commencée n'est pas interrompue)
+        """
+        self._count("requests")
+        self.last_failed = False
+        last_error = None
+
+        for provider in self.candidates():
+            if not provider.breaker.allow():
+                continue
+            if not hasattr(provider.client, "chat_stream"):
+                reply = provider.chat(message, context)
+                if not is_error_reply(reply):
+                    self._win(provider)
+                    self.last_provider = provider.name
+                    yield reply
+                    return
+                last_error = reply
+                continue
+
+            start = time.perf_counter()
+            stream = provider.client.chat_stream(message, context)
+            try:
+                first = next(stream, None)
+            except Exception as e:
+                first = f"❌ Erreur {provider.name}: {e}"
+            if is_error_reply(first):
+                provider.latency.record((time.perf_counter() - start) * 1000, ok=False)
+                provider.breaker.record_failure()
+                last_error = first
+                self._count("failovers")
+                print(f"⚠️ {provider.name} en échec, bascule: {str(first)[:80]}")
+                continue
+
+            # Latence jusqu'au premier morceau: c'est elle que l'utilisateur perçoit
+            provider.latency.record((time.perf_counter() - start) * 1000, ok=True)
+            provider.breaker.record_success()
+            self.last_provider = provider.name
+            yield first
+            for token in stream:
+                # Erreur en cours de réponse (coupure réseau...): l'échec compte pour le disjoncteur
+                if is_error_reply(token) and not self.last_failed:
+                    self.last_failed = True
+                    provider.breaker.record_failure()
+                yield token
+            if not self.last_failed:
+                self._win(provider)
+            return
+
+        self.last_provider = "local"
+        reply, _ = self._fallback(message, last_error)
+        yield reply
+
+    def get_stats(self) -> Dict:
+        with self._stats_lock:
+            return {
+                "router": dict(self.stats),
+                "providers": {
+                    p.name: dict(p.latency.snapshot(), state=p.breaker.state, wins=p.wins)
+                    for p in self.providers
+                },
+            }
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False)
+
+
+def build_router(keys: Dict[str, str], use_internet: bool = True, order: Optional[List[str]] = None,
+                 clients: Optional[Dict[str, object]] = None, **options) -> ProviderRouter:
+    """
+    Routeur à partir des clés configurées
+
+    Args:
+        keys: {"deepseek": clé, "gemini": clé} (les fournisseurs sans clé sont ignorés)
+        order: Ordre de préférence (par défaut celui de keys)
+        clients: Clients déjà prêts {"gemini": client} (préparés au démarrage), réutilisés
+        options: Paramètres de ProviderRouter (race_delay, deadline...)
+    """
+    providers = []
+    for name in order or list(keys):
+        api_key = keys.get(name)
+        if not api_key or not use_internet:
+            continue
+        client = (clients or {}).get(name)
+        if client is not None:
+            providers.append(Provider(name, client))
+        elif name == "deepseek":
+            from ai.deepseek_api import DeepSeekAPI
+            providers.append(Provider(name, DeepSeekAPI(api_key, use_internet)))
+        elif name == "gemini":
+            from ai.gemini_api import GeminiAPI
+            providers.append(Provider(name, GeminiAPI(api_key, use_internet)))
+
+    from ai.simple_ai import SimpleAI
+    return ProviderRouter(providers, fallback=SimpleAI().process, **options)
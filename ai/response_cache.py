@@ -0,0 +1,212 @@
+"""
+Cache des réponses IA pour Zodiac OS
+Les questions factuelles reviennent souvent ("c'est quoi la photosynthèse ?"):
+la réponse déjà obtenue de DeepSeek/Gemini est resservie immédiatement,
+sans appel réseau ni quota consommé. Les requêtes qui dépendent du moment
+ou de la conversation ne passent jamais par le cache.
+"""
+
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Dict, Optional
+
+# Formules sans effet sur le sens de la question
+FILLER_PATTERNS = (
+    r"\b(zodiac|exocortex)\b",
+    r"\bs ?il (te|vous) plait\b",
+    r"\b(stp|svp|please)\b",
+    r"^(dis[- ]moi|peux[- ]tu (me dire)?|pourrais[- ]tu (me dire)?|est[- ]ce que tu sais)\b",
+    r"^(explique[- ]moi|raconte[- ]moi)\b",
+)
+
+# Requêtes dont la réponse change avec le temps
+TIME_SENSITIVE_WORDS = (
+    "heure", "heures", "date", "aujourd", "maintenant", "demain", "hier", "ce soir",
+    "cette semaine", "en ce moment", "actuel", "actuelle", "actuellement", "dernier", "derniere",
+    "dernieres", "derniers", "recent", "recente", "meteo", "temps qu", "actualite", "actualites",
+    "news", "prix", "cours", "bourse", "score", "resultat", "resultats", "live", "direct",
+    "today", "now", "latest", "weather",
+)
+_TIME_SENSITIVE_RE = re.compile(r"\b(" + "|".join(TIME_SENSITIVE_WORDS) + r")\b")
+
+# Requêtes qui s'appuient sur la conversation ou s'adressent à l'assistant
+CONVERSATIONAL_PATTERNS = (
+    r"^(bonjour|salut|hello|hey|coucou|bonsoir|merci|ok|d ?accord|oui|non)\b",
+    r"\b(comment (vas|allez|ca va)|qui es[- ]tu|tu es qui)\b",
+    r"^(et|mais|alors|donc|puis)\b",
+    r"\b(continue|encore|plus de details|developpe|reformule|resume|traduis|corrige)\b",
+    r"\b(ca|cela|celui|celle|ceux|precedent|precedente|ci[- ]dessus|au[- ]dessus)\b",
+    r"\b(mon|ma|mes|moi)\b",
+)
+
+# Réponses qui signalent une erreur ou un mode dégradé: jamais mises en cache
+ERROR_PREFIXES = ("❌", "⚠️", "🔑", "🌐", "📁")
+
+
+def _strip_accents(text: str) -> str:
+    return "".join(c for c in unicodedata.normalize("NFKD", text) if not unicodedata.combining(c))
+
+
+def normalize_query(query: str) -> str:
+    """
+    Forme canonique d'une question: minuscules, sans accents ni ponctuation
+    (apostrophes comprises), sans formules de politesse ni nom de l'assistant
+    """
+    text = re.sub(r"[^\w]+", " ", _strip_accents(query.lower())).strip()
+    for pattern in FILLER_PATTERNS:
+        text = re.sub(pattern, " ", text).strip()
+    return re.sub(r"\s+", " ", text)
+
+
+def bypass_reason(query: str) -> Optional[str]:
+    """Raison de ne pas utiliser le cache pour cette requête (None = cacheable)"""
+    text = normalize_query(query)
+    if not text:
+        return "vide"
+    if _TIME_SENSITIVE_RE.search(text):
+        return "dépend du moment"
+    for pattern in CONVERSATIONAL_PATTERNS:
+        if re.search(pattern, text):
+            return "conversationnel"
+    return None
+
+
+class ResponseCache:
+    """Cache LRU des réponses IA, avec durée de vie et sauvegarde sur disque"""
+
+    def __init__(self, path: str = "data/cache/ai_responses.json", ttl: float = 7 * 24 * 3600,
+                 max_entries: int = 500, save_delay: float = 2.0):
+        """
+        Args:
+            path: Fichier de sauvegarde (None = mémoire seulement)
+            ttl: Durée de validité d'une réponse (s)
+            max_entries: Nombre de réponses gardées (les moins utilisées partent d'abord)
+            save_delay: Regroupe les écritures sur disque (s)
+        """
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.save_delay = save_delay
+
+        self._entries: "OrderedDict[str, Dict]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._save_timer = None
+        self.stats = {"hits": 0, "misses": 0, "bypassed": 0, "stored": 0, "evicted": 0, "expired": 0}
+
+        self._load()
+
+    @staticmethod
+    def make_key(query: str, provider: str, context: str = "") -> str:
+        """Clé: question normalisée + fournisseur + empreinte du contexte"""
+        context_hash = hashlib.sha1(context.encode("utf-8")).hexdigest()[:12]
+        raw = f"{provider}\x00{context_hash}\x00{normalize_query(query)}"
+        return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+    def get(self, query: str, provider: str, context: str = "") -> Optional[str]:
+        """Réponse en cache, ou None (absente, expirée ou requête à ne pas cacher)"""
+        if bypass_reason(query):
+            self.stats["bypassed"] += 1
+            return None
+
+        key = self.make_key(query, provider, context)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.stats["misses"] += 1
+                return None
+            if time.time() - entry["created"] > self.ttl:
+                del self._entries[key]
+                self.stats["expired"] += 1
+                self.stats["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            entry["hits"] += 1
+            self.stats["hits"] += 1
+            return entry["response"]
+
+    def put(self, query: str, provider: str, response: str, context: str = "") -> bool:
+        """Mémorise une réponse (ignorée si la requête ou la réponse ne s'y prête pas)"""
+        if not response or response.lstrip().startswith(ERROR_PREFIXES) or bypass_reason(query):
+            return False
+
+        key = self.make_key(query, provider, context)
+        with self._lock:
+            self._entries[key] = {
+                "query": query,
+                "provider": provider,
+                "response": response,
+                "created": time.time(),
+                "hits": 0,
+            }
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.stats["evicted"] += 1
+            self.stats["stored"] += 1
+        self._schedule_save()
+        return True
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+        self._schedule_save()
+
+    # --- Sauvegarde ---
+
+    def _load(self):
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            now = time.time()
+            # Fichier écrit du moins récent au plus récent: l'ordre LRU est conservé
+            for key, entry in data.get("entries", []):
+                if now - entry.get("created", 0) <= self.ttl:
+                    self._entries[key] = entry
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            print(f"✓ Cache IA chargé: {len(self._entries)} réponses")
+        except Exception as e:
+            print(f"⚠️ Cache IA illisible, ignoré: {e}")
+
+    def _schedule_save(self):
+        if not self.path:
+            return
+        with self._lock:
+            if self._save_timer is not None:
+                return
+            self._save_timer = threading.Timer(self.save_delay, self.save)
+            self._save_timer.daemon = True
+            self._save_timer.start()
+
+    def save(self) -> bool:
+        """Écrit le cache sur disque (fichier temporaire puis remplacement)"""
+        if not self.path:
+            return False
+        with self._lock:
+            self._save_timer = None
+            entries = [[key, dict(entry)] for key, entry in self._entries.items()]
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"version": 1, "entries": entries}, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+            return True
+        except Exception as e:
+            print(f"✗ Erreur sauvegarde cache IA: {e}")
+            return False
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            size = len(self._entries)
+        lookups = self.stats["hits"] + self.stats["misses"]
+        return dict(self.stats, entries=size,
+                    hit_rate=round(self.stats["hits"] / lookups, 3) if lookups else 0.0)
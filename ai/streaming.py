@@ -0,0 +1,126 @@
+"""
+Réponses en flux (Server-Sent Events) pour les clients IA de Zodiac OS
+Les jetons sont transmis dès leur arrivée: l'interface affiche la réponse
+au fil de l'eau et la synthèse vocale démarre sur la première phrase
+pendant que la suite est générée.
+"""
+
+import json
+import re
+from typing import Iterable, Iterator, List, Optional
+
+# Fin de phrase: ponctuation suivie d'un espace (ou d'un saut de ligne seul)
+_SENTENCE_END = re.compile(r"(?<=[.!?…:;])\s+|\n+")
+
+
+def iter_sse(lines: Iterable) -> Iterator[str]:
+    """
+    Données des événements SSE d'une réponse HTTP
+
+    Args:
+        lines: Lignes de la réponse (ex: response.iter_lines()), bytes ou str
+
+    Yields:
+        Contenu du champ "data" de chaque événement, jusqu'à "[DONE]"
+    """
+    data: List[str] = []
+    for line in lines:
+        if isinstance(line, bytes):
+            line = line.decode("utf-8", errors="replace")
+        line = line.rstrip("\r\n")
+
+        if not line:
+            # Ligne vide: fin de l'événement
+            if data:
+                payload = "\n".join(data)
+                data = []
+                if payload.strip() == "[DONE]":
+                    return
+                yield payload
+            continue
+        if line.startswith(":"):
+            continue  # commentaire / keep-alive
+
+        field, _, value = line.partition(":")
+        if field == "data":
+            data.append(value[1:] if value.startswith(" ") else value)
+
+    if data:
+        payload = "\n".join(data)
+        if payload.strip() != "[DONE]":
+            yield payload
+
+
+def iter_sse_json(lines: Iterable) -> Iterator[dict]:
+    """Événements SSE décodés en JSON (les événements illisibles sont ignorés)"""
+    for payload in iter_sse(lines):
+        try:
+            yield json.loads(payload)
+        except ValueError:
+            print(f"⚠️ Événement SSE illisible: {payload[:80]}")
+
+
+class SentenceChunker:
+    """Regroupe les jetons reçus en phrases complètes (pour la synthèse vocale)"""
+
+    def __init__(self, min_length: int = 12):
+        """
+        Args:
+            min_length: Longueur minimale d'un morceau (évite de lire "M." seul)
+        """
+        self.min_length = min_length
+        self._buffer = ""
+
+    def feed(self, token: str) -> List[str]:
+        """Ajoute un jeton et retourne les phrases terminées"""
+        self._buffer += token
+        sentences = []
+        start = 0
+        for match in _SENTENCE_END.finditer(self._buffer):
+            sentence = self._buffer[start:match.start()].strip()
+            if len(sentence) >= self.min_length:
+                sentences.append(sentence)
+                start = match.end()
+        self._buffer = self._buffer[start:]
+        return sentences
+
+    def flush(self) -> Optional[str]:
+        """Dernier morceau en attente (fin de la réponse)"""
+        rest = self._buffer.strip()
+        self._buffer = ""
+        return rest or None
+
+
+# Démonstration contre le serveur SSE local des tests
+# Usage: python -m ai.streaming
+if __name__ == "__main__":
+    import time
+
+    from ai.deepseek_api import DeepSeekAPI
+    from ai.gemini_api import GeminiAPI
+    from tests.sse_stub import serve_stub
+
+    reply = "Bonjour ! Je suis Exocortex. Voici la première phrase. Et voici la suite de la réponse."
+    tokens = [word + " " for word in reply.split()]
+
+    for name, dialect in (("deepseek", "openai"), ("gemini", "gemini")):
+        server, url = serve_stub(tokens, delay=0.05, dialect=dialect)
+        client = DeepSeekAPI("stub", base_url=url) if name == "deepseek" else GeminiAPI("stub", base_url=url)
+        chunker = SentenceChunker()
+
+        start = time.perf_counter()
+        first_token = first_sentence = None
+        text = ""
+        for token in client.chat_stream("Bonjour"):
+            if first_token is None:
+                first_token = time.perf_counter() - start
+            text += token
+            if chunker.feed(token) and first_sentence is None:
+                first_sentence = time.perf_counter() - start
+        total = time.perf_counter() - start
+        server.shutdown()
+
+        print(f"{name}: premier jeton {first_token * 1000:.0f} ms, "
+              f"première phrase {(first_sentence or total) * 1000:.0f} ms, "
+              f"réponse complète {total * 1000:.0f} ms")
+        print(f"  {text.strip()}")
@@ -3,7 +3,7 @@ Module 20: Translation Engine
 Traduction de texte via différents services
 """
 
-import requests
+from ai.http_client import get_http_client
 import json
 from typing import Optional, Dict, List
 import os
@@ -18,6 +18,7 @@ class TranslationEngine:
             cache_dir: Répertoire de cache
         """
         self.cache_dir = cache_dir
+        self.http = get_http_client()
         self.cache_file = os.path.join(cache_dir, "translation_cache.json")
         
         # Services disponibles
@@ -157,7 +158,7 @@ class TranslationEngine:
                         'Accept': 'application/json'
                     }
                     
-                    response = requests.post(url, json=data, headers=headers, timeout=10)
+                    response = self.http.post(url, json=data, headers=headers, timeout=10)
                     
                     if response.status_code == 200:
                         result_data = response.json()
@@ -211,7 +212,7 @@ class TranslationEngine:
                 'langpair': f"{source_lang}|{target_lang}"
             }
             
-            response = requests.get(url, params=params, timeout=10)
+            response = self.http.get(url, params=params, timeout=10)
             data = response.json()
             
             if data.get('responseStatus') == 200:
@@ -255,7 +256,7 @@ class TranslationEngine:
                 'Content-Type': 'application/json'
             }
             
-            response = requests.post(url, json=data, headers=headers, timeout=10)
+            response = self.http.post(url, json=data, headers=headers, timeout=10)
             data = response.json()
             
             if 'translations' in data:
@@ -0,0 +1,434 @@
+"""
+Mémoire à long terme de l'assistant Zodiac OS
+Les échanges passés (journal des conversations) et les notes (data/notes)
+sont plongés dans un espace vectoriel par hachage des mots et des trigrammes
+de caractères: aucun modèle à télécharger, calcul NumPy sur le CPU. À chaque
+requête, les souvenirs les plus proches (similarité cosinus) sont proposés au
+ContextBuilder, dans un budget de latence fixe: si la recherche ne tient pas
+dans le budget, seuls les souvenirs les plus récents sont parcourus.
+"""
+
+import os
+import threading
+import time
+import zlib
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from ai.context_builder import estimate_tokens, truncate_to_tokens
+from ai.history_index import fold, tokenize
+
+# Mots interrogatifs: présents dans toutes les questions, ils ne disent rien du sujet
+QUESTION_WORDS = frozenset(fold(w) for w in (
+    "comment", "pourquoi", "combien", "quand", "quel", "quelle", "quels", "quelles", "peux", "pourrais",
+    "faire", "fait", "sais", "explique", "dis", "moi", "how", "why", "what", "which",
+))
+
+
+class HashingEmbedder:
+    """Vecteurs creux hachés (mots + trigrammes), normalisés pour le cosinus"""
+
+    def __init__(self, dim: int = 512, trigram_weight: float = 0.5, cache_size: int = 50_000):
+        """
+        Args:
+            dim: Dimension des vecteurs (les collisions diminuent quand elle augmente)
+            trigram_weight: Poids des trigrammes, qui rapprochent les variantes d'un mot
+            cache_size: Mots dont les positions hachées sont gardées en cache
+        """
+        self.dim = dim
+        self.trigram_weight = trigram_weight
+        self.cache_size = cache_size
+        self._term_cache: Dict[str, Tuple[List[int], List[float]]] = {}
+
+    def _hash(self, feature: str, weight: float) -> Tuple[int, float]:
+        h = zlib.crc32(feature.encode("utf-8"))
+        # Signe tiré du hachage: les collisions s'annulent en moyenne
+        return h % self.dim, (weight if (h >> 31) & 1 else -weight)
+
+    def _term_features(self, term: str) -> Tuple[List[int], List[float]]:
+        """Positions et poids signés d'un mot et de ses trigrammes (en cache: les mots reviennent)"""
+        cached = self._term_cache.get(term)
+        if cached is None:
+            padded = f"#{term}#"
+            pairs = [self._hash(term, 1.0)]
+            pairs += [self._hash(padded[i:i + 3], self.trigram_weight) for i in range(len(padded) - 2)]
+            cached = ([index for index, _ in pairs], [weight for _, weight in pairs])
+            if len(self._term_cache) >= self.cache_size:
+                self._term_cache.clear()
+            self._term_cache[term] = cached
+        return cached
+
+    def embed(self, text: str) -> np.ndarray:
+        indices: List[int] = []
+        weights: List[float] = []
+        for term in tokenize(text):
+            if term in QUESTION_WORDS:
+                continue
+            term_indices, term_weights = self._term_features(term)
+            indices += term_indices
+            weights += term_weights
+        if not indices:
+            return np.zeros(self.dim, dtype=np.float32)
+        vector = np.bincount(indices, weights=weights, minlength=self.dim).astype(np.float32)
+        # Fréquences atténuées: un mot répété ne domine pas le texte
+        np.copysign(np.log1p(np.abs(vector)), vector, out=vector)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+
+class VectorStore:
+    """Matrice de vecteurs normalisés, insertion incrémentale et top-k cosinus"""
+
+    # Part de lignes retirées au-delà de laquelle la matrice est compactée
+    COMPACT_RATIO = 0.25
+
+    def __init__(self, dim: int, capacity: int = 1024):
+        self.dim = dim
+        self._matrix = np.zeros((capacity, dim), dtype=np.float32)
+        self._removed = np.zeros(capacity, dtype=bool)
+        self._size = 0
+        self._removed_count = 0
+        self.items: List[Dict] = []
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return self._size - self._removed_count
+
+    def add(self, vector: np.ndarray, item: Dict) -> int:
+        with self._lock:
+            if self._size == len(self._matrix):
+                # Capacité doublée: coût amorti constant par insertion
+                grown = np.zeros((len(self._matrix) * 2, self.dim), dtype=np.float32)
+                grown[:self._size] = self._matrix[:self._size]
+                self._matrix = grown
+                removed = np.zeros(len(grown), dtype=bool)
+                removed[:self._size] = self._removed[:self._size]
+                self._removed = removed
+            self._matrix[self._size] = vector
+            self.items.append(item)
+            self._size += 1
+            return self._size - 1
+
+    def remove(self, predicate) -> int:
+        """
+        Retire les éléments pour lesquels predicate(item) est vrai
+
+        Les lignes sont mises à zéro et masquées (exclues des recherches)
+        plutôt que supprimées: les indices des autres éléments ne bougent pas.
+
+        Returns:
+            Nombre d'éléments retirés
+        """
+        with self._lock:
+            rows = [row for row, item in enumerate(self.items)
+                    if not self._removed[row] and predicate(item)]
+            for row in rows:
+                self._matrix[row] = 0
+                self._removed[row] = True
+            self._removed_count += len(rows)
+            if self._removed_count > self._size * self.COMPACT_RATIO:
+                self._compact()
+            return len(rows)
+
+    def _compact(self):
+        """Reconstruit la matrice sans les lignes retirées (verrou tenu par l'appelant)"""
+        live = np.flatnonzero(~self._removed[:self._size])
+        matrix = np.zeros((max(len(live) * 2, 1024), self.dim), dtype=np.float32)
+        matrix[:len(live)] = self._matrix[live]
+        # Nouveaux objets: une recherche en cours garde les anciens
+        self._matrix = matrix
+        self._removed = np.zeros(len(matrix), dtype=bool)
+        self.items = [self.items[row] for row in live]
+        self._size = len(live)
+        self._removed_count = 0
+
+    def search(self, query: np.ndarray, k: int = 5, min_score: float = 0.0,
+               deadline: Optional[float] = None, block: int = 8192) -> Tuple[List[Tuple[float, Dict]], bool]:
+        """
+        Les k vecteurs les plus proches de query
+
+        Le parcours va des plus récents aux plus anciens par blocs et s'arrête
+        à deadline (time.perf_counter()).
+
+        Returns:
+            ([(score, item), ...] du plus proche au moins proche, parcours complet ?)
+        """
+        with self._lock:
+            matrix, size, items = self._matrix, self._size, self.items
+            removed = self._removed if self._removed_count else None
+        best_scores = np.empty(0, dtype=np.float32)
+        best_rows = np.empty(0, dtype=np.int64)
+        complete = True
+
+        for end in range(size, 0, -block):
+            if deadline is not None and end != size and time.perf_counter() > deadline:
+                complete = False
+                break
+            start = max(end - block, 0)
+            scores = matrix[start:end] @ query
+            if removed is not None:
+                scores[removed[start:end]] = -np.inf
+            if len(scores) > k:
+                top = np.argpartition(scores, -k)[-k:]
+            else:
+                top = np.arange(len(scores))
+            best_scores = np.concatenate((best_scores, scores[top]))
+            best_rows = np.concatenate((best_rows, top + start))
+            if len(best_scores) > k:
+                keep = np.argpartition(best_scores, -k)[-k:]
+                best_scores, best_rows = best_scores[keep], best_rows[keep]
+
+        order = np.argsort(-best_scores)
+        results = [(float(best_scores[i]), items[best_rows[i]]) for i in order
+                   if best_scores[i] >= min_score and best_scores[i] > -np.inf]
+        return results, complete
+
+
+class LongTermMemory:
+    """Souvenirs (échanges passés et notes) retrouvés par proximité de sens"""
+
+    def __init__(self, log=None, notes_dir: Optional[str] = "data/notes", dim: int = 512,
+                 k: int = 4, min_score: float = 0.15, budget_ms: float = 30.0,
+                 snippet_tokens: int = 120, notes_refresh: float = 30.0, question_weight: float = 2.0):
+        """
+        Args:
+            log: ConversationLog dont les échanges sont indexés (None = aucun)
+            notes_dir: Dossier des notes de tools/notes.py (None = aucun)
+            k: Souvenirs proposés au plus par requête
+            min_score: Similarité cosinus minimale d'un souvenir
+            budget_ms: Temps maximal d'une recherche (requête comprise)
+            snippet_tokens: Taille maximale d'un souvenir dans le contexte
+            notes_refresh: Intervalle de vérification des nouvelles notes (s)
+            question_weight: Poids de la question par rapport à la réponse dans un échange
+        """
+        self.log = log
+        self.notes_dir = notes_dir
+        self.k = k
+        self.min_score = min_score
+        self.budget_ms = budget_ms
+        self.snippet_tokens = snippet_tokens
+        self.notes_refresh = notes_refresh
+        self.question_weight = question_weight
+
+        self.embedder = HashingEmbedder(dim)
+        self.store = VectorStore(dim)
+        self.ready = threading.Event()
+        self._thread = None
+        self._pending_user: Dict[str, Dict] = {}
+        self._notes_seen: Dict[str, float] = {}
+        self._notes_checked = 0.0
+        self._notes_lock = threading.Lock()
+        self._notes_refreshing = False
+        self._lock = threading.Lock()
+        self.stats = {"searches": 0, "not_ready": 0, "truncated": 0, "recalled": 0, "last_ms": 0.0}
+
+    # --- Indexation ---
+
+    def start(self, live_session: Optional[str] = None):
+        """
+        Indexe le journal et les notes en arrière-plan (les recherches attendent d'être prêtes)
+
+        Args:
+            live_session: Session en cours, dont les messages arrivent par add_message
+        """
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._build, args=(live_session,), daemon=True,
+                                            name="zodiac-long-term-memory")
+            self._thread.start()
+
+    def _build(self, live_session: Optional[str]):
+        start = time.perf_counter()
+        try:
+            if self.log is not None:
+                for session_id, messages in self.log.read_sessions().items():
+                    if session_id == live_session:
+                        continue
+                    for message in messages:
+                        self.add_message(message["role"], message["content"], session_id, message.get("timestamp"))
+            self._refresh_notes()
+            print(f"✓ Mémoire à long terme: {len(self.store)} souvenirs "
+                  f"en {(time.perf_counter() - start) * 1000:.0f} ms")
+        except Exception as e:
+            print(f"⚠️ Mémoire à long terme incomplète: {e}")
+        finally:
+            self.ready.set()
+
+    def add_message(self, role: str, content: str, session_id: str = "", timestamp: Optional[str] = None):
+        """Ajoute un message: une question et la réponse qui la suit forment un souvenir"""
+        if role == "user":
+            self._pending_user[session_id] = {"content": content, "timestamp": timestamp}
+            return
+        question = self._pending_user.pop(session_id, None)
+        if question is None:
+            return
+        # La question pèse plus que la réponse: c'est elle que l'utilisateur reformulera
+        vector = self.question_weight * self.embedder.embed(question["content"]) + self.embedder.embed(content)
+        self.store.add(vector / (np.linalg.norm(vector) or 1.0), {
+            "kind": "conversation",
+            "question": question["content"],
+            "answer": content,
+            "session": session_id,
+            "timestamp": question["timestamp"] or timestamp,
+        })
+
+    def add_note(self, path: str) -> bool:
+        """Indexe une note (titre et contenu, un souvenir par paragraphe)"""
+        try:
+            with open(path, "r", encoding="utf-8", errors="replace") as f:
+                text = f.read()
+        except OSError:
+            return False
+        title = os.path.splitext(os.path.basename(path))[0]
+        body = text
+        if text.startswith("Title:"):
+            header, _, body = text.partition("\n\n")
+            title = header.splitlines()[0][len("Title:"):].strip() or title
+        paragraphs = [p.strip() for p in body.split("\n\n") if p.strip()] or [title]
+        for paragraph in paragraphs:
+            self.store.add(self.embedder.embed(f"{title}\n{paragraph}"), {
+                "kind": "note",
+                "title": title,
+                "text": paragraph,
+                "path": path,
+                "timestamp": datetime.fromtimestamp(os.path.getmtime(path)).isoformat(),
+            })
+        return True
+
+    def _schedule_notes_refresh(self):
+        """Lance la vérification des notes en arrière-plan si l'intervalle est écoulé (sans attendre)"""
+        if not self.notes_dir:
+            return
+        with self._lock:
+            if self._notes_refreshing or time.monotonic() - self._notes_checked < self.notes_refresh:
+                return
+            self._notes_refreshing = True
+            self._notes_checked = time.monotonic()
+
+        def refresh():
+            try:
+                self._refresh_notes()
+            except Exception as e:
+                print(f"⚠️ Notes non réindexées: {e}")
+            finally:
+                with self._lock:
+                    self._notes_refreshing = False
+
+        threading.Thread(target=refresh, daemon=True, name="zodiac-notes-refresh").start()
+
+    def _refresh_notes(self):
+        """Indexe les notes créées ou modifiées, retire celles supprimées depuis la dernière vérification"""
+        if not self.notes_dir:
+            return
+        # Une vérification à la fois: une note modifiée n'est réindexée qu'une fois
+        with self._notes_lock:
+            self._notes_checked = time.monotonic()
+            self._scan_notes()
+
+    def _scan_notes(self):
+        names = sorted(os.listdir(self.notes_dir)) if os.path.isdir(self.notes_dir) else []
+        present = set()
+        for name in names:
+            if not name.endswith(".txt"):
+                continue
+            path = os.path.join(self.notes_dir, name)
+            try:
+                mtime = os.path.getmtime(path)
+            except OSError:
+                continue
+            present.add(path)
+            if self._notes_seen.get(path) != mtime:
+                # Une note modifiée remplace son ancienne version
+                if path in self._notes_seen:
+                    self._remove_note(path)
+                self._notes_seen[path] = mtime
+                self.add_note(path)
+        for path in set(self._notes_seen) - present:
+            del self._notes_seen[path]
+            self._remove_note(path)
+
+    def _remove_note(self, path: str) -> int:
+        """Retire les souvenirs d'une note (paragraphes de l'ancienne version)"""
+        return self.store.remove(lambda item: item.get("kind") == "note" and item.get("path") == path)
+
+    # --- Rappel ---
+
+    def recall(self, query: str, k: Optional[int] = None, exclude: Iterable[str] = ()) -> List[Tuple[float, Dict]]:
+        """
+        Souvenirs les plus proches de la requête, dans le budget de latence
+
+        Args:
+            exclude: Textes déjà dans le contexte (les échanges correspondants sont écartés)
+
+        Returns:
+            [(score, souvenir), ...]
+        """
+        self.stats["searches"] += 1
+        if not self.ready.is_set():
+            self.stats["not_ready"] += 1
+            return []
+        start = time.perf_counter()
+        self._schedule_notes_refresh()
+        k = k or self.k
+        excluded = set(exclude)
+        results, complete = self.store.search(self.embedder.embed(query), k + len(excluded), self.min_score,
+                                              deadline=start + self.budget_ms / 1000)
+        results = [(score, item) for score, item in results
+                   if item.get("question") not in excluded and item.get("answer") not in excluded][:k]
+        self.stats["last_ms"] = round((time.perf_counter() - start) * 1000, 2)
+        self.stats["recalled"] += len(results)
+        if not complete:
+            self.stats["truncated"] += 1
+        return results
+
+    def retrieve(self, message: str, max_tokens: int, history: List[Dict]) -> str:
+        """Retriever du ContextBuilder: souvenirs mis en forme dans max_tokens"""
+        if max_tokens <= 0:
+            return ""
+        recalled = self.recall(message, exclude=[m["content"] for m in history])
+        if not recalled:
+            return ""
+        lines = ["Souvenirs pertinents (conversations et notes passées):"]
+        budget = max_tokens - estimate_tokens(lines[0])
+        for _, item in recalled:
+            date = (item.get("timestamp") or "")[:10]
+            if item["kind"] == "note":
+                text = f"- Note « {item['title']} » ({date}): {item['text']}"
+            else:
+                text = f"- {date}, question: {item['question']} → réponse: {item['answer']}"
+            text = truncate_to_tokens(" ".join(text.split()), min(self.snippet_tokens, budget))
+            if not text:
+                break
+            lines.append(text)
+            budget -= estimate_tokens(text)
+        return "\n".join(lines) if len(lines) > 1 else ""
+
+    def get_stats(self) -> Dict:
+        return dict(self.stats, memories=len(self.store), ready=self.ready.is_set())
+
+
+# Benchmark: indexation et rappel sur 50 000 échanges synthétiques
+# Usage: python -m ai.vector_memory
+if __name__ == "__main__":
+    import random
+
+    subjects = ["la météo à Lyon", "une recette de crêpes bretonnes", "le module asyncio de Python",
+                "la photosynthèse des plantes", "les applications ouvertes au démarrage",
+                "les actualités technologiques", "traduire une phrase en anglais", "un rappel de rendez-vous"]
+    memory = LongTermMemory(notes_dir=None)
+    start = time.perf_counter()
+    for i in range(50_000):
+        subject = random.choice(subjects)
+        memory.add_message("user", f"Peux-tu m'aider avec {subject} ? (échange {i})", f"s{i // 20}")
+        memory.add_message("assistant", f"Voici ce que je sais sur {subject}, point {i % 37}.", f"s{i // 20}")
+    memory.ready.set()
+    print(f"Indexation: {len(memory.store)} échanges en {(time.perf_counter() - start) * 1000:.0f} ms")
+
+    for query in ("comment cuisiner des crêpes", "la pluie demain à Lyon", "coroutines python"):
+        recalled = memory.recall(query, k=2)
+        print(f"{query!r}: {memory.stats['last_ms']} ms -> "
+              + " | ".join(f"{score:.2f} {item['question'][:40]}" for score, item in recalled))
+    print(memory.get_stats())
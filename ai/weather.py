@@ -4,6 +4,7 @@ Récupération de la météo via différentes APIs
 """
 
 import requests
+from ai.http_client import get_http_client
 import json
 from datetime import datetime
 from typing import Dict, Optional, Tuple
@@ -18,6 +19,7 @@ class WeatherModule:
             api_key: Clé API OpenWeatherMap (optionnelle)
         """
         self.api_key = api_key or os.getenv('OPENWEATHER_API_KEY', '')
+        self.http = get_http_client()
         self.cache = {}
         self.cache_timeout = 1800  # 30 minutes en secondes
         
@@ -73,7 +75,7 @@ class WeatherModule:
                 'appid': self.api_key
             }
             
-            geo_response = requests.get(geo_url, params=geo_params, timeout=10)
+            geo_response = self.http.get(geo_url, params=geo_params, timeout=10)
             geo_data = geo_response.json()
             
             if not geo_data:
@@ -94,7 +96,7 @@ class WeatherModule:
                 'lang': 'fr'
             }
             
-            response = requests.get(weather_url, params=weather_params, timeout=10)
+            response = self.http.get(weather_url, params=weather_params, timeout=10)
             data = response.json()
             
             # Formater les données
@@ -125,7 +127,7 @@ class WeatherModule:
         """Utilise wttr.in (gratuit, sans API)"""
         try:
             url = f"https://wttr.in/{requests.utils.quote(location)}?format=j1&lang=fr"
-            response = requests.get(url, headers={'User-Agent': 'curl'}, timeout=10)
+            response = self.http.get(url, headers={'User-Agent': 'curl'}, timeout=10)
             data = response.json()
             
             current = data['current_condition'][0]
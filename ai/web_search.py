@@ -3,7 +3,7 @@ Module 16: Web Search Agent
 Recherche web via DuckDuckGo et autres moteurs
 """
 
-import requests
+from ai.http_client import get_http_client
 from bs4 import BeautifulSoup
 import urllib.parse
 import json
@@ -19,6 +19,7 @@ class WebSearchAgent:
             max_results: Nombre maximum de résultats
         """
         self.max_results = max_results
+        self.http = get_http_client()
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
         }
@@ -63,7 +64,7 @@ class WebSearchAgent:
             url = f"https://html.duckduckgo.com/html/?q={encoded_query}"
             
             # Récupérer la page
-            response = requests.get(url, headers=self.headers, timeout=10)
+            response = self.http.get(url, headers=self.headers, timeout=10)
             soup = BeautifulSoup(response.text, 'html.parser')
             
             # Parser les résultats
@@ -95,7 +96,7 @@ class WebSearchAgent:
             encoded_query = urllib.parse.quote(query)
             url = f"https://www.google.com/search?q={encoded_query}"
             
-            response = requests.get(url, headers=self.headers, timeout=10)
+            response = self.http.get(url, headers=self.headers, timeout=10)
             soup = BeautifulSoup(response.text, 'html.parser')
             
             # Chercher les résultats (structure Google)
@@ -133,7 +134,7 @@ class WebSearchAgent:
             encoded_query = urllib.parse.quote(query)
             url = f"https://www.bing.com/search?q={encoded_query}"
             
-            response = requests.get(url, headers=self.headers, timeout=10)
+            response = self.http.get(url, headers=self.headers, timeout=10)
             soup = BeautifulSoup(response.text, 'html.parser')
             
             # Parser les résultats Bing
@@ -182,7 +183,7 @@ class WebSearchAgent:
         """
         try:
             url = f"https://api.duckduckgo.com/?q={urllib.parse.quote(query)}&format=json&no_html=1"
-            response = requests.get(url, timeout=5)
+            response = self.http.get(url, timeout=5)
             data = response.json()
             
             if data.get('AbstractText'):
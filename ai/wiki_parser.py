@@ -3,7 +3,7 @@ Module 17: Quick Wiki
 Récupération rapide de résumés depuis Wikipédia
 """
 
-import requests
+from ai.http_client import get_http_client
 import re
 from bs4 import BeautifulSoup
 from typing import Optional, Dict
@@ -18,6 +18,7 @@ class WikiParser:
             lang: Langue (fr, en, es, etc.)
         """
         self.lang = lang
+        self.http = get_http_client()
         self.base_url = f"https://{lang}.wikipedia.org"
         self.headers = {
             'User-Agent': 'ZodiacAI/1.0 (https://github.com/zodiac-ai)'
@@ -45,7 +46,7 @@ class WikiParser:
                 'utf8': 1
             }
             
-            response = requests.get(search_url, params=params, 
+            response = self.http.get(search_url, params=params, 
                                   headers=self.headers, timeout=10)
             data = response.json()
             
@@ -69,7 +70,7 @@ class WikiParser:
                 'inprop': 'url'
             }
             
-            response = requests.get(content_url, params=params,
+            response = self.http.get(content_url, params=params,
                                   headers=self.headers, timeout=10)
             data = response.json()
             
@@ -178,7 +179,7 @@ class WikiParser:
                 'rnlimit': 1
             }
             
-            response = requests.get(url, params=params, 
+            response = self.http.get(url, params=params, 
                                   headers=self.headers, timeout=10)
             data = response.json()
             
@@ -5,26 +5,153 @@ from datetime import datetime
 class AdvancedAssistant:
     """Assistant avancé avec demande de fichiers et compteur de messages"""
     
-    def __init__(self, ai_choice="local", api_key=None, use_internet=True):
+    # Commandes qui interrogent directement le web (sans passer par l'IA)
+    WEB_COMMANDS = ("recherche web", "cherche sur le web", "/web")
+    
+    def __init__(self, ai_choice="local", api_key=None, use_internet=True, extra_keys=None, clients=None):
+        """
+        Args:
+            ai_choice: Fournisseur préféré ("deepseek", "gemini" ou "local")
+            api_key: Clé du fournisseur préféré
+            extra_keys: Clés d'autres fournisseurs {"gemini": clé}, utilisés en
+                course et en secours (SimpleAI répond localement en dernier recours)
+            clients: Clients déjà préparés par le démarrage {"gemini": client}
+        """
         self.ai_choice = ai_choice
         self.api_key = api_key
         self.use_internet = use_internet
         self.message_count = 0
         self.max_messages = 30  # Limite de messages pour la session
         self.conversation_history = []
+        self._weather = None  # Mise en forme de la météo des recherches web
         
-        # Initialiser l'API choisie
-        if ai_choice == "deepseek" and use_internet and api_key:
-            from ai.deepseek_api import DeepSeekAPI
-            self.ai_engine = DeepSeekAPI(api_key, use_internet)
-        elif ai_choice == "gemini" and use_internet and api_key:
-            from ai.gemini_api import GeminiAPI
-            self.ai_engine = GeminiAPI(api_key, use_internet)
-        else:
-            self.ai_engine = None  # Mode local/démo
+        # Fournisseurs configurés, le choix de l'utilisateur en premier
+        keys = {}
+        if ai_choice in ("deepseek", "gemini") and api_key:
+            keys[ai_choice] = api_key
+        for name, key in (extra_keys or {}).items():
+            keys.setdefault(name, key)
+        
+        self.router = None
+        self.ai_engine = None  # Mode local/démo
+        if use_internet and keys:
+            from ai.provider_router import build_router
+            self.router = build_router(keys, use_internet, clients=clients)
+            if self.router.providers:
+                self.ai_engine = self.router.providers[0].client
+        
+        # Réponses déjà obtenues pour les questions factuelles (pas en mode démo)
+        self.response_cache = None
+        if self.ai_engine:
+            from ai.response_cache import ResponseCache
+            self.response_cache = ResponseCache()
+        
+        # Échanges journalisés et souvenirs (conversations et notes passées)
+        # ajoutés au contexte de chaque fournisseur
+        self.memory = None
+        if self.ai_engine:
+            try:
+                from ai.context_memory import ContextMemory
+                self.memory = ContextMemory()
+                long_term = self.memory.enable_long_term()
+                for provider in self.router.providers:
+                    builder = getattr(provider.client, "context_builder", None)
+                    if builder is not None:
+                        builder.retriever = long_term.retrieve
+            except Exception as e:
+                print(f"⚠️ Mémoire à long terme indisponible: {e}")
+                self.memory = None
         
     def process_query(self, query):
         """Traite une requête avec l'IA sélectionnée"""
+        refusal = self._check_query(query)
+        if refusal:
+            return refusal
+        
+        # Utiliser l'IA si disponible
+        web_query = self._web_command(query)
+        cached = None if web_query else self._cached_response(query)
+        if web_query:
+            response = self.web_answer(web_query)
+        elif cached is not None:
+            response = cached
+        elif self.router and self.router.providers:
+            response, _ = self.router.chat(query)
+            self._cache_response(query, response)
+        else:
+            # Mode démo
+            response = self._demo_response(query)
+        
+        self._record(query, response)
+        
+        # Ajouter le compteur de messages
+        response_with_counter = f"{response}{self._counter_suffix()}"
+        
+        return response_with_counter
+    
+    def process_query_stream(self, query):
+        """
+        Traite une requête en renvoyant la réponse au fil de l'eau
+        
+        Yields:
+            Morceaux de la réponse (le compteur de messages arrive en dernier)
+        """
+        refusal = self._check_query(query)
+        if refusal:
+            yield refusal
+            return
+        
+        failed = False
+        web_query = self._web_command(query)
+        cached = None if web_query else self._cached_response(query)
+        if web_query:
+            response = self.web_answer(web_query)
+            yield response
+        elif cached is not None:
+            response = cached
+            yield response
+        elif self.router and self.router.providers:
+            from ai.provider_router import is_error_reply
+            parts = []
+            for token in self.router.chat_stream(query):
+                parts.append(token)
+                failed = failed or is_error_reply(token)
+                yield token
+            response = "".join(parts)
+            # Réponse interrompue par une erreur: ni mise en cache, ni mémorisée
+            failed = failed or self.router.last_failed
+            if not failed:
+                self._cache_response(query, response)
+        else:
+            response = self._demo_response(query)
+            yield response
+        
+        self._record(query, response, remember=not failed)
+        yield self._counter_suffix()
+    
+    def _cache_context(self, provider):
+        """Empreinte de ce qui change la réponse en dehors de la question (fournisseur et modèle)"""
+        client = next((p.client for p in self.router.providers if p.name == provider), None)
+        return f"{provider}:{getattr(client, 'model', '')}"
+    
+    def _cached_response(self, query):
+        if self.response_cache is None:
+            return None
+        # Réponses rangées sous le fournisseur qui les a données (bascule comprise)
+        for provider in self.router.providers:
+            cached = self.response_cache.get(query, provider.name, self._cache_context(provider.name))
+            if cached is not None:
+                return cached
+        return None
+    
+    def _cache_response(self, query, response):
+        # Les réponses du repli local ne remplacent pas celles d'une IA
+        provider = self.router.last_provider
+        if self.response_cache is not None and provider not in (None, "local", "aucun"):
+            self.response_cache.put(query, provider, response, self._cache_context(provider))
+    
+    def _check_query(self, query):
+        """Compte le message et retourne un refus éventuel (limite atteinte, fichiers requis)"""
         self.message_count += 1
         
         # Vérifier la limite de messages
@@ -34,26 +161,23 @@ class AdvancedAssistant:
         # Demander des fichiers si nécessaire
         if self._needs_files(query):
             return "📁 J'ai besoin de fichiers pour vous aider. Veuillez m'envoyer les fichiers concernés."
-        
-        # Utiliser l'IA si disponible
-        if self.ai_engine:
-            response = self.ai_engine.chat(query)
-        else:
-            # Mode démo
-            response = self._demo_response(query)
-        
-        # Enregistrer dans l'historique
+        return None
+    
+    def _record(self, query, response, remember=True):
+        """Enregistre l'échange dans l'historique (et dans la mémoire à long terme si remember)"""
         self.conversation_history.append({
             "query": query,
             "response": response,
             "timestamp": datetime.now().isoformat(),
             "message_number": self.message_count
         })
-        
-        # Ajouter le compteur de messages
-        response_with_counter = f"{response}\n\n({self.message_count}/{self.max_messages} messages utilisés)"
-        
-        return response_with_counter
+        from ai.provider_router import is_error_reply
+        if remember and self.memory is not None and not is_error_reply(response):
+            self.memory.add_message("user", query)
+            self.memory.add_message("assistant", response)
+    
+    def _counter_suffix(self):
+        return f"\n\n({self.message_count}/{self.max_messages} messages utilisés)"
     
     def _needs_files(self, query):
         """Détecte si la requête nécessite des fichiers"""
@@ -74,6 +198,60 @@ class AdvancedAssistant:
         else:
             return f"Mode démo: '{query}'. Configurez DeepSeek ou Gemini pour des réponses avancées."
     
+    def _web_command(self, query):
+        """Question de la commande "recherche web ..." (None pour une requête ordinaire)"""
+        lowered = query.strip().lower()
+        for prefix in self.WEB_COMMANDS:
+            if lowered.startswith(prefix):
+                return query.strip()[len(prefix):].strip(" :") or None
+        return None
+    
+    def web_answer(self, query):
+        """
+        Réponse tirée du web: Wikipédia, réponse rapide, recherche et météo
+        interrogés en parallèle par research() (bloque jusqu'à la plus lente)
+        """
+        if not self.use_internet:
+            return "🌐 Recherche web désactivée (mode hors ligne)."
+        from ai.async_client import research
+        city = self._weather_city(query)
+        try:
+            found = research(query, city=city, timeout=8.0)
+        except Exception as e:
+            print(f"⚠️ Recherche web indisponible: {e}")
+            return "❌ Recherche web indisponible."
+        
+        parts = []
+        if found.get("weather"):
+            if self._weather is None:
+                from ai.weather import WeatherModule
+                self._weather = WeatherModule()
+            parts.append(self._weather.format_weather(found["weather"]))
+        wiki = found.get("wiki")
+        if wiki and wiki.get("summary"):
+            parts.append(f"{wiki['summary']}\n({wiki.get('url') or 'Wikipédia'})")
+        elif found.get("quick_answer"):
+            parts.append(found["quick_answer"])
+        web = found.get("web") or []
+        if web and not parts:
+            parts.append("\n".join(f"• {item.get('title', '')}: {item.get('url', '')}" for item in web[:3]))
+        return "\n\n".join(parts) or f"Aucun résultat sur le web pour '{query}'."
+    
+    @staticmethod
+    def _weather_city(query):
+        """Ville demandée après "météo" (None si la question ne porte pas sur la météo)"""
+        from core.speculative import WEATHER_WORDS
+        words = query.lower().replace("?", " ").split()
+        for word in WEATHER_WORDS:
+            if word in words:
+                rest = [w for w in words[words.index(word) + 1:] if w not in ("à", "a", "de", "pour", "sur", "in")]
+                return " ".join(rest).title() or "Paris"
+        return None
+    
+    def get_provider_stats(self):
+        """Latences, disjoncteurs et victoires par fournisseur"""
+        return self.router.get_stats() if self.router else {}
+    
     def get_remaining_messages(self):
         """Retourne le nombre de messages restants"""
         return self.max_messages - self.message_count
@@ -0,0 +1,287 @@
+"""
+Capture audio continue pour Zodiac OS
+Un flux micro ouvert une seule fois alimente un tampon circulaire de taille fixe
+"""
+
+import threading
+import time
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+
+def chunk_rms(chunk: bytes) -> float:
+    """Énergie RMS d'un bloc PCM 16 bits"""
+    samples = np.frombuffer(chunk, dtype=np.int16)
+    if samples.size == 0:
+        return 0.0
+    return float(np.sqrt(np.mean(samples.astype(np.float32) ** 2)))
+
+
+class AudioRingBuffer:
+    """Tampon circulaire de blocs audio numérotés (un écrivain, plusieurs lecteurs)"""
+
+    def __init__(self, capacity: int):
+        """
+        Args:
+            capacity: Nombre de blocs conservés
+        """
+        self.capacity = capacity
+        self._chunks: List[Optional[bytes]] = [None] * capacity
+        self._next_seq = 0
+        self._cond = threading.Condition()
+        self.overruns = 0
+
+    @property
+    def write_position(self) -> int:
+        """Numéro du prochain bloc écrit"""
+        return self._next_seq
+
+    def write(self, chunk: bytes):
+        """Ajoute un bloc (écrase le plus ancien si le tampon est plein)"""
+        with self._cond:
+            self._chunks[self._next_seq % self.capacity] = chunk
+            self._next_seq += 1
+            self._cond.notify_all()
+
+    def read_from(self, seq: int, timeout: Optional[float] = None) -> Tuple[List[bytes], int]:
+        """
+        Lit tous les blocs écrits depuis seq
+
+        Args:
+            seq: Numéro du premier bloc voulu
+            timeout: Attente maximum si aucun bloc n'est disponible
+
+        Returns:
+            (blocs, numéro à passer au prochain appel)
+        """
+        with self._cond:
+            if self._next_seq <= seq:
+                self._cond.wait_for(lambda: self._next_seq > seq, timeout)
+
+            oldest = max(0, self._next_seq - self.capacity)
+            if seq < oldest:
+                # Le lecteur a pris trop de retard: on saute au plus ancien bloc disponible
+                self.overruns += 1
+                seq = oldest
+
+            chunks = [self._chunks[i % self.capacity] for i in range(seq, self._next_seq)]
+            return chunks, self._next_seq
+
+    def latest(self, count: int) -> List[bytes]:
+        """Retourne les count derniers blocs"""
+        with self._cond:
+            start = max(0, self._next_seq - min(count, self.capacity))
+            return [self._chunks[i % self.capacity] for i in range(start, self._next_seq)]
+
+
+class ContinuousCapture:
+    """Flux micro persistant: calibration unique puis adaptation du seuil en continu"""
+
+    def __init__(self, microphone, recognizer, buffer_seconds: float = 10.0,
+                 calibration_seconds: float = 0.5, noise_adaptation: float = 0.05,
+                 min_energy_threshold: float = 50.0):
+        """
+        Args:
+            microphone: sr.Microphone
+            recognizer: sr.Recognizer (son energy_threshold est maintenu à jour)
+            buffer_seconds: Durée audio conservée dans le tampon circulaire
+            calibration_seconds: Durée de la calibration initiale
+            noise_adaptation: Vitesse d'adaptation du niveau de bruit (0-1)
+            min_energy_threshold: Seuil minimum, même dans une pièce silencieuse
+        """
+        self.microphone = microphone
+        self.recognizer = recognizer
+        self.buffer_seconds = buffer_seconds
+        self.calibration_seconds = calibration_seconds
+        self.noise_adaptation = noise_adaptation
+        self.min_energy_threshold = min_energy_threshold
+
+        self.source = None
+        self.buffer: Optional[AudioRingBuffer] = None
+        self.noise_floor = None
+        self.running = False
+        self._thread = None
+        self.read_errors = 0
+
+    @property
+    def sample_rate(self) -> int:
+        return self.source.SAMPLE_RATE
+
+    @property
+    def sample_width(self) -> int:
+        return self.source.SAMPLE_WIDTH
+
+    @property
+    def chunk_duration(self) -> float:
+        """Durée d'un bloc en secondes"""
+        return self.source.CHUNK / self.source.SAMPLE_RATE
+
+    def start(self):
+        """Ouvre le flux, calibre une fois et lance la capture"""
+        if self.running:
+            return True
+
+        self.source = self.microphone.__enter__()
+
+        # Calibration unique au démarrage
+        self.recognizer.adjust_for_ambient_noise(self.source, duration=self.calibration_seconds)
+        self.noise_floor = self.recognizer.energy_threshold / self.recognizer.dynamic_energy_ratio
+
+        capacity = max(1, int(self.buffer_seconds / self.chunk_duration))
+        self.buffer = AudioRingBuffer(capacity)
+
+        self.running = True
+        self._thread = threading.Thread(target=self._capture_loop, daemon=True)
+        self._thread.start()
+        return True
+
+    def stop(self):
+        """Arrête la capture et ferme le flux"""
+        self.running = False
+        if self._thread:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+        if self.source is not None:
+            try:
+                self.microphone.__exit__(None, None, None)
+            except Exception:
+                pass
+            self.source = None
+
+    def _capture_loop(self):
+        """Lit le micro sans interruption et remplit le tampon"""
+        while self.running:
+            try:
+                chunk = self.source.stream.read(self.source.CHUNK)
+            except Exception:
+                self.read_errors += 1
+                time.sleep(0.01)
+                continue
+
+            self.buffer.write(chunk)
+            self._adapt_threshold(chunk)
+
+    def _adapt_threshold(self, chunk: bytes):
+        """Suit le niveau de bruit: vite vers le bas, très lentement vers le haut"""
+        energy = chunk_rms(chunk)
+        rate = self.noise_adaptation
+        if energy >= self.recognizer.energy_threshold:
+            # Parole probable: ne laisser monter le plancher que si le bruit persiste
+            rate *= 0.005
+
+        self.noise_floor += (energy - self.noise_floor) * rate
+        self.recognizer.energy_threshold = max(
+            self.min_energy_threshold,
+            self.noise_floor * self.recognizer.dynamic_energy_ratio
+        )
+
+
+def load_wav(path: str) -> Tuple[bytes, int]:
+    """
+    Lit un WAV PCM 16 bits (mixé en mono)
+
+    Returns:
+        (audio PCM 16 bits mono, fréquence d'échantillonnage)
+    """
+    import wave
+    with wave.open(path, "rb") as wav:
+        if wav.getsampwidth() != 2:
+            raise ValueError(f"{path}: seul le PCM 16 bits est supporté")
+        sample_rate = wav.getframerate()
+        channels = wav.getnchannels()
+        data = wav.readframes(wav.getnframes())
+
+    if channels > 1:
+        samples = np.frombuffer(data, dtype=np.int16).reshape(-1, channels)
+        data = samples.mean(axis=1).astype(np.int16).tobytes()
+    return data, sample_rate
+
+
+class ReplayCapture:
+    """Rejoue des fichiers WAV à la place du micro (même interface que ContinuousCapture)"""
+
+    SAMPLE_WIDTH = 2
+
+    def __init__(self, paths: List[str], chunk_size: int = 1024, speed: float = 1.0,
+                 gap_seconds: float = 1.0):
+        """
+        Args:
+            paths: Fichiers WAV rejoués dans l'ordre
+            chunk_size: Échantillons par bloc (comme sr.Microphone.CHUNK)
+            speed: 1.0 = temps réel, 0 = aussi vite que possible
+            gap_seconds: Silence inséré entre deux fichiers
+        """
+        self.paths = list(paths)
+        self.chunk_size = chunk_size
+        self.speed = speed
+        self.gap_seconds = gap_seconds
+
+        self.audio: List[bytes] = []
+        self._sample_rate = None
+        for path in self.paths:
+            data, rate = load_wav(path)
+            if self._sample_rate is None:
+                self._sample_rate = rate
+            if rate != self._sample_rate:
+                print(f"⚠️ Fichier ignoré (fréquence {rate} Hz au lieu de {self._sample_rate}): {path}")
+                continue
+            self.audio.append(data)
+
+        self.buffer: Optional[AudioRingBuffer] = None
+        self.noise_floor = None
+        self.running = False
+        self.finished = threading.Event()
+        self._thread = None
+
+    @property
+    def sample_rate(self) -> int:
+        return self._sample_rate or 16000
+
+    @property
+    def sample_width(self) -> int:
+        return self.SAMPLE_WIDTH
+
+    @property
+    def chunk_duration(self) -> float:
+        return self.chunk_size / self.sample_rate
+
+    def start(self):
+        """Lance la lecture des fichiers dans le tampon"""
+        if self.running:
+            return True
+
+        chunk_bytes = self.chunk_size * self.SAMPLE_WIDTH
+        gap = bytes(int(self.gap_seconds * self.sample_rate) * self.SAMPLE_WIDTH)
+        stream = gap.join(self.audio) + gap
+        self._chunks = [stream[i:i + chunk_bytes] for i in range(0, len(stream), chunk_bytes)]
+
+        # Lecture accélérée: le tampon contient tout, le lecteur ne perd rien
+        capacity = len(self._chunks) if self.speed <= 0 else int(10.0 / self.chunk_duration)
+        self.buffer = AudioRingBuffer(max(1, capacity))
+
+        self.finished.clear()
+        self.running = True
+        self._thread = threading.Thread(target=self._replay_loop, daemon=True)
+        self._thread.start()
+        return True
+
+    def stop(self):
+        self.running = False
+        if self._thread:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+
+    def _replay_loop(self):
+        """Écrit les blocs au rythme demandé"""
+        started = time.perf_counter()
+        for i, chunk in enumerate(self._chunks):
+            if not self.running:
+                break
+            if self.speed > 0:
+                due = started + i * self.chunk_duration / self.speed
+                delay = due - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+            self.buffer.write(chunk)
+        self.finished.set()
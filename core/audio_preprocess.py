@@ -0,0 +1,312 @@
+"""
+Prétraitement audio pour Zodiac OS
+Mixage mono → filtre anti-repliement + rééchantillonnage → réduction de bruit
+(soustraction spectrale) → contrôle automatique du gain.
+Tous les calculs travaillent sur des tampons NumPy alloués une seule fois.
+"""
+
+import time
+from typing import Dict, Optional
+
+import numpy as np
+
+
+class AudioPreprocessor:
+    """Conditionne un flux PCM 16 bits pour la reconnaissance"""
+
+    def __init__(self, input_rate: int, target_rate: Optional[int] = None, channels: int = 1,
+                 noise_reduction: bool = True, agc: bool = True, target_rms: float = 3000.0,
+                 max_gain: float = 8.0, fft_size: int = 512, over_subtraction: float = 1.5,
+                 spectral_floor: float = 0.08, noise_adaptation: float = 0.05,
+                 lowpass_taps: int = 31, max_chunk: int = 8192):
+        """
+        Args:
+            input_rate: Fréquence du micro
+            target_rate: Fréquence du moteur de reconnaissance (None = inchangée)
+            channels: Canaux entrelacés en entrée
+            noise_reduction: Activer la soustraction spectrale
+            agc: Activer le contrôle automatique du gain
+            target_rms: Niveau RMS visé pour la parole
+            max_gain: Gain maximum (le bruit n'est jamais amplifié)
+            fft_size: Taille des trames de la soustraction spectrale (recouvrement 50%)
+            over_subtraction: Facteur appliqué au spectre du bruit
+            spectral_floor: Gain minimum par fréquence (limite le "bruit musical")
+            noise_adaptation: Vitesse d'apprentissage du spectre du bruit
+            lowpass_taps: Taille du filtre anti-repliement
+            max_chunk: Échantillons par canal au-delà desquels un bloc est découpé
+        """
+        self.input_rate = input_rate
+        self.output_rate = target_rate or input_rate
+        self.channels = channels
+        self.ratio = input_rate / self.output_rate
+        self.noise_reduction = noise_reduction
+        self.agc = agc
+        self.target_rms = target_rms
+        self.max_gain = max_gain
+        self.over_subtraction = over_subtraction
+        self.spectral_floor = spectral_floor
+        self.noise_adaptation = noise_adaptation
+        self.max_chunk = max_chunk
+
+        # Filtre passe-bas (sinc fenêtré) avant de réduire la fréquence
+        self._taps = None
+        if self.ratio > 1:
+            cutoff = 0.45 / self.ratio
+            n = np.arange(lowpass_taps) - (lowpass_taps - 1) / 2
+            taps = 2 * cutoff * np.sinc(2 * cutoff * n) * np.hamming(lowpass_taps)
+            self._taps = (taps / taps.sum())[::-1].astype(np.float32)
+        history = len(self._taps) - 1 if self._taps is not None else 0
+        self._history = history
+
+        # Tampons (alloués une fois)
+        max_out = int(max_chunk / self.ratio) + 2
+        self._mono = np.zeros(max_chunk, dtype=np.float32)
+        self._fir_in = np.zeros(history + max_chunk, dtype=np.float32)
+        self._filtered = np.zeros(max_chunk, dtype=np.float32)
+        self._src = np.zeros(max_chunk + 1, dtype=np.float32)
+        self._steps = np.arange(max_out, dtype=np.float64) * self.ratio
+        self._positions = np.zeros(max_out, dtype=np.float64)
+        self._floor = np.zeros(max_out, dtype=np.float64)
+        self._frac = np.zeros(max_out, dtype=np.float64)
+        self._idx = np.zeros(max_out, dtype=np.intp)
+        self._idx_next = np.zeros(max_out, dtype=np.intp)
+        self._left = np.zeros(max_out, dtype=np.float32)
+        self._right = np.zeros(max_out, dtype=np.float32)
+        self._resampled = np.zeros(max_out, dtype=np.float32)
+
+        # Soustraction spectrale: trames de fft_size, pas de fft_size / 2
+        self.fft_size = fft_size
+        self.hop = fft_size // 2
+        self._window = np.sqrt(np.hanning(fft_size + 1)[:fft_size]).astype(np.float32)
+        self._fifo = np.zeros(fft_size + max_out, dtype=np.float32)
+        self._fifo_len = 0
+        self._frame = np.zeros(fft_size, dtype=np.float32)
+        self._ola = np.zeros(fft_size, dtype=np.float32)
+        bins = fft_size // 2 + 1
+        self._mag = np.zeros(bins, dtype=np.float64)
+        self._gain = np.zeros(bins, dtype=np.float64)
+        self._noise_mag = None
+        self._noise_energy = None
+
+        self._out = np.zeros(max_out + fft_size, dtype=np.float32)
+        self._out_int16 = np.zeros(max_out + fft_size, dtype=np.int16)
+
+        # État du rééchantillonnage: position fractionnaire dans _src (indice 0 = dernier échantillon précédent)
+        self._pos = 1.0
+        self._agc_gain = 1.0
+
+        self.stats = {
+            "chunks": 0,
+            "input_bytes": 0,
+            "output_bytes": 0,
+            "cpu_ms": 0.0,
+            "gain": 1.0,
+            "noise_rms": 0.0
+        }
+
+    @property
+    def latency_ms(self) -> float:
+        """Retard ajouté par la soustraction spectrale"""
+        if not self.noise_reduction:
+            return 0.0
+        return (self.fft_size - self.hop) / self.output_rate * 1000
+
+    def process(self, chunk: bytes) -> bytes:
+        """
+        Traite un bloc PCM 16 bits entrelacé
+
+        Returns:
+            PCM 16 bits mono à output_rate (peut être vide: trame en cours de remplissage)
+        """
+        start = time.perf_counter()
+        samples = np.frombuffer(chunk, dtype=np.int16)
+        frames = samples.size // self.channels
+
+        if frames > self.max_chunk:
+            step = self.max_chunk * self.channels
+            return b"".join(self.process(samples[i:i + step].tobytes()) for i in range(0, samples.size, step))
+
+        mono = self._downmix(samples[:frames * self.channels], frames)
+        signal = self._resample(mono) if self.ratio != 1 else mono
+        out = self._denoise(signal) if self.noise_reduction else self._passthrough(signal)
+        if self.agc and out.size:
+            self._apply_agc(out)
+
+        count = out.size
+        np.clip(out, -32768, 32767, out=out)
+        np.copyto(self._out_int16[:count], out, casting='unsafe')
+        result = self._out_int16[:count].tobytes()
+
+        self.stats["chunks"] += 1
+        self.stats["input_bytes"] += len(chunk)
+        self.stats["output_bytes"] += len(result)
+        self.stats["cpu_ms"] += (time.perf_counter() - start) * 1000
+        return result
+
+    def _downmix(self, samples: np.ndarray, frames: int) -> np.ndarray:
+        mono = self._mono[:frames]
+        if self.channels > 1:
+            np.mean(samples.reshape(frames, self.channels), axis=1, dtype=np.float32, out=mono)
+        else:
+            np.copyto(mono, samples)
+        return mono
+
+    def _resample(self, mono: np.ndarray) -> np.ndarray:
+        """Filtre anti-repliement puis interpolation linéaire (continue d'un bloc à l'autre)"""
+        n = mono.size
+        if self._taps is not None:
+            h = self._history
+            self._fir_in[h:h + n] = mono
+            windows = np.lib.stride_tricks.sliding_window_view(self._fir_in[:h + n], len(self._taps))
+            np.dot(windows, self._taps, out=self._filtered[:n])
+            if h:
+                self._fir_in[:h] = self._fir_in[n:n + h]
+            mono = self._filtered[:n]
+
+        src = self._src
+        src[1:n + 1] = mono
+        last = n
+        if self._pos > last:
+            count = 0
+        else:
+            count = int((last - self._pos) // self.ratio) + 1
+
+        if count:
+            positions = self._positions[:count]
+            floor = self._floor[:count]
+            frac = self._frac[:count]
+            idx = self._idx[:count]
+            idx_next = self._idx_next[:count]
+            left = self._left[:count]
+            right = self._right[:count]
+
+            np.add(self._steps[:count], self._pos, out=positions)
+            np.floor(positions, out=floor)
+            np.subtract(positions, floor, out=frac)
+            np.copyto(idx, floor, casting='unsafe')
+            np.add(idx, 1, out=idx_next)
+            np.minimum(idx_next, last, out=idx_next)
+            np.take(src, idx, out=left)
+            np.take(src, idx_next, out=right)
+            np.subtract(right, left, out=right)
+            np.multiply(right, frac, out=right, casting='same_kind')
+            np.add(left, right, out=self._resampled[:count])
+
+        self._pos += count * self.ratio - last
+        src[0] = src[last]
+        return self._resampled[:count]
+
+    def _passthrough(self, signal: np.ndarray) -> np.ndarray:
+        out = self._out[:signal.size]
+        np.copyto(out, signal)
+        return out
+
+    def _denoise(self, signal: np.ndarray) -> np.ndarray:
+        """Soustraction spectrale en recouvrement-addition (fenêtres racine de Hann)"""
+        n_fft, hop = self.fft_size, self.hop
+        self._fifo[self._fifo_len:self._fifo_len + signal.size] = signal
+        self._fifo_len += signal.size
+
+        produced = 0
+        while self._fifo_len >= n_fft:
+            frame = self._frame
+            np.multiply(self._fifo[:n_fft], self._window, out=frame)
+            energy = float(np.dot(frame, frame)) / n_fft
+
+            spectrum = np.fft.rfft(frame)
+            np.abs(spectrum, out=self._mag)
+            self._update_noise(energy)
+
+            # gain = max(1 - a * bruit / signal, plancher)
+            np.add(self._mag, 1e-9, out=self._gain)
+            np.divide(self._noise_mag, self._gain, out=self._gain)
+            np.multiply(self._gain, -self.over_subtraction, out=self._gain)
+            np.add(self._gain, 1.0, out=self._gain)
+            np.maximum(self._gain, self.spectral_floor, out=self._gain)
+            spectrum *= self._gain
+
+            np.multiply(np.fft.irfft(spectrum, n_fft), self._window, out=frame, casting='same_kind')
+            self._ola += frame
+            self._out[produced:produced + hop] = self._ola[:hop]
+            produced += hop
+            self._ola[:n_fft - hop] = self._ola[hop:]
+            self._ola[n_fft - hop:] = 0.0
+
+            self._fifo[:self._fifo_len - hop] = self._fifo[hop:self._fifo_len]
+            self._fifo_len -= hop
+
+        return self._out[:produced]
+
+    def _update_noise(self, energy: float):
+        """Apprend le spectre du bruit sur les trames calmes"""
+        if self._noise_mag is None:
+            self._noise_mag = self._mag.copy()
+            self._noise_energy = energy
+            return
+
+        # Niveau de bruit: suit vite les baisses, très lentement les hausses
+        if energy < self._noise_energy:
+            self._noise_energy = energy
+        else:
+            self._noise_energy += (energy - self._noise_energy) * 0.002
+
+        if energy < self._noise_energy * 2.0:
+            # noise += (mag - noise) * a, sans tampon temporaire
+            self._noise_mag *= (1 - self.noise_adaptation)
+            self._noise_mag += self.noise_adaptation * self._mag
+        self.stats["noise_rms"] = round(float(np.sqrt(self._noise_energy)), 1)
+
+    def _apply_agc(self, out: np.ndarray):
+        """Gain lissé: baisse rapide, remontée lente, jamais sur le silence"""
+        rms = float(np.sqrt(np.dot(out, out) / out.size))
+        gate = max(3.0 * self.stats["noise_rms"], 100.0)
+        if rms > gate:
+            desired = min(self.max_gain, max(0.1, self.target_rms / rms))
+            rate = 0.3 if desired < self._agc_gain else 0.02
+            self._agc_gain += (desired - self._agc_gain) * rate
+        if self._agc_gain != 1.0:
+            out *= self._agc_gain
+        self.stats["gain"] = round(self._agc_gain, 2)
+
+    def get_stats(self) -> Dict:
+        stats = dict(self.stats)
+        if stats["input_bytes"]:
+            stats["size_ratio"] = round(stats["output_bytes"] / stats["input_bytes"], 3)
+        stats["latency_ms"] = round(self.latency_ms, 1)
+        return stats
+
+
+def _noisy_speech(sample_rate: int, seconds: float = 10.0, channels: int = 2) -> np.ndarray:
+    """Pseudo-parole faible sur un bruit de ventilateur (stéréo entrelacé)"""
+    rng = np.random.default_rng(0)
+    t = np.arange(int(sample_rate * seconds)) / sample_rate
+    signal = rng.normal(0, 300, t.size) + 200 * np.sin(2 * np.pi * 120 * t)
+    for start in (1.0, 4.0, 7.0):
+        mask = (t >= start) & (t < start + 1.5)
+        envelope = np.sin(np.pi * (t[mask] - start) / 1.5)
+        signal[mask] += 1200 * envelope * np.sin(2 * np.pi * 220 * t[mask]) * (1 + np.sin(2 * np.pi * 5 * t[mask]))
+    signal = np.clip(signal, -32768, 32767).astype(np.int16)
+    return np.repeat(signal, channels)
+
+
+# Benchmark: coût CPU et taille des données envoyées à la reconnaissance
+# Usage: python -m core.audio_preprocess [fréquence_entrée] [fréquence_sortie]
+if __name__ == "__main__":
+    import sys
+
+    input_rate = int(sys.argv[1]) if len(sys.argv) > 1 else 48000
+    output_rate = int(sys.argv[2]) if len(sys.argv) > 2 else 16000
+    audio = _noisy_speech(input_rate)
+    seconds = audio.size / 2 / input_rate
+
+    preprocessor = AudioPreprocessor(input_rate, output_rate, channels=2)
+    chunk = 1024 * 2
+    cpu_start = time.process_time()
+    output = b"".join(preprocessor.process(audio[i:i + chunk].tobytes()) for i in range(0, audio.size, chunk))
+    cpu = time.process_time() - cpu_start
+
+    stats = preprocessor.get_stats()
+    print(f"{input_rate} Hz stéréo → {output_rate} Hz mono, {seconds:.1f} s audio")
+    print(f"  CPU: {cpu * 1000 / seconds:.2f} ms par seconde d'audio")
+    print(f"  Taille: {stats['input_bytes']} → {stats['output_bytes']} octets ({stats['size_ratio']})")
+    print(f"  Gain final: {stats['gain']}, bruit estimé: {stats['noise_rms']}, latence: {stats['latency_ms']} ms")
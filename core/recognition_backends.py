@@ -0,0 +1,411 @@
+"""
+Moteurs de reconnaissance vocale interchangeables pour Zodiac OS
+- google: reconnaissance cloud (speech_recognition)
+- vosk: reconnaissance hors ligne (modèle local)
+- replay: transcriptions enregistrées, pour mesurer les latences sans micro ni réseau
+"""
+
+import os
+import glob
+import json
+import hashlib
+import threading
+import time
+from typing import Dict, List, Optional
+
+
+class RecognitionError(Exception):
+    """Le moteur n'a pas pu traiter l'audio (réseau, modèle absent...)"""
+
+
+class RecognitionStream:
+    """Reconnaissance au fil de l'eau d'une phrase (hypothèses partielles)"""
+
+    def accept(self, audio: bytes) -> str:
+        """Ajoute de l'audio et retourne l'hypothèse courante"""
+        raise NotImplementedError
+
+    def finish(self) -> Optional[str]:
+        """Termine la phrase et retourne le texte final"""
+        raise NotImplementedError
+
+
+class RecognizerBackend:
+    """Interface commune des moteurs de reconnaissance"""
+
+    name = "base"
+    offline = False
+    # start_stream() disponible (hypothèses partielles pendant la phrase)
+    supports_partials = False
+    # Fréquence attendue par le moteur (None = celle de la source)
+    native_rate = None
+    # Résultat qui dépend de l'ordre des appels: une seule reconnaissance à la fois
+    ordered = False
+
+    def is_available(self) -> bool:
+        return True
+
+    def start_stream(self, sample_rate: int, sample_width: int = 2) -> RecognitionStream:
+        raise NotImplementedError(f"{self.name}: pas de reconnaissance partielle")
+
+    def transcribe(self, audio: bytes, sample_rate: int, sample_width: int = 2) -> Optional[str]:
+        """
+        Transcrit une phrase
+
+        Args:
+            audio: PCM mono
+            sample_rate: Fréquence d'échantillonnage
+            sample_width: Octets par échantillon
+
+        Returns:
+            Texte reconnu, ou None si l'audio n'est pas compris
+
+        Raises:
+            RecognitionError: si le moteur est indisponible
+        """
+        raise NotImplementedError
+
+
+class GoogleBackend(RecognizerBackend):
+    """Reconnaissance cloud Google (comportement historique)"""
+
+    name = "google"
+    # 16 kHz suffit à la parole et divise la taille des envois par ~3 (micro à 44.1/48 kHz)
+    native_rate = 16000
+
+    def __init__(self, recognizer=None, language: str = "fr-FR"):
+        import speech_recognition as sr
+        self._sr = sr
+        self.recognizer = recognizer or sr.Recognizer()
+        self.language = language
+
+    def transcribe(self, audio: bytes, sample_rate: int, sample_width: int = 2) -> Optional[str]:
+        data = self._sr.AudioData(audio, sample_rate, sample_width)
+        try:
+            return self.recognizer.recognize_google(data, language=self.language)
+        except self._sr.UnknownValueError:
+            return None
+        except self._sr.RequestError as e:
+            raise RecognitionError(str(e))
+
+
+class _VoskStream(RecognitionStream):
+    def __init__(self, model, sample_rate: int):
+        from vosk import KaldiRecognizer
+        self.recognizer = KaldiRecognizer(model, sample_rate)
+        self.parts: List[str] = []
+
+    def accept(self, audio: bytes) -> str:
+        if self.recognizer.AcceptWaveform(audio):
+            # Vosk a fermé un morceau de phrase (pause interne)
+            part = json.loads(self.recognizer.Result()).get("text", "")
+            if part:
+                self.parts.append(part)
+            return " ".join(self.parts)
+        partial = json.loads(self.recognizer.PartialResult()).get("partial", "")
+        return " ".join(self.parts + [partial]).strip()
+
+    def finish(self) -> Optional[str]:
+        last = json.loads(self.recognizer.FinalResult()).get("text", "")
+        text = " ".join(self.parts + [last]).strip()
+        return text or None
+
+
+class VoskBackend(RecognizerBackend):
+    """Reconnaissance hors ligne avec Vosk (pip install vosk + modèle français)"""
+
+    name = "vosk"
+    offline = True
+    supports_partials = True
+    native_rate = 16000
+    DEFAULT_MODEL = os.path.join("data", "models", "vosk-model-small-fr")
+
+    def __init__(self, model_path: str = DEFAULT_MODEL):
+        self.model_path = model_path
+        self.model = None
+        try:
+            from vosk import Model, SetLogLevel
+            SetLogLevel(-1)
+            self.model = Model(model_path)
+            print(f"✅ Modèle Vosk chargé: {model_path}")
+        except ImportError:
+            print("⚠️ Vosk non installé (pip install vosk)")
+        except Exception as e:
+            print(f"⚠️ Modèle Vosk indisponible ({model_path}): {e}")
+
+    def is_available(self) -> bool:
+        return self.model is not None
+
+    def transcribe(self, audio: bytes, sample_rate: int, sample_width: int = 2) -> Optional[str]:
+        if self.model is None:
+            raise RecognitionError("Modèle Vosk non chargé")
+
+        from vosk import KaldiRecognizer
+        # Le modèle est partagé, un reconnaisseur par phrase (appels parallèles possibles)
+        recognizer = KaldiRecognizer(self.model, sample_rate)
+        recognizer.AcceptWaveform(audio)
+        text = json.loads(recognizer.FinalResult()).get("text", "").strip()
+        return text or None
+
+    def start_stream(self, sample_rate: int, sample_width: int = 2) -> RecognitionStream:
+        if self.model is None:
+            raise RecognitionError("Modèle Vosk non chargé")
+        return _VoskStream(self.model, sample_rate)
+
+
+class _ReplayStream(RecognitionStream):
+    """Dévoile la prochaine transcription au rythme de l'audio reçu"""
+
+    def __init__(self, backend: "ReplayBackend", sample_rate: int, sample_width: int):
+        self.backend = backend
+        self.bytes_per_second = sample_rate * sample_width
+        self.received = 0
+        self.words = (backend.peek() or "").split()
+
+    def accept(self, audio: bytes) -> str:
+        self.received += len(audio)
+        count = int(self.received / self.bytes_per_second * self.backend.words_per_second)
+        return " ".join(self.words[:count])
+
+    def finish(self) -> Optional[str]:
+        return self.backend.next_transcript()
+
+
+class ReplayBackend(RecognizerBackend):
+    """Retourne des transcriptions connues, avec une latence fixe (benchmarks déterministes)"""
+
+    name = "replay"
+    offline = True
+    supports_partials = True
+    # Après prétraitement ou VAD l'audio ne correspond plus aux fichiers:
+    # les textes sont servis dans l'ordre des segments
+    ordered = True
+
+    def __init__(self, transcripts: Optional[List[str]] = None, latency_ms: float = 0.0,
+                 words_per_second: float = 3.0):
+        """
+        Args:
+            transcripts: Textes retournés dans l'ordre pour un audio inconnu
+            latency_ms: Latence simulée de chaque appel
+            words_per_second: Débit des hypothèses partielles simulées
+        """
+        self.latency_ms = latency_ms
+        self.words_per_second = words_per_second
+        self.by_audio: Dict[str, str] = {}
+        self.sequence: List[str] = list(transcripts or [])
+        self._index = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(audio: bytes) -> str:
+        return hashlib.sha1(audio).hexdigest()
+
+    def register(self, audio: bytes, text: str):
+        """Associe un audio exact à son texte (et l'ajoute à la séquence)"""
+        self.by_audio[self._key(audio)] = text
+        self.sequence.append(text)
+
+    @classmethod
+    def from_directory(cls, directory: str, latency_ms: float = 0.0) -> "ReplayBackend":
+        """Charge les paires fichier.wav / fichier.txt d'un dossier"""
+        from core.audio_capture import load_wav
+
+        backend = cls(latency_ms=latency_ms)
+        for path in list_wav_files(directory):
+            text = read_transcript(path)
+            if text is not None:
+                audio, _ = load_wav(path)
+                backend.register(audio, text)
+        return backend
+
+    def peek(self) -> Optional[str]:
+        """Prochaine transcription de la séquence, sans la consommer"""
+        with self._lock:
+            if self._index < len(self.sequence):
+                return self.sequence[self._index]
+            return None
+
+    def start_stream(self, sample_rate: int, sample_width: int = 2) -> RecognitionStream:
+        return _ReplayStream(self, sample_rate, sample_width)
+
+    def transcribe(self, audio: bytes, sample_rate: int, sample_width: int = 2) -> Optional[str]:
+        if self.latency_ms:
+            time.sleep(self.latency_ms / 1000)
+
+        text = self.by_audio.get(self._key(audio))
+        if text is not None:
+            return text
+
+        # Audio redécoupé par la VAD: les phrases arrivent dans l'ordre des fichiers
+        return self.next_transcript()
+
+    def next_transcript(self) -> Optional[str]:
+        """Consomme la prochaine transcription de la séquence"""
+        with self._lock:
+            if self._index >= len(self.sequence):
+                return None
+            text = self.sequence[self._index]
+            self._index += 1
+            return text
+
+
+BACKENDS = {
+    "google": GoogleBackend,
+    "vosk": VoskBackend,
+    "replay": ReplayBackend
+}
+
+
+def create_backend(name: str = "google", **options) -> RecognizerBackend:
+    """
+    Crée un moteur par son nom ("google", "vosk", "replay")
+
+    Raises:
+        ValueError: nom inconnu
+    """
+    if name not in BACKENDS:
+        raise ValueError(f"Moteur de reconnaissance inconnu: {name} (disponibles: {', '.join(BACKENDS)})")
+    return BACKENDS[name](**options)
+
+
+def list_wav_files(directory: str) -> List[str]:
+    return sorted(glob.glob(os.path.join(directory, "*.wav")))
+
+
+def read_transcript(wav_path: str) -> Optional[str]:
+    """Transcription attendue d'un WAV (fichier .txt du même nom)"""
+    txt_path = os.path.splitext(wav_path)[0] + ".txt"
+    if not os.path.exists(txt_path):
+        return None
+    with open(txt_path, "r", encoding="utf-8") as f:
+        return f.read().strip()
+
+
+def _normalize(text: Optional[str]) -> str:
+    return " ".join((text or "").lower().split())
+
+
+def benchmark_backend(backend: RecognizerBackend, paths: List[str]) -> Dict:
+    """Transcrit chaque fichier entier et mesure la latence"""
+    from core.audio_capture import load_wav
+
+    results = []
+    for path in paths:
+        audio, sample_rate = load_wav(path)
+        start = time.perf_counter()
+        try:
+            text = backend.transcribe(audio, sample_rate)
+        except RecognitionError as e:
+            text = None
+            print(f"⚠️ {os.path.basename(path)}: {e}")
+        latency = (time.perf_counter() - start) * 1000
+
+        expected = read_transcript(path)
+        results.append({
+            "file": os.path.basename(path),
+            "audio_s": round(len(audio) / 2 / sample_rate, 2),
+            "latency_ms": round(latency, 1),
+            "text": text,
+            "correct": None if expected is None else _normalize(text) == _normalize(expected)
+        })
+
+    latencies = sorted(r["latency_ms"] for r in results)
+    checked = [r["correct"] for r in results if r["correct"] is not None]
+    return {
+        "backend": backend.name,
+        "files": results,
+        "avg_ms": round(sum(latencies) / len(latencies), 1) if latencies else 0.0,
+        "p50_ms": latencies[len(latencies) // 2] if latencies else 0.0,
+        "accuracy": round(sum(checked) / len(checked), 3) if checked else None
+    }
+
+
+def recognition_workers(backend: RecognizerBackend, workers: int) -> int:
+    """Reconnaissances simultanées pour un moteur (une seule si son résultat dépend de l'ordre)"""
+    return 1 if getattr(backend, "ordered", False) else workers
+
+
+def benchmark_pipeline(backend: RecognizerBackend, paths: List[str], speed: float = 0,
+                       workers: int = 2) -> Dict:
+    """Rejoue les fichiers dans la chaîne complète capture → VAD → pipeline"""
+    from core.audio_capture import ReplayCapture
+    from core.vad import VoiceActivityDetector
+    from core.voice_pipeline import VoicePipeline
+
+    capture = ReplayCapture(paths, speed=speed)
+    transcripts = []
+    pipeline = VoicePipeline(
+        lambda segment: backend.transcribe(segment, capture.sample_rate, capture.sample_width),
+        transcripts.append,
+        workers=recognition_workers(backend, workers)
+    )
+    vad = VoiceActivityDetector(capture.sample_rate)
+
+    pipeline.start()
+    capture.start()
+    seq = 0
+    while True:
+        chunks, seq = capture.buffer.read_from(seq, timeout=0.1)
+        for chunk in chunks:
+            for segment in vad.process(chunk):
+                pipeline.submit(segment)
+        if capture.finished.is_set() and seq >= capture.buffer.write_position:
+            break
+
+    # Laisser le pipeline se vider
+    deadline = time.time() + 30
+    while time.time() < deadline:
+        stats = pipeline.get_stats()
+        done = stats["stages"]["recognition"]["count"] + stats["dropped"]
+        if done >= vad.stats["segments"] and stats["dispatch_queue"] == 0:
+            break
+        time.sleep(0.05)
+    time.sleep(0.1)
+
+    pipeline.stop()
+    capture.stop()
+
+    stats = pipeline.get_stats()
+    stats["transcripts"] = transcripts
+    stats["vad"] = vad.stats
+    return stats
+
+
+# Benchmark des moteurs
+# Usage: python -m core.recognition_backends <dossier_wav> [google|vosk|replay] [--pipeline]
+if __name__ == "__main__":
+    import sys
+
+    args = [a for a in sys.argv[1:] if not a.startswith("--")]
+    if not args:
+        print("Usage: python -m core.recognition_backends <dossier_wav> [google|vosk|replay] [--pipeline]")
+        sys.exit(1)
+
+    directory = args[0]
+    name = args[1] if len(args) > 1 else "replay"
+    paths = list_wav_files(directory)
+    if not paths:
+        print(f"❌ Aucun fichier WAV dans {directory}")
+        sys.exit(1)
+
+    if name == "replay":
+        backend = ReplayBackend.from_directory(directory, latency_ms=300)
+    else:
+        backend = create_backend(name)
+    if not backend.is_available():
+        print(f"❌ Moteur {name} indisponible")
+        sys.exit(1)
+
+    if "--pipeline" in sys.argv:
+        report = benchmark_pipeline(backend, paths)
+        print(f"Transcriptions: {report['transcripts']}")
+        for stage, values in report["stages"].items():
+            print(f"  {stage:14s} {values}")
+        print(f"  Abandons: {report['dropped']}, VAD: {report['vad']}")
+    else:
+        report = benchmark_backend(backend, paths)
+        for result in report["files"]:
+            print(f"  {result['file']}: {result['latency_ms']} ms ({result['audio_s']} s) -> {result['text']!r}"
+                  f"{'' if result['correct'] is None else (' ✓' if result['correct'] else ' ✗')}")
+        print(f"{report['backend']}: moyenne {report['avg_ms']} ms, médiane {report['p50_ms']} ms, "
+              f"précision {report['accuracy']}")
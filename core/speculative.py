@@ -0,0 +1,231 @@
+"""
+Préparation spéculative des commandes vocales pour Zodiac OS
+Dès qu'une hypothèse partielle stable ressemble à une commande ("ouvre chr..."),
+le travail sans effet de bord est lancé: recherche de l'application, météo,
+Wikipédia, pré-synthèse de la confirmation. Rien n'est exécuté avant que le
+texte final confirme l'intention.
+"""
+
+import os
+import re
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+from typing import Dict, Optional, Tuple
+
+from core.fuzzy_matcher import FuzzyMatcher
+from core.voice_events import VoiceEvent, PARTIAL, SPEECH_DETECTED
+
+OPEN_VERBS = ("ouvre", "ouvrir", "lance", "lancer", "démarre", "démarrer", "start", "run")
+WEATHER_WORDS = ("météo", "meteo", "weather")
+WIKI_PATTERNS = (
+    r"^(?:qui est|qui était|c'est quoi|qu'est-ce que|qu'est ce que)\s+(.+)$",
+    r"^(?:wikipedia|wiki)\s+(.+)$",
+)
+# Intentions préparées sans réseau (faisables au moment du texte final)
+LOCAL_INTENTS = ("open_app",)
+
+
+class Intent:
+    """Intention reconnue dans un texte"""
+
+    __slots__ = ("kind", "target", "text")
+
+    def __init__(self, kind: str, target: str, text: str):
+        self.kind = kind        # "open_app", "weather" ou "wiki"
+        self.target = target
+        self.text = text
+
+    @property
+    def key(self) -> Tuple[str, str]:
+        return (self.kind, self.target)
+
+    def __repr__(self):
+        return f"Intent({self.kind}, {self.target!r})"
+
+
+class SpeculativeExecutor:
+    """Prépare les commandes probables pendant que l'utilisateur parle"""
+
+    def __init__(self, app_index: Optional[Dict[str, Dict]] = None, tts=None,
+                 default_city: str = "Paris", weather_api_key: Optional[str] = None,
+                 workers: int = 2, max_age: float = 30.0):
+        """
+        Args:
+            app_index: Applications connues {nom: {"name", "path", ...}} (vault_index.json)
+            tts: TTSWorker dont le cache reçoit les confirmations à l'avance
+            default_city: Ville utilisée pour "météo" sans lieu
+            weather_api_key: Clé OpenWeatherMap (sinon wttr.in)
+            workers: Préparations simultanées
+            max_age: Durée de validité d'une préparation (s)
+        """
+        self.app_index = {name.lower(): info for name, info in (app_index or {}).items()}
+        self.tts = tts
+        self.default_city = default_city
+        self.weather_api_key = weather_api_key
+        self.max_age = max_age
+        self.matcher = FuzzyMatcher(threshold=0.6)
+
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="zodiac-speculative")
+        self._prepared: Dict[Tuple[str, str], tuple] = {}
+        self._lock = threading.Lock()
+        self._weather = None
+        self._wiki = None
+
+        self.stats = {"prepared": 0, "hits": 0, "misses": 0, "late": 0, "discarded": 0}
+
+    # --- Reconnaissance d'intention ---
+
+    def resolve_app(self, name: str) -> Optional[str]:
+        """Nom d'application connu le plus proche (préfixe d'abord, puis recherche floue)"""
+        name = name.strip().lower()
+        if not name:
+            return None
+        if name in self.app_index:
+            return name
+
+        candidates = [app for app in self.app_index if app.startswith(name)]
+        if candidates:
+            return min(candidates, key=len)
+
+        match = self.matcher.match_command(name, list(self.app_index))
+        return match[0] if match else None
+
+    def parse(self, text: str) -> Optional[Intent]:
+        """Intention d'un texte (partiel ou final)"""
+        text = text.lower().replace("zodiac", "").strip(" ?!.")
+        if not text:
+            return None
+        words = text.split()
+
+        if words[0] in OPEN_VERBS and len(words) > 1:
+            app = self.resolve_app(" ".join(words[1:]))
+            if app:
+                return Intent("open_app", app, text)
+            return None
+
+        for word in WEATHER_WORDS:
+            if word in words:
+                rest = text.split(word, 1)[1].split()
+                rest = [w for w in rest if w not in ("à", "a", "de", "pour", "sur", "in")]
+                city = " ".join(rest) or self.default_city
+                return Intent("weather", city.title(), text)
+
+        for pattern in WIKI_PATTERNS:
+            match = re.match(pattern, text)
+            if match and len(match.group(1)) > 2:
+                return Intent("wiki", match.group(1).strip(), text)
+        return None
+
+    # --- Préparation (sans effet de bord) ---
+
+    def _prepare(self, intent: Intent):
+        if intent.kind == "open_app":
+            info = dict(self.app_index[intent.target])
+            path = info.get("lnk_path") or info.get("path")
+            info["exists"] = bool(path) and os.path.exists(path)
+            if self.tts:
+                self.tts.prerender([f"Je lance {info.get('name', intent.target)}"])
+            return info
+
+        if intent.kind == "weather":
+            if self._weather is None:
+                from ai.weather import WeatherModule
+                self._weather = WeatherModule(self.weather_api_key)
+            provider = "openweather" if self._weather.api_key else "wttr"
+            return self._weather.get_weather(intent.target, provider)
+
+        if intent.kind == "wiki":
+            if self._wiki is None:
+                from ai.wiki_parser import WikiParser
+                self._wiki = WikiParser(lang="fr")
+            return self._wiki.get_summary(intent.target, sentences=2)
+        return None
+
+    def describe(self, intent: Intent, result) -> Optional[str]:
+        """Texte de réponse pour une intention d'information (météo, Wikipédia)"""
+        if intent.kind == "weather" and result and self._weather is not None:
+            return self._weather.format_weather(result)
+        if intent.kind == "wiki" and result and 'error' not in result:
+            return result.get('summary')
+        return None
+
+    def speculate(self, text: str) -> Optional[Intent]:
+        """Lance la préparation de l'intention du texte partiel (si nouvelle)"""
+        intent = self.parse(text)
+        if intent is None:
+            return None
+        with self._lock:
+            if intent.key in self._prepared:
+                return intent
+            future = self._executor.submit(self._prepare, intent)
+            self._prepared[intent.key] = (future, time.time())
+            self.stats["prepared"] += 1
+        return intent
+
+    def commit(self, text: str, timeout: float = 0.1) -> Tuple[Optional[Intent], object]:
+        """
+        Texte final: récupère la préparation correspondante
+
+        Une préparation encore en cours n'est attendue que timeout secondes.
+        Sans préparation prête, seule la résolution d'application (locale) est
+        faite maintenant: météo et Wikipédia renvoient None et la commande suit
+        le traitement habituel au lieu d'attendre le réseau.
+
+        Returns:
+            (intention ou None, résultat de la préparation ou None)
+        """
+        intent = self.parse(text)
+        with self._lock:
+            prepared = self._prepared.pop(intent.key, None) if intent else None
+            self.stats["discarded"] += len(self._prepared)
+            self._prepared.clear()
+
+        if intent is None:
+            return None, None
+
+        try:
+            if prepared and time.time() - prepared[1] < self.max_age:
+                try:
+                    result = prepared[0].result(timeout)
+                    self.stats["hits"] += 1
+                    return intent, result
+                except FutureTimeout:
+                    # Préparation trop lente: elle finit en arrière-plan, sans être attendue
+                    self.stats["late"] += 1
+            self.stats["misses"] += 1
+            if intent.kind in LOCAL_INTENTS:
+                return intent, self._prepare(intent)
+            return intent, None
+        except Exception as e:
+            print(f"⚠️ Préparation '{intent.kind}' échouée: {e}")
+            return intent, None
+
+    def discard(self):
+        """Oublie les préparations en cours (phrase abandonnée)"""
+        with self._lock:
+            self.stats["discarded"] += len(self._prepared)
+            self._prepared.clear()
+
+    # --- Branchement sur le flux vocal ---
+
+    def attach(self, events):
+        """S'abonne aux hypothèses partielles stables d'un VoiceEventBus"""
+        return events.subscribe(self._on_event, events=(SPEECH_DETECTED, PARTIAL))
+
+    def _on_event(self, event: VoiceEvent):
+        if event.type == SPEECH_DETECTED:
+            self._expire()
+        elif event.stable_text:
+            self.speculate(event.stable_text)
+
+    def _expire(self):
+        now = time.time()
+        with self._lock:
+            for key, (_, created) in list(self._prepared.items()):
+                if now - created > self.max_age:
+                    del self._prepared[key]
+                    self.stats["discarded"] += 1
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False)
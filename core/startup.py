@@ -0,0 +1,254 @@
+"""
+Orchestrateur de démarrage pour Zodiac OS
+Exécute les vraies tâches d'initialisation (en parallèle quand elles sont
+indépendantes) et rapporte la progression réelle au splash screen
+"""
+
+import os
+import json
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, Optional
+
+
+class StartupTask:
+    """Tâche d'initialisation"""
+
+    def __init__(self, name: str, func: Callable, depends_on: Iterable[str] = (),
+                 label: Optional[str] = None, weight: float = 1.0, critical: bool = True):
+        self.name = name
+        self.func = func
+        self.depends_on = tuple(depends_on)
+        self.label = label or name
+        self.weight = weight
+        self.critical = critical
+
+
+class StartupOrchestrator:
+    """Lance les tâches de démarrage selon leurs dépendances et suit la progression"""
+
+    def __init__(self, max_workers: int = 4):
+        self.max_workers = max_workers
+        self.tasks: Dict[str, StartupTask] = {}
+
+        self.results: Dict[str, object] = {}
+        self.errors: Dict[str, str] = {}
+        self.timings: Dict[str, float] = {}
+
+        self._lock = threading.RLock()
+        self._submitted = set()
+        self._finished = set()
+        self._ready_fired = False
+        self._reported_progress = 0.0
+        self._done_event = threading.Event()
+        self._executor = None
+        self._started_at = None
+
+        self.on_progress = None
+        self.on_ready = None
+        self.on_done = None
+
+    def add_task(self, name: str, func: Callable, depends_on: Iterable[str] = (),
+                 label: Optional[str] = None, weight: float = 1.0, critical: bool = True):
+        """
+        Ajoute une tâche
+
+        Args:
+            name: Identifiant de la tâche
+            func: Fonction appelée avec le dictionnaire des résultats déjà disponibles
+            depends_on: Tâches qui doivent être terminées avant
+            label: Texte affiché dans le splash
+            weight: Poids dans la barre de progression
+            critical: Nécessaire avant d'afficher la fenêtre principale
+        """
+        self.tasks[name] = StartupTask(name, func, depends_on, label, weight, critical)
+        return self
+
+    def _critical_path(self):
+        """Tâches critiques et toutes leurs dépendances"""
+        required = set()
+        stack = [name for name, task in self.tasks.items() if task.critical]
+        while stack:
+            name = stack.pop()
+            if name in required or name not in self.tasks:
+                continue
+            required.add(name)
+            stack.extend(self.tasks[name].depends_on)
+        return required
+
+    def run(self, on_progress: Optional[Callable] = None, on_ready: Optional[Callable] = None,
+            on_done: Optional[Callable] = None):
+        """
+        Démarre l'initialisation (non bloquant)
+
+        Args:
+            on_progress: Appelé avec (progression 0-1, message) à chaque tâche terminée
+            on_ready: Appelé une fois quand le chemin critique est terminé
+            on_done: Appelé quand toutes les tâches sont terminées
+        """
+        for name, task in self.tasks.items():
+            missing = [dep for dep in task.depends_on if dep not in self.tasks]
+            if missing:
+                raise ValueError(f"Tâche '{name}': dépendances inconnues {missing}")
+
+        self.on_progress = on_progress
+        self.on_ready = on_ready
+        self.on_done = on_done
+        self._critical = self._critical_path()
+        self._started_at = time.perf_counter()
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers,
+                                            thread_name_prefix="zodiac-startup")
+
+        if not self.tasks:
+            self._check_milestones()
+            return self
+
+        with self._lock:
+            self._submit_ready_tasks()
+        return self
+
+    def _submit_ready_tasks(self):
+        """Soumet les tâches dont les dépendances sont terminées (verrou tenu)"""
+        for name, task in self.tasks.items():
+            if name in self._submitted:
+                continue
+            if all(dep in self._finished for dep in task.depends_on):
+                self._submitted.add(name)
+                future = self._executor.submit(self._run_task, task)
+                future.add_done_callback(lambda f, n=name: self._on_task_finished(n))
+
+    def _run_task(self, task: StartupTask):
+        """Exécute une tâche et mesure sa durée"""
+        start = time.perf_counter()
+        try:
+            deps = {dep: self.results.get(dep) for dep in task.depends_on}
+            self.results[task.name] = task.func(deps)
+        except Exception as e:
+            self.results[task.name] = None
+            self.errors[task.name] = str(e)
+        finally:
+            self.timings[task.name] = (time.perf_counter() - start) * 1000
+
+    def _on_task_finished(self, name: str):
+        """Enregistre la fin d'une tâche et lance les suivantes"""
+        task = self.tasks[name]
+        if name in self.errors:
+            message = f"✗ {task.label}: {self.errors[name]}"
+        else:
+            message = f"✓ {task.label} ({self.timings[name]:.0f} ms)"
+
+        with self._lock:
+            self._finished.add(name)
+            # La barre ne recule jamais, même si deux tâches finissent en même temps
+            self._reported_progress = max(self._reported_progress, self.get_progress())
+            progress = self._reported_progress
+
+        self._notify(self.on_progress, progress, message)
+
+        self._check_milestones()
+
+        with self._lock:
+            if len(self._submitted) < len(self.tasks):
+                self._submit_ready_tasks()
+
+    def _check_milestones(self):
+        """Déclenche on_ready / on_done au bon moment"""
+        fire_ready = fire_done = False
+        with self._lock:
+            if not self._ready_fired and self._critical <= self._finished:
+                self._ready_fired = True
+                fire_ready = True
+            if len(self._finished) == len(self.tasks) and not self._done_event.is_set():
+                self._done_event.set()
+                fire_done = True
+
+        if fire_ready:
+            self._notify(self.on_ready)
+        if fire_done:
+            self._executor.shutdown(wait=False)
+            self._notify(self.on_done)
+
+    @staticmethod
+    def _notify(callback: Optional[Callable], *args):
+        """Appelle un rappel sans qu'une erreur de l'interface bloque le démarrage"""
+        if callback is None:
+            return
+        try:
+            callback(*args)
+        except Exception as e:
+            print(f"⚠️ Erreur rappel de démarrage: {e}")
+
+    def get_progress(self) -> float:
+        """Progression pondérée (0.0 - 1.0)"""
+        total = sum(task.weight for task in self.tasks.values())
+        if not total:
+            return 1.0
+        done = sum(self.tasks[name].weight for name in list(self._finished))
+        return done / total
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Attend la fin de toutes les tâches"""
+        return self._done_event.wait(timeout)
+
+    def get_report(self) -> Dict:
+        """Résumé du démarrage"""
+        elapsed = (time.perf_counter() - self._started_at) * 1000 if self._started_at else 0.0
+        return {
+            "elapsed_ms": round(elapsed, 1),
+            "timings_ms": {name: round(ms, 1) for name, ms in self.timings.items()},
+            "errors": dict(self.errors)
+        }
+
+
+def _load_json(path, default=None):
+    """Charge un fichier JSON s'il existe"""
+    if not os.path.exists(path):
+        return default
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def build_default_startup(data_dir: str = "data") -> StartupOrchestrator:
+    """
+    Construit l'orchestrateur avec les tâches de démarrage de Zodiac
+
+    Chemin critique: configuration + index des applications.
+    Le client IA se prépare en arrière-plan (le moteur vocal est créé par
+    l'onglet Assistant, qui est le seul à l'utiliser).
+    """
+    orchestrator = StartupOrchestrator()
+
+    def load_config(_):
+        config = _load_json(os.path.join(data_dir, "exocortex_config.json"))
+        if config is None:
+            config = _load_json(os.path.join(data_dir, "settings.json"), {})
+        return config
+
+    def load_vault_index(_):
+        return _load_json(os.path.join(data_dir, "vault_index.json"), {})
+
+    def warm_up_ai_client(deps):
+        config = deps.get("config") or {}
+        provider = config.get("ai_provider", "local")
+        api_key = config.get("api_key")
+        use_internet = config.get("use_internet", True)
+
+        if provider == "deepseek" and api_key:
+            from ai.deepseek_api import DeepSeekAPI
+            return DeepSeekAPI(api_key, use_internet)
+        if provider == "gemini" and api_key:
+            from ai.gemini_api import GeminiAPI
+            client = GeminiAPI(api_key, use_internet)
+            # Import du SDK, configuration et session de chat pendant l'écran de démarrage
+            client.warm_up()
+            return client
+
+        from ai.simple_ai import SimpleAI
+        return SimpleAI()
+
+    orchestrator.add_task("config", load_config, label="CONFIGURATION", weight=1)
+    orchestrator.add_task("vault_index", load_vault_index, label="INDEX DES APPLICATIONS", weight=2)
+    orchestrator.add_task("ai_client", warm_up_ai_client, depends_on=["config"],
+                          label="CLIENT IA", weight=2, critical=False)
+    return orchestrator
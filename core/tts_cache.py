@@ -0,0 +1,239 @@
+"""
+Cache audio des phrases fréquentes pour Zodiac OS
+Les confirmations fixes ("Volume augmenté", "Je lance chrome"...) sont synthétisées
+une seule fois en WAV, puis rejouées directement au lieu de repasser par pyttsx3.
+"""
+
+import os
+import json
+import time
+import wave
+import hashlib
+import threading
+from typing import Callable, Dict, Iterable, List, Optional
+
+# Réponses fixes de core.voice_processor et main_old.py
+FIXED_PHRASES = [
+    "Arrêt de Zodiac",
+    "Test réussi ! Zodiac fonctionne correctement.",
+    "Quelle application voulez-vous ouvrir ?",
+    "Musique suivante",
+    "Musique précédente",
+    "Musique en pause",
+    "Lecture musique",
+    "Commande média non reconnue",
+    "Contrôle média non disponible",
+    "Volume augmenté",
+    "Volume baissé",
+    "Volume coupé",
+    "Commande volume non reconnue",
+    "Contrôle volume non disponible",
+    "Informations système non disponibles",
+    "Que voulez-vous rechercher ?",
+    "Bonjour ! Comment puis-je vous aider ?",
+    "Je vais très bien, merci ! Et vous ?",
+    "Avec plaisir !",
+    "Je suis Zodiac, votre assistant vocal !",
+    "Écoute activée",
+    "Écoute désactivée",
+    "Je vous écoute",
+    "Zodiac prêt. Dites Zodiac pour commencer.",
+]
+
+# Modèles à valeurs bornées: une phrase par valeur
+TEMPLATES = {
+    "Je lance {}": ["chrome", "firefox", "edge", "spotify", "discord",
+                    "vscode", "notepad", "calc", "explorer", "cmd"],
+}
+
+
+def expand_templates(templates: Dict[str, Iterable[str]]) -> List[str]:
+    """Génère toutes les phrases des modèles"""
+    return [pattern.format(value) for pattern, values in templates.items() for value in values]
+
+
+def collect_phrases() -> List[str]:
+    """Phrases à pré-synthétiser: réponses fixes, modèles et salutations de SimpleAI"""
+    phrases = list(FIXED_PHRASES) + expand_templates(TEMPLATES)
+    try:
+        from ai.simple_ai import SimpleAI
+        for responses in SimpleAI()._load_commands().values():
+            phrases.extend(responses)
+    except Exception as e:
+        print(f"⚠️ Réponses SimpleAI non chargées: {e}")
+    # Ordre conservé, doublons retirés
+    return list(dict.fromkeys(phrases))
+
+
+class AudioPlayer:
+    """Lecture de WAV interruptible (winsound sous Windows, simpleaudio sinon)"""
+
+    def __init__(self):
+        self.backend = None
+        try:
+            import winsound
+            self._winsound = winsound
+            self.backend = "winsound"
+        except ImportError:
+            try:
+                import simpleaudio
+                self._simpleaudio = simpleaudio
+                self.backend = "simpleaudio"
+            except ImportError:
+                pass
+
+    @property
+    def available(self) -> bool:
+        return self.backend is not None
+
+    def play(self, path: str, should_stop: Callable[[], bool], on_start: Optional[Callable] = None) -> bool:
+        """
+        Joue un fichier et attend la fin (ou l'interruption)
+
+        Returns:
+            False si la lecture a échoué
+        """
+        try:
+            if self.backend == "winsound":
+                with wave.open(path, "rb") as wav:
+                    duration = wav.getnframes() / wav.getframerate()
+                self._winsound.PlaySound(path, self._winsound.SND_FILENAME | self._winsound.SND_ASYNC)
+                if on_start:
+                    on_start()
+                end = time.perf_counter() + duration
+                while time.perf_counter() < end:
+                    if should_stop():
+                        self._winsound.PlaySound(None, 0)
+                        break
+                    time.sleep(0.02)
+                return True
+
+            if self.backend == "simpleaudio":
+                play = self._simpleaudio.WaveObject.from_wave_file(path).play()
+                if on_start:
+                    on_start()
+                while play.is_playing():
+                    if should_stop():
+                        play.stop()
+                        break
+                    time.sleep(0.02)
+                return True
+        except Exception as e:
+            print(f"⚠️ Lecture audio impossible ({path}): {e}")
+        return False
+
+
+class TTSCache:
+    """Fichiers WAV pré-synthétisés, indexés par texte + voix + débit"""
+
+    # Une phrase non cachée répétée autant de fois est ajoutée au cache
+    AUTO_RENDER_AFTER = 3
+
+    def __init__(self, cache_dir: str = os.path.join("data", "tts_cache"), rate: int = 150,
+                 voice: Optional[str] = None):
+        self.cache_dir = cache_dir
+        self.rate = rate
+        self.voice = voice
+        self.player = AudioPlayer()
+
+        self._index_file = os.path.join(cache_dir, "index.json")
+        self._lock = threading.Lock()
+        self._misses: Dict[str, int] = {}
+        self.index: Dict[str, str] = {}
+        self.stats = {"hits": 0, "misses": 0, "rendered": 0, "render_errors": 0}
+
+        os.makedirs(cache_dir, exist_ok=True)
+        self._load_index()
+
+    @property
+    def available(self) -> bool:
+        """Sans lecteur audio, tout passe par la synthèse en direct"""
+        return self.player.available
+
+    @staticmethod
+    def normalize(text: str) -> str:
+        return " ".join(text.split())
+
+    def key(self, text: str) -> str:
+        """Clé du fichier: dépend du texte, de la voix et du débit"""
+        raw = f"{self.voice}|{self.rate}|{self.normalize(text)}"
+        return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:20]
+
+    def path_for(self, text: str) -> str:
+        return os.path.join(self.cache_dir, f"{self.key(text)}.wav")
+
+    def _load_index(self):
+        try:
+            if os.path.exists(self._index_file):
+                with open(self._index_file, "r", encoding="utf-8") as f:
+                    self.index = json.load(f)
+        except Exception as e:
+            print(f"⚠️ Index du cache vocal illisible: {e}")
+            self.index = {}
+
+    def _save_index(self):
+        with open(self._index_file, "w", encoding="utf-8") as f:
+            json.dump(self.index, f, ensure_ascii=False, indent=2)
+
+    def lookup(self, text: str) -> Optional[str]:
+        """Chemin du WAV si la phrase est en cache"""
+        if not self.available:
+            return None
+        key = self.key(text)
+        path = os.path.join(self.cache_dir, f"{key}.wav")
+        if key in self.index and os.path.exists(path):
+            self.stats["hits"] += 1
+            return path
+
+        self.stats["misses"] += 1
+        return None
+
+    def note_miss(self, text: str) -> bool:
+        """Compte une phrase dite en direct; True quand elle mérite d'être cachée"""
+        normalized = self.normalize(text)
+        with self._lock:
+            self._misses[normalized] = self._misses.get(normalized, 0) + 1
+            return self._misses[normalized] == self.AUTO_RENDER_AFTER
+
+    def missing(self, phrases: Iterable[str]) -> List[str]:
+        """Phrases pas encore synthétisées"""
+        return [p for p in phrases if not os.path.exists(self.path_for(p)) or self.key(p) not in self.index]
+
+    def render(self, engine, text: str) -> bool:
+        """
+        Synthétise une phrase dans le cache (à appeler depuis le thread du moteur)
+
+        Args:
+            engine: Moteur pyttsx3
+        """
+        if not self.available:
+            return False
+        key = self.key(text)
+        path = os.path.join(self.cache_dir, f"{key}.wav")
+        temp_path = path + ".tmp.wav"
+        try:
+            engine.save_to_file(text, temp_path)
+            engine.runAndWait()
+            # Certains pilotes écrivent un autre format (AIFF sous macOS)
+            with wave.open(temp_path, "rb") as wav:
+                if wav.getnframes() == 0:
+                    raise ValueError("fichier vide")
+            os.replace(temp_path, path)
+        except Exception as e:
+            self.stats["render_errors"] += 1
+            print(f"⚠️ Pré-synthèse impossible pour '{text}': {e}")
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            return False
+
+        with self._lock:
+            self.index[key] = self.normalize(text)
+            self._save_index()
+        self.stats["rendered"] += 1
+        return True
+
+    def get_stats(self) -> Dict:
+        stats = dict(self.stats)
+        stats["entries"] = len(self.index)
+        stats["player"] = self.player.backend
+        return stats
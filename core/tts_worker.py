@@ -0,0 +1,288 @@
+"""
+Synthèse vocale pour Zodiac OS
+Un seul thread possède le moteur pyttsx3 et lit une file de phrases à priorités:
+plus de threads concurrents sur le même moteur.
+"""
+
+import collections
+import heapq
+import itertools
+import threading
+import time
+from typing import Callable, Dict, Iterable, Optional
+
+# Priorités (la plus petite passe en premier)
+PRIORITY_URGENT = 0   # alertes: jamais abandonnées
+PRIORITY_NORMAL = 1   # réponses aux commandes
+PRIORITY_LOW = 2      # messages d'état
+
+
+class _Utterance:
+    """Phrase en attente"""
+
+    __slots__ = ("priority", "seq", "text", "key", "enqueued_at", "cancelled")
+
+    def __init__(self, priority: int, seq: int, text: str, key: Optional[str]):
+        self.priority = priority
+        self.seq = seq
+        self.text = text
+        self.key = key
+        self.enqueued_at = time.perf_counter()
+        self.cancelled = False
+
+    def __lt__(self, other):
+        return (self.priority, self.seq) < (other.priority, other.seq)
+
+
+def _default_engine_factory(rate: int) -> Callable:
+    def factory():
+        import pyttsx3
+        engine = pyttsx3.init()
+        engine.setProperty('rate', rate)
+        return engine
+    return factory
+
+
+class TTSWorker:
+    """Thread de synthèse vocale unique alimenté par une file à priorités"""
+
+    def __init__(self, rate: int = 150, engine_factory: Optional[Callable] = None,
+                 max_age: float = 10.0, max_queue: int = 8, fallback: Optional[Callable] = None,
+                 cache=None):
+        """
+        Args:
+            rate: Débit de la voix
+            engine_factory: Crée le moteur (appelée dans le thread de synthèse)
+            max_age: Âge (s) au-delà duquel une phrase non urgente n'est plus dite
+            max_queue: Phrases en attente avant d'abandonner les moins prioritaires
+            fallback: Appelée avec le texte si le moteur est indisponible (print par défaut)
+            cache: TTSCache des phrases pré-synthétisées (optionnel)
+        """
+        self.rate = rate
+        self.engine_factory = engine_factory or _default_engine_factory(rate)
+        self.max_age = max_age
+        self.max_queue = max_queue
+        self.fallback = fallback or (lambda text: print(f"(Voix): {text}"))
+        self.cache = cache
+
+        self.engine = None
+        self.running = False
+        self._heap = []
+        self._render_jobs = collections.deque()
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._ready = threading.Event()
+        self._thread = None
+        self._current: Optional[_Utterance] = None
+        self._awaiting_audio = False
+        self._interrupt = False
+
+        self.stats = {
+            "spoken": 0,
+            "interrupted": 0,
+            "coalesced": 0,
+            "stale": 0,
+            "overflow": 0,
+            "max_queue_depth": 0,
+            "last_ttfa_ms": 0.0,
+            "avg_ttfa_ms": 0.0
+        }
+
+    @property
+    def available(self) -> bool:
+        return self.engine is not None
+
+    @property
+    def is_speaking(self) -> bool:
+        return self._current is not None
+
+    def start(self, timeout: float = 5.0) -> bool:
+        """
+        Lance le thread de synthèse
+
+        Returns:
+            True si le moteur a pu être initialisé
+        """
+        if not self.running:
+            self.running = True
+            self._thread = threading.Thread(target=self._run, name="zodiac-tts", daemon=True)
+            self._thread.start()
+        self._ready.wait(timeout)
+        return self.available
+
+    def stop(self):
+        """Arrête le thread (les phrases en attente sont abandonnées)"""
+        self.interrupt()
+        self.running = False
+        with self._cond:
+            self._cond.notify_all()
+        if self._thread:
+            self._thread.join(timeout=2.0)
+            self._thread = None
+
+    def say(self, text: str, priority: int = PRIORITY_NORMAL, interrupt: bool = False,
+            key: Optional[str] = None):
+        """
+        Ajoute une phrase à la file (ne bloque jamais)
+
+        Args:
+            text: Texte à dire
+            priority: PRIORITY_URGENT, PRIORITY_NORMAL ou PRIORITY_LOW
+            interrupt: Couper la phrase en cours et vider la file avant de parler
+            key: Une nouvelle phrase remplace celle en attente avec la même clé
+                (ex: "volume" répété dix fois n'est dit qu'une fois)
+        """
+        if not text:
+            return
+        if interrupt:
+            self.interrupt()
+
+        utterance = _Utterance(priority, next(self._seq), text, key)
+        with self._cond:
+            if key is not None:
+                for pending in self._heap:
+                    if pending.key == key and not pending.cancelled:
+                        pending.cancelled = True
+                        self.stats["coalesced"] += 1
+
+            heapq.heappush(self._heap, utterance)
+            self._trim_queue()
+            self.stats["max_queue_depth"] = max(self.stats["max_queue_depth"], self.queue_depth())
+            self._cond.notify()
+
+    def _trim_queue(self):
+        """File pleine: abandonne la phrase la moins prioritaire et la plus ancienne (verrou tenu)"""
+        while self.queue_depth() > self.max_queue:
+            victims = [u for u in self._heap if not u.cancelled and u.priority != PRIORITY_URGENT]
+            if not victims:
+                return
+            victim = max(victims, key=lambda u: (u.priority, -u.seq))
+            victim.cancelled = True
+            self.stats["overflow"] += 1
+
+    def prerender(self, phrases: Iterable[str]) -> int:
+        """
+        Ajoute des phrases au cache audio quand le moteur est libre
+
+        Returns:
+            Nombre de phrases programmées
+        """
+        if not self.cache or not self.cache.available:
+            return 0
+        with self._cond:
+            before = len(self._render_jobs)
+            self._render_jobs.extend(phrases)
+            self._cond.notify()
+            return len(self._render_jobs) - before
+
+    def queue_depth(self) -> int:
+        return sum(1 for u in self._heap if not u.cancelled)
+
+    def interrupt(self):
+        """Barge-in: coupe la phrase en cours et vide la file"""
+        with self._cond:
+            for pending in self._heap:
+                pending.cancelled = True
+            self._heap = []
+        if self._current is not None:
+            self._interrupt = True
+            self.stats["interrupted"] += 1
+
+    def _next_utterance(self) -> Optional[_Utterance]:
+        """Prochaine phrase valide (attend au plus 0.5 s)"""
+        with self._cond:
+            if not self._heap and not self._render_jobs:
+                self._cond.wait(0.5)
+            while self._heap:
+                utterance = heapq.heappop(self._heap)
+                if utterance.cancelled:
+                    continue
+                age = time.perf_counter() - utterance.enqueued_at
+                if age > self.max_age and utterance.priority != PRIORITY_URGENT:
+                    # Réponse périmée: plus utile de la dire
+                    self.stats["stale"] += 1
+                    continue
+                return utterance
+        return None
+
+    def _next_render_job(self) -> Optional[str]:
+        """Phrase à pré-synthétiser, seulement quand aucune phrase n'attend"""
+        with self._cond:
+            if self._heap or not self._render_jobs:
+                return None
+            return self._render_jobs.popleft()
+
+    def _run(self):
+        """Boucle du thread propriétaire du moteur"""
+        try:
+            self.engine = self.engine_factory()
+            self.engine.connect('started-utterance', self._on_started)
+            self.engine.connect('started-word', self._on_word)
+            if self.cache:
+                self.cache.voice = self.engine.getProperty('voice')
+        except Exception as e:
+            print(f"❌ Erreur synthèse vocale: {e}")
+            self.engine = None
+        finally:
+            self._ready.set()
+
+        while self.running:
+            utterance = self._next_utterance()
+            if utterance is None:
+                text = self._next_render_job()
+                if text and self.engine is not None and self.cache.missing([text]):
+                    self.cache.render(self.engine, text)
+                continue
+
+            if self.engine is None:
+                self.fallback(utterance.text)
+                continue
+
+            self._current = utterance
+            self._awaiting_audio = True
+            self._interrupt = False
+            try:
+                if not self._play_cached(utterance.text):
+                    self.engine.say(utterance.text)
+                    self.engine.runAndWait()
+                    if self.cache and self.cache.note_miss(utterance.text):
+                        # Phrase répétée: la synthétiser pour la prochaine fois
+                        self.prerender([utterance.text])
+                self.stats["spoken"] += 1
+            except Exception as e:
+                print(f"Erreur synthèse vocale: {e}")
+            finally:
+                self._current = None
+
+    def _play_cached(self, text: str) -> bool:
+        """Joue la version pré-synthétisée si elle existe"""
+        path = self.cache.lookup(text) if self.cache else None
+        if not path:
+            return False
+        return self.cache.player.play(path, lambda: self._interrupt, lambda: self._on_started(None))
+
+    def _on_started(self, name):
+        """Début du son: temps entre la demande et la première sortie audio"""
+        utterance = self._current
+        if utterance is None or not self._awaiting_audio:
+            return
+        self._awaiting_audio = False
+        ttfa = (time.perf_counter() - utterance.enqueued_at) * 1000
+        count = self.stats["spoken"] + 1
+        self.stats["last_ttfa_ms"] = round(ttfa, 1)
+        self.stats["avg_ttfa_ms"] = round(self.stats["avg_ttfa_ms"] + (ttfa - self.stats["avg_ttfa_ms"]) / count, 1)
+
+    def _on_word(self, name, location, length):
+        """pyttsx3 ne peut être arrêté que depuis ses propres callbacks"""
+        if self._interrupt:
+            self._interrupt = False
+            self.engine.stop()
+
+    def get_stats(self) -> Dict:
+        stats = dict(self.stats)
+        with self._cond:
+            stats["queue_depth"] = self.queue_depth()
+        stats["speaking"] = self.is_speaking
+        if self.cache:
+            stats["cache"] = self.cache.get_stats()
+        return stats
@@ -0,0 +1,243 @@
+"""
+Détection d'activité vocale (VAD) pour Zodiac OS
+Énergie + taux de passage par zéro calculés avec NumPy, sans service externe.
+Découpe le flux en phrases et écarte le silence et le bruit avant la reconnaissance.
+"""
+
+import collections
+from typing import List, Optional
+
+import numpy as np
+
+
+class VoiceActivityDetector:
+    """Découpe un flux PCM 16 bits mono en segments de parole"""
+
+    def __init__(self, sample_rate: int, frame_ms: int = 20, energy_ratio: float = 3.0,
+                 max_zcr: float = 0.35, start_ms: int = 60, hangover_ms: int = 600,
+                 min_speech_ms: int = 250, max_utterance_s: float = 8.0,
+                 pre_roll_ms: int = 300, noise_adaptation: float = 0.05,
+                 initial_noise_floor: Optional[float] = None):
+        """
+        Args:
+            sample_rate: Fréquence d'échantillonnage du flux
+            frame_ms: Taille des trames d'analyse
+            energy_ratio: Énergie minimum d'une trame de parole (multiple du bruit)
+            max_zcr: Taux de passage par zéro au-delà duquel une trame est du bruit
+                (sauf si elle est très énergique: fricatives)
+            start_ms: Durée de parole continue pour ouvrir un segment
+            hangover_ms: Durée de silence qui ferme un segment
+            min_speech_ms: Segments plus courts ignorés (clics, toux)
+            max_utterance_s: Durée maximum d'un segment
+            pre_roll_ms: Audio conservé avant le début détecté
+            noise_adaptation: Vitesse d'adaptation du niveau de bruit
+            initial_noise_floor: Niveau de bruit initial (RMS), sinon appris
+        """
+        self.sample_rate = sample_rate
+        self.frame_size = int(sample_rate * frame_ms / 1000)
+        self.energy_ratio = energy_ratio
+        self.max_zcr = max_zcr
+        self.start_frames = max(1, start_ms // frame_ms)
+        self.hangover_frames = max(1, hangover_ms // frame_ms)
+        self.min_speech_frames = max(1, min_speech_ms // frame_ms)
+        self.max_frames = int(max_utterance_s * 1000 / frame_ms)
+        self.noise_adaptation = noise_adaptation
+        self.noise_floor = initial_noise_floor
+
+        self._pre_roll = collections.deque(maxlen=max(1, pre_roll_ms // frame_ms))
+        self._remainder = np.zeros(0, dtype=np.int16)
+        self._segment: List[np.ndarray] = []
+        self._in_speech = False
+        self._speech_run = 0
+        self._silence_run = 0
+        self._speech_frames = 0
+
+        self.stats = {
+            "frames": 0,
+            "speech_frames": 0,
+            "segments": 0,
+            "dropped_segments": 0
+        }
+
+    @property
+    def in_speech(self) -> bool:
+        """Un segment de parole est en cours"""
+        return self._in_speech
+
+    def pending_audio(self) -> bytes:
+        """Audio du segment en cours (pré-roll compris)"""
+        if not self._segment:
+            return b""
+        return np.concatenate(self._segment).tobytes()
+
+    def frame_features(self, frames: np.ndarray):
+        """
+        Calcule énergie RMS et taux de passage par zéro de chaque trame
+
+        Args:
+            frames: Tableau (n_trames, frame_size) int16
+
+        Returns:
+            (énergies, zcr)
+        """
+        samples = frames.astype(np.float32)
+        energy = np.sqrt(np.mean(samples * samples, axis=1))
+        signs = np.signbit(frames)
+        zcr = np.mean(signs[:, 1:] != signs[:, :-1], axis=1)
+        return energy, zcr
+
+    def classify(self, frames: np.ndarray) -> np.ndarray:
+        """Retourne un booléen par trame: parole ou non"""
+        energy, zcr = self.frame_features(frames)
+
+        if self.noise_floor is None:
+            # Premier appel: le bruit de fond est estimé sur les trames les plus calmes
+            self.noise_floor = float(np.percentile(energy, 20)) or 1.0
+
+        threshold = self.noise_floor * self.energy_ratio
+        voiced = (energy > threshold) & (zcr < self.max_zcr)
+        fricative = energy > threshold * 2
+        is_speech = voiced | fricative
+
+        # Adapter le niveau de bruit sur les trames sans parole
+        quiet = energy[~is_speech]
+        if quiet.size:
+            self.noise_floor += (float(np.mean(quiet)) - self.noise_floor) * self.noise_adaptation
+            self.noise_floor = max(self.noise_floor, 1.0)
+
+        return is_speech
+
+    def process(self, chunk: bytes) -> List[bytes]:
+        """
+        Ajoute un bloc audio au flux
+
+        Returns:
+            Segments de parole terminés (PCM 16 bits), éventuellement vide
+        """
+        samples = np.frombuffer(chunk, dtype=np.int16)
+        if self._remainder.size:
+            samples = np.concatenate((self._remainder, samples))
+
+        n_frames = samples.size // self.frame_size
+        used = n_frames * self.frame_size
+        self._remainder = samples[used:].copy()
+        if n_frames == 0:
+            return []
+
+        frames = samples[:used].reshape(n_frames, self.frame_size)
+        decisions = self.classify(frames)
+
+        self.stats["frames"] += n_frames
+        self.stats["speech_frames"] += int(np.count_nonzero(decisions))
+
+        finished = []
+        for frame, is_speech in zip(frames, decisions):
+            segment = self._step(frame, bool(is_speech))
+            if segment is not None:
+                finished.append(segment)
+        return finished
+
+    def _step(self, frame: np.ndarray, is_speech: bool) -> Optional[bytes]:
+        """Machine à états silence / parole pour une trame"""
+        if not self._in_speech:
+            self._pre_roll.append(frame)
+            self._speech_run = self._speech_run + 1 if is_speech else 0
+            if self._speech_run >= self.start_frames:
+                self._in_speech = True
+                self._segment = list(self._pre_roll)
+                self._pre_roll.clear()
+                self._speech_frames = self._speech_run
+                self._silence_run = 0
+            return None
+
+        self._segment.append(frame)
+        if is_speech:
+            self._speech_frames += 1
+            self._silence_run = 0
+        else:
+            self._silence_run += 1
+
+        if self._silence_run >= self.hangover_frames or len(self._segment) >= self.max_frames:
+            return self._close_segment()
+        return None
+
+    def _close_segment(self) -> Optional[bytes]:
+        """Termine le segment courant; None s'il est trop court"""
+        segment, speech_frames = self._segment, self._speech_frames
+        self._segment = []
+        self._in_speech = False
+        self._speech_run = 0
+        self._silence_run = 0
+        self._speech_frames = 0
+
+        if speech_frames < self.min_speech_frames:
+            self.stats["dropped_segments"] += 1
+            return None
+
+        self.stats["segments"] += 1
+        return np.concatenate(segment).tobytes()
+
+    def flush(self) -> Optional[bytes]:
+        """Termine le segment en cours (fin de flux)"""
+        if not self._in_speech:
+            return None
+        return self._close_segment()
+
+    def reset(self):
+        """Oublie l'état du flux (le niveau de bruit est conservé)"""
+        self._pre_roll.clear()
+        self._remainder = np.zeros(0, dtype=np.int16)
+        self._segment = []
+        self._in_speech = False
+        self._speech_run = 0
+        self._silence_run = 0
+        self._speech_frames = 0
+
+
+def _synthetic_signal(sample_rate: int, seconds: float = 10.0) -> np.ndarray:
+    """Bruit de fond avec des rafales tonales modulées (pseudo-parole)"""
+    rng = np.random.default_rng(0)
+    t = np.arange(int(sample_rate * seconds)) / sample_rate
+    signal = rng.normal(0, 100, t.size)
+    for start in (1.0, 4.0, 7.0):
+        mask = (t >= start) & (t < start + 1.2)
+        envelope = np.sin(np.pi * (t[mask] - start) / 1.2)
+        signal[mask] += 4000 * envelope * np.sin(2 * np.pi * 180 * t[mask]) * (1 + np.sin(2 * np.pi * 4 * t[mask]))
+    return np.clip(signal, -32768, 32767).astype(np.int16)
+
+
+# Benchmark: coût CPU par seconde d'audio
+# Usage: python -m core.vad [fichier.wav ...]
+if __name__ == "__main__":
+    import sys
+    import time
+
+    from core.audio_capture import load_wav
+
+    corpus = []
+    for path in sys.argv[1:]:
+        data, sample_rate = load_wav(path)
+        corpus.append((path, sample_rate, np.frombuffer(data, dtype=np.int16)))
+    if not corpus:
+        corpus = [("synthétique", 16000, _synthetic_signal(16000))]
+
+    chunk_size = 1024
+    for name, sample_rate, samples in corpus:
+        vad = VoiceActivityDetector(sample_rate)
+        audio_seconds = samples.size / sample_rate
+        segments = []
+
+        start = time.process_time()
+        for i in range(0, samples.size, chunk_size):
+            segments.extend(vad.process(samples[i:i + chunk_size].tobytes()))
+        tail = vad.flush()
+        if tail:
+            segments.append(tail)
+        cpu = time.process_time() - start
+
+        durations = [len(seg) / 2 / sample_rate for seg in segments]
+        print(f"{name}: {audio_seconds:.1f} s audio, {len(segments)} segments "
+              f"{[round(d, 2) for d in durations]}")
+        print(f"  CPU: {cpu * 1000 / audio_seconds:.2f} ms par seconde d'audio "
+              f"({cpu / audio_seconds * 100:.3f}% d'un coeur)")
+        print(f"  Stats: {vad.stats}")
@@ -1,53 +1,150 @@
 # core/voice_engine.py
+import random
 import threading
 import time
+from core.voice_events import VoiceEventBus, VoiceEvent, PartialStabilizer, LISTENING, IDLE, SPEECH_DETECTED, PARTIAL, FINAL, ERROR
 
 class VoiceEngine:
     """Moteur vocal de Zodiac OS"""
-    
-    def __init__(self):
+
+    DEMO_PHRASES = [
+        "Bonjour Exocortex",
+        "Quelle heure est-il ?",
+        "Ouvre mes applications",
+        "Quelle est la météo aujourd'hui ?",
+        "Joue de la musique"
+    ]
+    # Intervalle entre deux hypothèses partielles simulées
+    PARTIAL_INTERVAL = 0.2
+
+    def __init__(self, callback_function=None, backend=None, replay_files=None):
+        """
+        Args:
+            callback_function: Callback (événement, données), comme core.voice_processor.VoiceEngine
+            backend: Moteur de reconnaissance (RecognizerBackend) utilisé sur les fichiers rejoués
+            replay_files: Fichiers WAV transcrits à la place de la phrase simulée
+        """
         self.is_listening = False
         self.callbacks = {}
-        
+        self.callback = callback_function
+        self.backend = backend
+        self.replay_files = list(replay_files or [])
+        self._replay_index = 0
+        self.events = VoiceEventBus()
+        self._utterance_id = 0
+
     def initialize(self):
         """Initialise le moteur vocal"""
-        print("[VOICE] VoiceEngine initialisé (mode simulation)")
-        
+        mode = f"rejeu ({self.backend.name})" if self.backend and self.replay_files else "simulation"
+        print(f"[VOICE] VoiceEngine initialisé (mode {mode})")
+
     def start_listening(self):
         """Démarre l'écoute"""
         self.is_listening = True
         print("[VOICE] Écoute démarrée")
-        
+
         # Appeler le callback si défini
         if hasattr(self, 'on_listening_start'):
             self.on_listening_start()
-            
+        self._emit("status", "Écoute activée")
+        self.events.publish(VoiceEvent(LISTENING))
+
         # Simuler une transcription après 3 secondes
         threading.Timer(3.0, self._simulate_transcription).start()
-        
+
     def stop_listening(self):
         """Arrête l'écoute"""
         self.is_listening = False
         print("[VOICE] Écoute arrêtée")
-        
+
         # Appeler le callback si défini
         if hasattr(self, 'on_listening_stop'):
             self.on_listening_stop()
-            
+        self._emit("status", "Écoute désactivée")
+        self.events.publish(VoiceEvent(IDLE))
+
     def _simulate_transcription(self):
         """Simule une transcription vocale"""
         if self.is_listening:
-            simulated_text = "Ceci est une simulation de reconnaissance vocale"
+            self._utterance_id += 1
+            self.events.publish(VoiceEvent(SPEECH_DETECTED, utterance_id=self._utterance_id))
+
+            if self.backend and self.replay_files:
+                simulated_text = self._transcribe_next_file()
+                if simulated_text is None:
+                    return
+            else:
+                simulated_text = random.choice(self.DEMO_PHRASES)
+                self._simulate_partials(simulated_text)
             print(f"[VOICE] Simulation : {simulated_text}")
-            
+            self.events.publish(VoiceEvent(FINAL, simulated_text, self._utterance_id, stable_text=simulated_text))
+
             # Appeler les callbacks
             if hasattr(self, 'on_transcription'):
                 self.on_transcription(simulated_text)
-                
+            self._emit("voice_command", simulated_text)
+
+    def _simulate_partials(self, text):
+        """Publie la phrase mot par mot, comme un moteur en streaming"""
+        stabilizer = PartialStabilizer()
+        words = text.split()
+        for count in range(1, len(words) + 1):
+            if not self.is_listening:
+                return
+            partial = " ".join(words[:count])
+            stable = stabilizer.update(partial)
+            self.events.publish(VoiceEvent(PARTIAL, partial, self._utterance_id, stable_text=stable))
+            time.sleep(self.PARTIAL_INTERVAL)
+
+    def _transcribe_next_file(self):
+        """Transcrit le prochain fichier rejoué avec le moteur configuré"""
+        from core.audio_capture import load_wav
+        from core.recognition_backends import RecognitionError
+
+        path = self.replay_files[self._replay_index % len(self.replay_files)]
+        self._replay_index += 1
+
+        try:
+            audio, sample_rate = load_wav(path)
+            start = time.perf_counter()
+            if self.backend.supports_partials:
+                text = self._stream_file(audio, sample_rate)
+            else:
+                text = self.backend.transcribe(audio, sample_rate)
+            print(f"[VOICE] {self.backend.name}: {(time.perf_counter() - start) * 1000:.0f} ms")
+        except (RecognitionError, OSError, ValueError) as e:
+            self._emit("error", f"Erreur reconnaissance: {e}")
+            self.events.publish(VoiceEvent(ERROR, str(e), self._utterance_id))
+            return None
+
+        if not text:
+            self._emit("error", "Audio non compris")
+            self.events.publish(VoiceEvent(ERROR, "Audio non compris", self._utterance_id))
+        return text
+
+    def _stream_file(self, audio, sample_rate, chunk_seconds=0.2):
+        """Transcrit un fichier par blocs en publiant les hypothèses partielles"""
+        stream = self.backend.start_stream(sample_rate)
+        stabilizer = PartialStabilizer()
+        step = int(sample_rate * chunk_seconds) * 2
+        for i in range(0, len(audio), step):
+            partial = stream.accept(audio[i:i + step])
+            if partial:
+                stable = stabilizer.update(partial)
+                self.events.publish(VoiceEvent(PARTIAL, partial, self._utterance_id, stable_text=stable))
+        return stream.finish()
+
+    def _emit(self, event, data=None):
+        """Transmet un événement au callback global et aux callbacks par événement"""
+        if self.callback:
+            self.callback(event, data)
+        if event in self.callbacks:
+            self.callbacks[event](data)
+
     def set_callback(self, event, callback):
         """Définit un callback"""
         self.callbacks[event] = callback
-        
+
     def speak(self, text):
         """Parle un texte"""
-        print(f"[VOICE] Synthèse : {text}")
\ No newline at end of file
+        print(f"[VOICE] Synthèse : {text}")
@@ -0,0 +1,138 @@
+"""
+Flux d'événements vocaux pour Zodiac OS
+écoute → parole détectée → texte partiel → texte final
+L'interface affiche un retour immédiat et le routeur de commandes peut
+anticiper sur les hypothèses partielles stables.
+"""
+
+import itertools
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional
+
+# Types d'événements
+LISTENING = "listening"
+IDLE = "idle"
+SPEECH_DETECTED = "speech_detected"
+PARTIAL = "partial"
+FINAL = "final"
+ERROR = "error"
+
+
+class VoiceEvent:
+    """Événement du flux vocal"""
+
+    __slots__ = ("type", "text", "utterance_id", "stable_text", "timestamp", "data")
+
+    def __init__(self, type: str, text: str = "", utterance_id: Optional[int] = None,
+                 stable_text: str = "", data: Optional[Dict] = None):
+        self.type = type
+        self.text = text
+        self.utterance_id = utterance_id
+        self.stable_text = stable_text
+        self.timestamp = time.time()
+        self.data = data or {}
+
+    def __repr__(self):
+        return f"VoiceEvent({self.type}, {self.text!r}, utterance={self.utterance_id})"
+
+
+class VoiceEventBus:
+    """
+    Diffusion des événements vocaux aux abonnés
+
+    Les abonnés sont appelés dans le thread qui publie (thread d'écoute):
+    ils doivent rendre la main vite (ex: widget.after(0, ...) côté Tk).
+    """
+
+    def __init__(self):
+        self._subscribers: Dict[int, tuple] = {}
+        self._ids = itertools.count()
+        self._lock = threading.Lock()
+
+    def subscribe(self, callback: Callable[[VoiceEvent], None],
+                  events: Optional[Iterable[str]] = None) -> int:
+        """
+        Abonne un callback
+
+        Args:
+            callback: Fonction (VoiceEvent) -> None
+            events: Types d'événements voulus (tous par défaut)
+
+        Returns:
+            Identifiant à passer à unsubscribe
+        """
+        token = next(self._ids)
+        with self._lock:
+            self._subscribers[token] = (callback, frozenset(events) if events else None)
+        return token
+
+    def unsubscribe(self, token: int):
+        with self._lock:
+            self._subscribers.pop(token, None)
+
+    def publish(self, event: VoiceEvent):
+        with self._lock:
+            subscribers = list(self._subscribers.values())
+        for callback, events in subscribers:
+            if events is not None and event.type not in events:
+                continue
+            try:
+                callback(event)
+            except Exception as e:
+                print(f"⚠️ Erreur abonné vocal: {e}")
+
+
+class PartialStabilizer:
+    """
+    Suit les hypothèses partielles d'une phrase et en extrait le début stable
+    (mots identiques sur plusieurs hypothèses consécutives)
+    """
+
+    def __init__(self, min_repeats: int = 2):
+        self.min_repeats = min_repeats
+        self.reset()
+
+    def reset(self):
+        self._history: List[List[str]] = []
+        self.stable_words: List[str] = []
+
+    def update(self, text: str) -> str:
+        """Ajoute une hypothèse et retourne le début stable"""
+        words = text.split()
+        self._history.append(words)
+        recent = self._history[-self.min_repeats:]
+        if len(recent) < self.min_repeats:
+            return " ".join(self.stable_words)
+
+        prefix = []
+        for column in zip(*recent):
+            if len(set(column)) != 1:
+                break
+            prefix.append(column[0])
+
+        # Le début stable ne recule pas, sauf si l'hypothèse le contredit
+        if len(prefix) >= len(self.stable_words) or prefix != self.stable_words[:len(prefix)]:
+            self.stable_words = prefix
+        return " ".join(self.stable_words)
+
+
+class PartialThrottle:
+    """Limite la fréquence des événements partiels (un toutes les interval secondes)"""
+
+    def __init__(self, interval: float = 0.2):
+        self.interval = interval
+        self._last = 0.0
+        self._last_text = None
+
+    def reset(self):
+        self._last = 0.0
+        self._last_text = None
+
+    def ready(self, text: str) -> bool:
+        now = time.perf_counter()
+        if text == self._last_text or now - self._last < self.interval:
+            return False
+        self._last = now
+        self._last_text = text
+        return True
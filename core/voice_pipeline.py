@@ -0,0 +1,222 @@
+"""
+Pipeline de reconnaissance vocale pour Zodiac OS
+capture → file bornée → pool de reconnaissance → file de dispatch
+Une reconnaissance lente ou une commande longue ne bloque jamais l'écoute.
+"""
+
+import collections
+import heapq
+import itertools
+import queue
+import threading
+import time
+from typing import Callable, Dict
+
+
+class StageMetrics:
+    """Latences d'une étape (ms): compteur, moyenne, percentiles récents"""
+
+    def __init__(self, window: int = 200):
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self._recent = collections.deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, ms: float):
+        with self._lock:
+            self.count += 1
+            self.total_ms += ms
+            self.max_ms = max(self.max_ms, ms)
+            self._recent.append(ms)
+
+    def snapshot(self) -> Dict:
+        with self._lock:
+            recent = sorted(self._recent)
+            count = self.count
+            total = self.total_ms
+            max_ms = self.max_ms
+
+        def percentile(p):
+            if not recent:
+                return 0.0
+            return round(recent[min(len(recent) - 1, int(len(recent) * p))], 1)
+
+        return {
+            "count": count,
+            "avg_ms": round(total / count, 1) if count else 0.0,
+            "p50_ms": percentile(0.5),
+            "p95_ms": percentile(0.95),
+            "max_ms": round(max_ms, 1)
+        }
+
+
+class VoicePipeline:
+    """Découple capture, reconnaissance et exécution des commandes"""
+
+    STAGES = ("queue_wait", "recognition", "dispatch_wait", "dispatch", "end_to_end")
+
+    def __init__(self, recognize: Callable, dispatch: Callable, workers: int = 2,
+                 segment_queue_size: int = 4, dispatch_queue_size: int = 16):
+        """
+        Args:
+            recognize: Fonction (segment) -> résultat, exécutée par le pool
+            dispatch: Fonction (résultat) -> None, exécutée dans l'ordre d'arrivée des segments
+            workers: Nombre de reconnaissances simultanées
+            segment_queue_size: Segments en attente avant de lâcher les plus anciens
+            dispatch_queue_size: Résultats en attente avant de freiner la reconnaissance
+        """
+        self.recognize = recognize
+        self.dispatch = dispatch
+        self.workers = workers
+
+        self._segments = queue.Queue(maxsize=segment_queue_size)
+        self._results = queue.Queue(maxsize=dispatch_queue_size)
+        self._seq = itertools.count()
+        self._skipped = set()
+        self._skipped_lock = threading.Lock()
+        self._threads = []
+        self._run = None  # événement de la session en cours (chaque session a le sien)
+        self.running = False
+
+        self.metrics = {stage: StageMetrics() for stage in self.STAGES}
+        self.dropped = 0
+        self.failed = 0
+
+    def start(self):
+        """Lance les workers et le dispatcher"""
+        if self.running:
+            return
+        # Nouvelle session: numérotation et files remises à zéro
+        self._segments = queue.Queue(maxsize=self._segments.maxsize)
+        self._results = queue.Queue(maxsize=self._results.maxsize)
+        self._seq = itertools.count()
+        self._skipped = set()
+        # Les threads reçoivent l'événement et les files de leur session: un
+        # thread d'une session précédente encore en vie ne touche pas aux nouvelles
+        self._run = threading.Event()
+        self._run.set()
+        self.running = True
+        for i in range(self.workers):
+            thread = threading.Thread(target=self._recognition_worker, args=(self._run, self._segments, self._results),
+                                      name=f"voice-recognition-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        dispatcher = threading.Thread(target=self._dispatcher, args=(self._run, self._results, self._skipped),
+                                      name="voice-dispatch", daemon=True)
+        dispatcher.start()
+        self._threads.append(dispatcher)
+
+    def stop(self):
+        """Arrête les threads (les éléments en attente sont abandonnés)"""
+        self.running = False
+        if self._run is not None:
+            self._run.clear()
+        for thread in self._threads:
+            thread.join(timeout=1.0)
+            if thread.is_alive():
+                # Reconnaissance encore en cours: le thread s'arrêtera de lui-même,
+                # sans jamais lire les files d'une session suivante
+                print(f"⚠️ {thread.name} encore actif après l'arrêt")
+        self._threads = []
+
+    def submit(self, segment) -> bool:
+        """
+        Envoie un segment (appelé depuis la boucle de capture, ne bloque jamais)
+
+        Returns:
+            False si un segment plus ancien a dû être abandonné
+        """
+        item = (next(self._seq), segment, time.perf_counter())
+        accepted = True
+        while True:
+            try:
+                self._segments.put_nowait(item)
+                return accepted
+            except queue.Full:
+                # Contre-pression: abandonner le plus ancien plutôt que bloquer le micro
+                try:
+                    old_seq, _, _ = self._segments.get_nowait()
+                    self._skip(old_seq)
+                    self.dropped += 1
+                    accepted = False
+                except queue.Empty:
+                    pass
+
+    def _skip(self, seq: int):
+        """Signale au dispatcher qu'un numéro ne viendra jamais"""
+        with self._skipped_lock:
+            self._skipped.add(seq)
+
+    def _recognition_worker(self, run: threading.Event, segments: queue.Queue, results: queue.Queue):
+        """Reconnaît les segments en parallèle (jusqu'à la fin de sa session)"""
+        while run.is_set():
+            try:
+                seq, segment, submitted = segments.get(timeout=0.2)
+            except queue.Empty:
+                continue
+
+            started = time.perf_counter()
+            self.metrics["queue_wait"].record((started - submitted) * 1000)
+            try:
+                result = self.recognize(segment)
+            except Exception as e:
+                print(f"⚠️ Erreur reconnaissance: {e}")
+                self.failed += 1
+                result = None
+            finished = time.perf_counter()
+            self.metrics["recognition"].record((finished - started) * 1000)
+
+            # File de dispatch pleine: le worker attend (freine la reconnaissance)
+            while run.is_set():
+                try:
+                    results.put((seq, result, submitted, finished), timeout=0.2)
+                    break
+                except queue.Full:
+                    continue
+
+    def _dispatcher(self, run: threading.Event, results: queue.Queue, skipped: set):
+        """Exécute les résultats dans l'ordre des segments (jusqu'à la fin de sa session)"""
+        next_seq = 0
+        pending = []
+
+        while run.is_set():
+            try:
+                heapq.heappush(pending, results.get(timeout=0.2))
+            except queue.Empty:
+                pass
+
+            while run.is_set():
+                with self._skipped_lock:
+                    while next_seq in skipped:
+                        skipped.discard(next_seq)
+                        next_seq += 1
+
+                if not pending or pending[0][0] != next_seq:
+                    break
+
+                seq, result, submitted, recognized = heapq.heappop(pending)
+                next_seq += 1
+                if result is None:
+                    continue
+
+                started = time.perf_counter()
+                self.metrics["dispatch_wait"].record((started - recognized) * 1000)
+                try:
+                    self.dispatch(result)
+                except Exception as e:
+                    print(f"⚠️ Erreur commande vocale: {e}")
+                finished = time.perf_counter()
+                self.metrics["dispatch"].record((finished - started) * 1000)
+                self.metrics["end_to_end"].record((finished - submitted) * 1000)
+
+    def get_stats(self) -> Dict:
+        """Métriques par étape et état des files"""
+        return {
+            "workers": self.workers,
+            "segment_queue": self._segments.qsize(),
+            "dispatch_queue": self._results.qsize(),
+            "dropped": self.dropped,
+            "failed": self.failed,
+            "stages": {stage: metrics.snapshot() for stage, metrics in self.metrics.items()}
+        }
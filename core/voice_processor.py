@@ -3,24 +3,93 @@ Moteur vocal pour Zodiac OS - Basé sur old_main.py
 """
 
 import speech_recognition as sr
-import pyttsx3
+import itertools
 import threading
 import time
 import webbrowser
 import os
+import json
 import subprocess
 from datetime import datetime
+from core.audio_capture import ContinuousCapture
+from core.audio_preprocess import AudioPreprocessor
+from core.vad import VoiceActivityDetector
+from core.wake_word import WakeWordDetector
+from core.voice_pipeline import VoicePipeline
+from core.recognition_backends import GoogleBackend, RecognitionError, recognition_workers
+from core.tts_worker import TTSWorker, PRIORITY_NORMAL
+from core.tts_cache import TTSCache, collect_phrases
+from core.voice_events import (VoiceEventBus, VoiceEvent, PartialStabilizer, PartialThrottle,
+                               LISTENING, IDLE, SPEECH_DETECTED, PARTIAL, FINAL, ERROR)
+from core.speculative import SpeculativeExecutor
 
 class VoiceEngine:
-    def __init__(self, callback_function=None):
-        """Initialise le moteur vocal avec callback pour l'interface"""
+    # Durée maximum d'une phrase envoyée à la reconnaissance
+    PHRASE_TIME_LIMIT = 5.0
+    # Après le mot d'activation, les phrases suivantes sont reconnues pendant ce délai
+    SESSION_SECONDS = 8.0
+    # Reste minimum après le mot d'activation pour contenir une commande
+    MIN_COMMAND_SECONDS = 0.4
+    # Reconnaissances simultanées (phrases qui se chevauchent)
+    RECOGNITION_WORKERS = 2
+    # Applications connues sans passer par le Vault
+    APP_MAP = {
+        'chrome': 'chrome.exe',
+        'firefox': 'firefox.exe',
+        'edge': 'msedge.exe',
+        'spotify': 'Spotify.exe',
+        'discord': 'Discord.exe',
+        'vscode': 'Code.exe',
+        'notepad': 'notepad.exe',
+        'calc': 'calc.exe',
+        'explorer': 'explorer.exe',
+        'cmd': 'cmd.exe'
+    }
+    
+    def __init__(self, callback_function=None, wake_word="zodiac", require_wake_word=True,
+                 backend=None, capture=None, preprocess=True):
+        """
+        Initialise le moteur vocal avec callback pour l'interface
+        
+        Args:
+            backend: Moteur de reconnaissance (RecognizerBackend), Google par défaut
+            capture: Source audio à la place du micro (ex: ReplayCapture)
+            preprocess: Gain automatique, réduction de bruit et rééchantillonnage
+                à la fréquence du moteur avant la détection de parole
+        """
         self.callback = callback_function
         self.is_listening = False
         
+        # Mot d'activation détecté localement avant toute requête réseau
+        self.wake_word = wake_word
+        self.require_wake_word = require_wake_word
+        self.wake_detector = None
+        self._session_until = 0.0
+        self._enroll_remaining = 0
+        self.stats = {"segments": 0, "recognitions": 0, "wake_words": 0}
+        
         # Initialisation avec gestion d'erreurs
         self.recognizer = None
         self.microphone = None
-        self.tts_engine = None
+        self.backend = backend
+        self.capture_source = capture
+        self.capture = None
+        self.vad = None
+        self.preprocess = preprocess
+        self.preprocessor = None
+        self.sample_rate = None
+        self.sample_width = 2
+        
+        # Flux d'événements: écoute → parole détectée → partiel → final
+        self.events = VoiceEventBus()
+        self._utterance_ids = itertools.count(1)
+        self._utterance_id = None
+        self._stream = None
+        self._stabilizer = PartialStabilizer()
+        self._throttle = PartialThrottle(interval=0.2)
+        
+        # capture/VAD → reconnaissance → commandes, chacun sur son propre thread
+        self.pipeline = VoicePipeline(self._recognize, self._dispatch, workers=self.RECOGNITION_WORKERS)
         
         try:
             self.recognizer = sr.Recognizer()
@@ -29,19 +98,41 @@ class VoiceEngine:
         except Exception as e:
             print(f"❌ Erreur microphone: {e}")
         
-        try:
-            self.tts_engine = pyttsx3.init()
-            self.tts_engine.setProperty('rate', 150)
+        if self.backend is None and self.recognizer:
+            self.backend = GoogleBackend(self.recognizer)
+        
+        # Un seul thread possède le moteur pyttsx3
+        self.tts = TTSWorker(rate=150, cache=TTSCache(rate=150))
+        if self.tts.start():
             print("✅ Synthèse vocale initialisée")
+            # Réponses fréquentes synthétisées une fois, pendant les silences
+            self.tts.prerender(collect_phrases())
+        
+        # Préparation des commandes sur les hypothèses partielles stables
+        self.speculator = SpeculativeExecutor(self._load_app_index(), tts=self.tts)
+        self.speculator.attach(self.events)
+    
+    def _load_app_index(self, path=os.path.join("data", "vault_index.json")):
+        """Applications du Vault + applications connues"""
+        apps = {key: {"name": key, "path": exe} for key, exe in self.APP_MAP.items()}
+        try:
+            if os.path.exists(path):
+                with open(path, "r", encoding="utf-8") as f:
+                    apps.update(json.load(f))
         except Exception as e:
-            print(f"❌ Erreur synthèse vocale: {e}")
+            print(f"⚠️ Index des applications illisible: {e}")
+        return apps
     
     def start_listening(self):
         """Démarre l'écoute continue"""
-        if not self.recognizer:
+        if not self.recognizer and self.capture_source is None:
             if self.callback:
                 self.callback("error", "Microphone non disponible")
             return False
+        if not self.backend or not self.backend.is_available():
+            if self.callback:
+                self.callback("error", "Moteur de reconnaissance non disponible")
+            return False
         
         self.is_listening = True
         self.listener_thread = threading.Thread(target=self._listener_loop, daemon=True)
@@ -49,6 +140,7 @@ class VoiceEngine:
         
         if self.callback:
             self.callback("status", "Écoute activée")
+        self.events.publish(VoiceEvent(LISTENING))
         
         return True
     
@@ -57,65 +149,233 @@ class VoiceEngine:
         self.is_listening = False
         if self.callback:
             self.callback("status", "Écoute désactivée")
+        self.events.publish(VoiceEvent(IDLE))
     
     def _listener_loop(self):
-        """Boucle d'écoute principale"""
+        """Boucle d'écoute principale: flux continu, calibration unique"""
+        try:
+            # Le micro reste ouvert pendant toute la session d'écoute
+            self.capture = self.capture_source or ContinuousCapture(self.microphone, self.recognizer)
+            self.capture.start()
+            
+            # Tout ce qui suit (VAD, mot d'activation, reconnaissance) travaille sur l'audio conditionné
+            if self.preprocess:
+                self.preprocessor = AudioPreprocessor(self.capture.sample_rate, self.backend.native_rate)
+                self.sample_rate = self.preprocessor.output_rate
+                self.sample_width = 2
+            else:
+                self.sample_rate = self.capture.sample_rate
+                self.sample_width = self.capture.sample_width
+            
+            if self.wake_detector is None:
+                self.wake_detector = WakeWordDetector(self.sample_rate, self.wake_word)
+                if self.require_wake_word and not self.wake_detector.has_templates:
+                    print(f"⚠️ Aucun modèle pour '{self.wake_word}': toutes les phrases partent à la reconnaissance. "
+                          f"Dites \"apprends le mot d'activation\" pour en enregistrer.")
+        except Exception as e:
+            self.is_listening = False
+            if self.callback:
+                self.callback("error", f"Erreur microphone: {e}")
+            return
+        
+        # Rejeu: une reconnaissance à la fois pour que chaque segment reçoive son texte
+        self.pipeline.workers = recognition_workers(self.backend, self.RECOGNITION_WORKERS)
+        self.pipeline.start()
+        try:
+            for segment in self._utterances():
+                self._process_segment(segment)
+        finally:
+            self.pipeline.stop()
+            self.capture.stop()
+    
+    def enroll_wake_word(self, count=3):
+        """Enregistre les count prochaines phrases comme modèles du mot d'activation"""
+        self._enroll_remaining = count
+        if self.callback:
+            self.callback("status", f"Dites '{self.wake_word}' ({count} fois)")
+    
+    def _utterances(self):
+        """Découpe le flux du tampon circulaire en segments de parole (PCM brut)"""
+        capture = self.capture
+        
+        # Détection locale: seuls les segments de parole partent à la reconnaissance
+        self.vad = VoiceActivityDetector(
+            self.sample_rate,
+            hangover_ms=int(getattr(self.recognizer, "pause_threshold", 0.8) * 1000),
+            max_utterance_s=self.PHRASE_TIME_LIMIT,
+            # Après le gain automatique, le niveau de bruit du micro ne s'applique plus
+            initial_noise_floor=None if self.preprocessor else capture.noise_floor
+        )
+        
+        seq = capture.buffer.write_position
         while self.is_listening:
+            chunks, seq = capture.buffer.read_from(seq, timeout=0.5)
+            
+            for chunk in chunks:
+                if self.preprocessor:
+                    chunk = self.preprocessor.process(chunk)
+                    if not chunk:
+                        continue
+                was_in_speech = self.vad.in_speech
+                segments = self.vad.process(chunk)
+                if self.vad.in_speech and not was_in_speech:
+                    self._on_speech_start()
+                elif self.vad.in_speech:
+                    self._feed_partial(chunk)
+                for segment in segments:
+                    self._stream = None
+                    yield segment
+    
+    def _on_speech_start(self):
+        """Début de phrase: retour immédiat et reconnaissance partielle si le moteur le permet"""
+        self._utterance_id = next(self._utterance_ids)
+        self._stabilizer.reset()
+        self._throttle.reset()
+        self.events.publish(VoiceEvent(SPEECH_DETECTED, utterance_id=self._utterance_id))
+        
+        self._stream = None
+        if self.backend.supports_partials:
             try:
-                with self.microphone as source:
-                    self.recognizer.adjust_for_ambient_noise(source, duration=0.5)
-                    audio = self.recognizer.listen(source, timeout=1, phrase_time_limit=5)
-                    
-                    try:
-                        text = self.recognizer.recognize_google(audio, language='fr-FR')
-                        text = text.lower()
-                        
-                        if self.callback:
-                            self.callback("voice_command", text)
-                        
-                        # Détection du mot-clé "zodiac"
-                        if 'zodiac' in text:
-                            command = text.replace('zodiac', '').strip()
-                            if command and self.callback:
-                                self.callback("zodiac_command", command)
-                        elif len(text.split()) <= 4:
-                            # Commande courte
-                            if self.callback:
-                                self.callback("quick_command", text)
-                                
-                    except sr.UnknownValueError:
-                        if self.callback:
-                            self.callback("error", "Audio non compris")
-                    except sr.RequestError as e:
-                        if self.callback:
-                            self.callback("error", f"Erreur API: {e}")
-                            
+                self._stream = self.backend.start_stream(self.sample_rate, self.sample_width)
+                self._feed_partial(self.vad.pending_audio())
             except Exception as e:
-                time.sleep(0.1)
+                print(f"⚠️ Reconnaissance partielle indisponible: {e}")
+                self._stream = None
     
-    def speak(self, text):
-        """Parle un texte (synthèse vocale)"""
-        if not self.tts_engine:
-            print(f"(Voix): {text}")
+    def _feed_partial(self, audio):
+        """Publie l'hypothèse partielle courante (au plus toutes les 200 ms)"""
+        if self._stream is None or not audio:
             return
+        text = self._stream.accept(audio).lower()
+        if text and self._throttle.ready(text):
+            stable = self._stabilizer.update(text)
+            self.events.publish(VoiceEvent(PARTIAL, text, self._utterance_id, stable_text=stable))
+    
+    def _process_segment(self, segment):
+        """Mot d'activation local, puis reconnaissance seulement si nécessaire"""
+        self.stats["segments"] += 1
+        detector = self.wake_detector
         
-        def _speak():
-            try:
-                self.tts_engine.say(text)
-                self.tts_engine.runAndWait()
-            except Exception as e:
-                print(f"Erreur synthèse vocale: {e}")
+        if self._enroll_remaining > 0:
+            self._enroll_remaining -= 1
+            total = detector.enroll(segment)
+            if self.callback:
+                self.callback("status", f"Modèle '{self.wake_word}' enregistré ({total})")
+            self.events.publish(VoiceEvent(LISTENING, utterance_id=self._utterance_id))
+            return
+        
+        if not (self.require_wake_word and detector and detector.has_templates):
+            # Pas de modèle: comportement historique, tout part à la reconnaissance
+            self._submit(segment)
+            return
+        
+        now = time.time()
+        if now < self._session_until:
+            # Session ouverte par un mot d'activation récent
+            self._session_until = now + self.SESSION_SECONDS
+            self._submit(segment, wake_word=True)
+            return
+        
+        detected, score, end = detector.detect(segment)
+        if not detected:
+            # Phrase sans mot d'activation: l'interface efface le texte partiel
+            self.events.publish(VoiceEvent(LISTENING, utterance_id=self._utterance_id))
+            return
         
-        threading.Thread(target=_speak, daemon=True).start()
+        self.stats["wake_words"] += 1
+        # Barge-in: l'utilisateur reprend la parole, Zodiac se tait
+        self.tts.interrupt()
+        self._session_until = now + self.SESSION_SECONDS
+        if self.callback:
+            self.callback("wake_word", self.wake_word)
+        
+        # "zodiac ouvre chrome" dans une seule phrase: reconnaître la suite
+        remainder = segment[end:]
+        min_bytes = int(self.MIN_COMMAND_SECONDS * self.sample_rate) * self.sample_width
+        if len(remainder) >= min_bytes:
+            self._submit(remainder, wake_word=True)
+        else:
+            self.events.publish(VoiceEvent(LISTENING, utterance_id=self._utterance_id))
+            if self.callback:
+                self.callback("status", "Je vous écoute")
+    
+    def _submit(self, segment, wake_word=False):
+        """Envoie une phrase au pipeline sans bloquer la lecture du micro"""
+        if not self.pipeline.submit((segment, wake_word, self._utterance_id)):
+            print("⚠️ Reconnaissance saturée: phrase la plus ancienne abandonnée")
+    
+    def _recognize(self, job):
+        """Reconnaît une phrase (thread du pool) et retourne l'événement à transmettre"""
+        segment, wake_word, utterance_id = job
+        self.stats["recognitions"] += 1
+        try:
+            text = self.backend.transcribe(segment, self.sample_rate, self.sample_width)
+        except RecognitionError as e:
+            return ("error", f"Erreur API: {e}", wake_word, utterance_id)
+        if not text:
+            return ("error", "Audio non compris", wake_word, utterance_id)
+        return ("text", text.lower(), wake_word, utterance_id)
+    
+    def _dispatch(self, event):
+        """Transmet les résultats dans l'ordre des phrases (thread de dispatch)"""
+        kind, value, wake_word, utterance_id = event
+        if kind == "text":
+            self.events.publish(VoiceEvent(FINAL, value, utterance_id, stable_text=value))
+            self._handle_text(value, wake_word)
+        else:
+            self.events.publish(VoiceEvent(ERROR, value, utterance_id))
+            if self.callback:
+                self.callback("error", value)
+    
+    def get_pipeline_stats(self):
+        """Latences par étape du pipeline vocal"""
+        stats = self.pipeline.get_stats()
+        stats.update(self.stats)
+        stats["tts"] = self.tts.get_stats()
+        if self.preprocessor:
+            stats["preprocess"] = self.preprocessor.get_stats()
+        return stats
+    
+    def _handle_text(self, text, wake_word=False):
+        """Envoie le texte reconnu aux callbacks"""
+        if self.callback:
+            self.callback("voice_command", text)
+        
+        # Mot d'activation déjà détecté localement: tout est une commande
+        if wake_word:
+            command = text.replace('zodiac', '').strip()
+            if command and self.callback:
+                self.callback("zodiac_command", command)
+        # Détection du mot-clé "zodiac"
+        elif 'zodiac' in text:
+            command = text.replace('zodiac', '').strip()
+            if command and self.callback:
+                self.callback("zodiac_command", command)
+        elif len(text.split()) <= 4:
+            # Commande courte
+            if self.callback:
+                self.callback("quick_command", text)
+    
+    def speak(self, text, priority=PRIORITY_NORMAL, interrupt=False, key=None):
+        """Parle un texte (synthèse vocale, file d'attente du thread TTS)"""
+        self.tts.say(text, priority=priority, interrupt=interrupt, key=key)
     
     def process_command(self, command):
         """Traite une commande - Logique de votre ancien code"""
         command_lower = command.lower()
+        # Récupère ce qui a été préparé pendant que l'utilisateur parlait
+        intent, prepared = self.speculator.commit(command_lower)
+        description = self.speculator.describe(intent, prepared) if intent else None
         
         # --- COMMANDES SYSTÈME ---
         if any(word in command_lower for word in ['arrête', 'stop', 'quitte', 'exit']):
             return "Arrêt de Zodiac"
         
+        # --- MOT D'ACTIVATION ---
+        elif "mot d'activation" in command_lower and any(word in command_lower for word in ['apprends', 'enregistre']):
+            self.enroll_wake_word(3)
+            return f"Dites '{self.wake_word}' trois fois, en marquant une pause entre chaque"
+        
         elif any(word in command_lower for word in ['aide', 'help', 'commandes']):
             return "Commandes: ouvre [app], musique, météo, système, recherche, heure"
         
@@ -124,6 +384,8 @@ class VoiceEngine:
         
         # --- APPLICATIONS ---
         elif any(word in command_lower for word in ['ouvre', 'lance', 'start', 'run']):
+            if intent and intent.kind == "open_app" and prepared and prepared.get("exists"):
+                return self._launch_prepared(prepared)
             return self._launch_application(command_lower)
         
         # --- MÉDIA ---
@@ -144,10 +406,24 @@ class VoiceEngine:
         elif any(word in command_lower for word in ['recherche', 'cherche', 'google']):
             return self._web_search(command_lower)
         
+        # --- INFORMATIONS (préparées à l'avance) ---
+        elif description:
+            return description
+        
         # --- INTELLIGENCE ---
         else:
             return self._intelligent_response(command)
     
+    def _launch_prepared(self, app_info):
+        """Lance une application déjà résolue par la préparation spéculative"""
+        path = app_info.get("lnk_path") or app_info.get("path")
+        name = app_info.get("name", path)
+        try:
+            os.startfile(path)
+            return f"Je lance {name}"
+        except Exception as e:
+            return f"Erreur avec {name}: {e}"
+    
     def _launch_application(self, command):
         """Lance une application"""
         app_name = command
@@ -159,21 +435,7 @@ class VoiceEngine:
         if not app_name:
             return "Quelle application voulez-vous ouvrir ?"
         
-        # Mapping des applications
-        app_map = {
-            'chrome': 'chrome.exe',
-            'firefox': 'firefox.exe',
-            'edge': 'msedge.exe',
-            'spotify': 'Spotify.exe',
-            'discord': 'Discord.exe',
-            'vscode': 'Code.exe',
-            'notepad': 'notepad.exe',
-            'calc': 'calc.exe',
-            'explorer': 'explorer.exe',
-            'cmd': 'cmd.exe'
-        }
-        
-        for key, exe in app_map.items():
+        for key, exe in self.APP_MAP.items():
             if key in app_name:
                 try:
                     os.startfile(exe)
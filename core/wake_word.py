@@ -0,0 +1,268 @@
+"""
+Détection locale du mot d'activation "zodiac"
+MFCC calculés avec NumPy + alignement DTW sur des modèles enregistrés par l'utilisateur.
+Aucune requête réseau: la reconnaissance cloud n'est ouverte qu'après le mot d'activation.
+"""
+
+import os
+import glob
+import wave
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+_MEL_CACHE = {}
+
+
+def _mel_filterbank(sample_rate: int, n_fft: int, n_mels: int) -> np.ndarray:
+    """Banc de filtres triangulaires sur l'échelle mel (mis en cache)"""
+    key = (sample_rate, n_fft, n_mels)
+    if key in _MEL_CACHE:
+        return _MEL_CACHE[key]
+
+    def hz_to_mel(hz):
+        return 2595 * np.log10(1 + hz / 700)
+
+    def mel_to_hz(mel):
+        return 700 * (10 ** (mel / 2595) - 1)
+
+    mel_points = np.linspace(hz_to_mel(0), hz_to_mel(sample_rate / 2), n_mels + 2)
+    bins = np.floor((n_fft + 1) * mel_to_hz(mel_points) / sample_rate).astype(int)
+
+    bank = np.zeros((n_mels, n_fft // 2 + 1), dtype=np.float32)
+    for m in range(1, n_mels + 1):
+        left, center, right = bins[m - 1], bins[m], bins[m + 1]
+        if center > left:
+            bank[m - 1, left:center] = (np.arange(left, center) - left) / (center - left)
+        if right > center:
+            bank[m - 1, center:right] = (right - np.arange(center, right)) / (right - center)
+
+    _MEL_CACHE[key] = bank
+    return bank
+
+
+def _dct_matrix(n_mfcc: int, n_mels: int) -> np.ndarray:
+    """Matrice DCT-II orthonormée (n_mfcc x n_mels)"""
+    key = ("dct", n_mfcc, n_mels)
+    if key not in _MEL_CACHE:
+        n = np.arange(n_mels)
+        k = np.arange(n_mfcc)[:, None]
+        dct = np.cos(np.pi * k * (2 * n + 1) / (2 * n_mels)) * np.sqrt(2 / n_mels)
+        dct[0] /= np.sqrt(2)
+        _MEL_CACHE[key] = dct.astype(np.float32)
+    return _MEL_CACHE[key]
+
+
+def mfcc(samples: np.ndarray, sample_rate: int, n_mfcc: int = 13, n_mels: int = 26,
+         frame_ms: int = 25, hop_ms: int = 10) -> np.ndarray:
+    """
+    Coefficients MFCC normalisés (moyenne/variance) d'un signal
+
+    Returns:
+        Tableau (n_trames, n_mfcc)
+    """
+    signal = samples.astype(np.float32)
+    signal = np.append(signal[0], signal[1:] - 0.97 * signal[:-1]) if signal.size else signal
+
+    frame_len = int(sample_rate * frame_ms / 1000)
+    hop = int(sample_rate * hop_ms / 1000)
+    if signal.size < frame_len:
+        signal = np.pad(signal, (0, frame_len - signal.size))
+
+    n_frames = 1 + (signal.size - frame_len) // hop
+    frames = np.lib.stride_tricks.as_strided(
+        signal,
+        shape=(n_frames, frame_len),
+        strides=(signal.strides[0] * hop, signal.strides[0])
+    ) * np.hamming(frame_len).astype(np.float32)
+
+    n_fft = 1 << (frame_len - 1).bit_length()
+    power = np.abs(np.fft.rfft(frames, n_fft)) ** 2 / n_fft
+    energies = power @ _mel_filterbank(sample_rate, n_fft, n_mels).T
+    features = np.log(np.maximum(energies, 1e-10)) @ _dct_matrix(n_mfcc, n_mels).T
+
+    features -= features.mean(axis=0)
+    features /= features.std(axis=0) + 1e-8
+    return features
+
+
+def speech_bounds(samples: np.ndarray, sample_rate: int, frame_ms: int = 10,
+                  margin_ms: int = 30, peak_ratio: float = 0.1) -> Tuple[int, int]:
+    """
+    Début et fin (échantillons) de la parole dans un segment du VAD
+
+    Une trame compte comme parole si son énergie dépasse 3x le bruit de fond
+    du segment et peak_ratio x la trame la plus forte; une petite marge
+    entoure la parole.
+    """
+    frame = int(sample_rate * frame_ms / 1000)
+    n_frames = samples.size // frame
+    if n_frames < 3:
+        return 0, samples.size
+    frames = samples[:n_frames * frame].reshape(n_frames, frame).astype(np.float32)
+    energy = np.sqrt(np.mean(frames * frames, axis=1))
+    threshold = max(float(np.percentile(energy, 10)) * 3, float(energy.max()) * peak_ratio)
+    active = np.flatnonzero(energy > threshold)
+    if not active.size:
+        return 0, samples.size
+    margin = margin_ms // frame_ms
+    start = max(int(active[0]) - margin, 0)
+    end = min(int(active[-1]) + 1 + margin, n_frames)
+    return start * frame, end * frame
+
+
+def trim_to_speech(samples: np.ndarray, sample_rate: int) -> np.ndarray:
+    """Retire le silence avant et après le mot (pré-roll et fin de segment du VAD)"""
+    start, end = speech_bounds(samples, sample_rate)
+    return samples[start:end]
+
+
+def subsequence_dtw(template: np.ndarray, sequence: np.ndarray, max_start: int = 50) -> Tuple[float, int]:
+    """
+    Aligne le modèle sur le début de la séquence (début dans les max_start
+    premières trames, fin libre)
+
+    Chaque trame du modèle avance de 0 à 2 trames dans la séquence,
+    ce qui permet de vectoriser chaque ligne.
+
+    Returns:
+        (distance moyenne par trame du modèle, trame de fin dans la séquence)
+    """
+    distances = np.sqrt(((template[:, None, :] - sequence[None, :, :]) ** 2).sum(axis=2))
+    n_template, n_sequence = distances.shape
+
+    cost = np.full(n_sequence, np.inf)
+    cost[:max_start] = distances[0, :max_start]
+    for i in range(1, n_template):
+        previous = cost
+        best = previous.copy()
+        best[1:] = np.minimum(best[1:], previous[:-1])
+        best[2:] = np.minimum(best[2:], previous[:-2])
+        cost = distances[i] + best
+
+    end = int(np.argmin(cost))
+    return float(cost[end] / n_template), end
+
+
+class WakeWordDetector:
+    """Détecteur de mot d'activation par comparaison à des enregistrements modèles"""
+
+    # Distance moyenne par trame (MFCC normalisés, 13 coefficients):
+    # ~2.5-3.5 pour le même mot, ~5 pour des sons sans rapport
+    DEFAULT_THRESHOLD = 3.5
+    MAX_THRESHOLD = 4.5
+    HOP_MS = 10
+
+    def __init__(self, sample_rate: int, keyword: str = "zodiac",
+                 template_dir: str = os.path.join("data", "wake_word"),
+                 threshold: Optional[float] = None):
+        """
+        Args:
+            sample_rate: Fréquence d'échantillonnage des segments analysés
+            keyword: Mot d'activation (nom du sous-dossier de modèles)
+            template_dir: Dossier contenant les modèles WAV
+            threshold: Distance maximum pour accepter (sinon calibrée sur les modèles)
+        """
+        self.sample_rate = sample_rate
+        self.keyword = keyword
+        self.template_dir = os.path.join(template_dir, keyword)
+        self.fixed_threshold = threshold
+        self.templates: List[np.ndarray] = []
+        self.threshold = threshold or self.DEFAULT_THRESHOLD
+
+        self.stats = {"checks": 0, "detections": 0}
+        self.load_templates()
+
+    @property
+    def has_templates(self) -> bool:
+        return bool(self.templates)
+
+    def load_templates(self):
+        """Charge les modèles WAV du dossier"""
+        self.templates = []
+        for path in sorted(glob.glob(os.path.join(self.template_dir, "*.wav"))):
+            try:
+                with wave.open(path, "rb") as wav:
+                    if wav.getframerate() != self.sample_rate or wav.getsampwidth() != 2:
+                        print(f"⚠️ Modèle ignoré (format différent): {path}")
+                        continue
+                    samples = np.frombuffer(wav.readframes(wav.getnframes()), dtype=np.int16)
+                # Modèles enregistrés avant le découpage: même traitement qu'à l'enregistrement
+                samples = trim_to_speech(samples, self.sample_rate)
+                self.templates.append(mfcc(samples, self.sample_rate, hop_ms=self.HOP_MS))
+            except Exception as e:
+                print(f"⚠️ Modèle illisible {path}: {e}")
+        self._calibrate()
+        return len(self.templates)
+
+    def enroll(self, segment: bytes, save: bool = True) -> int:
+        """
+        Ajoute un enregistrement du mot d'activation comme modèle
+
+        Args:
+            segment: Segment PCM 16 bits mono du VAD contenant le mot (le
+                silence avant et après est retiré)
+            save: Sauvegarder le modèle sur disque
+
+        Returns:
+            Nombre de modèles
+        """
+        samples = trim_to_speech(np.frombuffer(segment, dtype=np.int16), self.sample_rate)
+        segment = samples.tobytes()
+        self.templates.append(mfcc(samples, self.sample_rate, hop_ms=self.HOP_MS))
+
+        if save:
+            os.makedirs(self.template_dir, exist_ok=True)
+            path = os.path.join(self.template_dir, f"{self.keyword}_{len(self.templates):02d}.wav")
+            with wave.open(path, "wb") as wav:
+                wav.setnchannels(1)
+                wav.setsampwidth(2)
+                wav.setframerate(self.sample_rate)
+                wav.writeframes(segment)
+
+        self._calibrate()
+        return len(self.templates)
+
+    def _calibrate(self):
+        """Seuil = plus grande distance entre modèles, avec une marge"""
+        if self.fixed_threshold is not None or len(self.templates) < 2:
+            return
+        distances = []
+        for i, a in enumerate(self.templates):
+            for j, b in enumerate(self.templates):
+                if i != j:
+                    distances.append(subsequence_dtw(a, b)[0])
+        self.threshold = min(self.MAX_THRESHOLD, max(distances) * 1.15)
+
+    def detect(self, segment: bytes) -> Tuple[bool, float, int]:
+        """
+        Cherche le mot d'activation au début d'un segment de parole
+
+        Returns:
+            (détecté, meilleure distance, octet de fin du mot dans le segment)
+        """
+        if not self.templates:
+            return False, float("inf"), 0
+
+        self.stats["checks"] += 1
+        samples = np.frombuffer(segment, dtype=np.int16)
+
+        # Les modèles sont sans silence: l'analyse part du début de la parole
+        # (après le pré-roll du VAD), sur 1.5x le plus long modèle
+        offset, _ = speech_bounds(samples, self.sample_rate)
+        longest = max(len(t) for t in self.templates)
+        max_samples = int(longest * 1.5 * self.sample_rate * self.HOP_MS / 1000)
+        features = mfcc(samples[offset:offset + max_samples], self.sample_rate, hop_ms=self.HOP_MS)
+
+        best_score, best_end = float("inf"), 0
+        for template in self.templates:
+            score, end = subsequence_dtw(template, features)
+            if score < best_score:
+                best_score, best_end = score, end
+
+        detected = best_score <= self.threshold
+        if detected:
+            self.stats["detections"] += 1
+
+        end_byte = (offset + (best_end + 1) * int(self.sample_rate * self.HOP_MS / 1000)) * 2
+        return detected, best_score, min(end_byte, len(segment))
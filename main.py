@@ -40,7 +40,14 @@ except ImportError as e:
 class ExocortexApp:
     """EXOCORTEX - Agent intelligent avec sélection IA et permissions améliorées"""
     
-    def __init__(self):
+    def __init__(self, startup=None):
+        """
+        Args:
+            startup: StartupOrchestrator exécuté par le splash screen (configuration
+                sauvegardée, index des applications et client IA déjà préparés)
+        """
+        self.startup = startup
+        
         # Configuration
         ctk.set_appearance_mode("dark")
         
@@ -62,6 +69,12 @@ class ExocortexApp:
             "max_messages": 100
         }
         
+        # Choix de la session précédente (chargés pendant le splash)
+        saved_config = self._startup_result("config")
+        if saved_config:
+            self.config.update(saved_config)
+            self.config["scan_complete"] = False
+        
         # Applications essentielles (toujours activées par défaut)
         self.essential_apps = ["notepad.exe", "calc.exe", "explorer.exe"]
         
@@ -71,6 +84,12 @@ class ExocortexApp:
         # Démarrer avec l'écran de langue
         self._show_language_screen()
         
+    def _startup_result(self, name):
+        """Résultat d'une tâche du démarrage (None si absente ou pas encore terminée)"""
+        if self.startup is None:
+            return None
+        return self.startup.results.get(name)
+        
     def _setup_window(self):
         """Configure la fenêtre mobile"""
         self.root.title("EXOCORTEX")
@@ -120,12 +139,20 @@ class ExocortexApp:
             running_apps = self._deep_scan_running_processes()
             self.scan_cache["running_apps"] = running_apps
             
+            # Applications du Vault (index chargé pendant le splash)
+            vault_apps = [
+                {"name": entry.get("name", key), "path": entry.get("path", ""),
+                 "type": "installée", "default_enabled": False}
+                for key, entry in (self._startup_result("vault_index") or {}).items()
+                if isinstance(entry, dict)
+            ]
+            
             # Combiner TOUT avec déduplication AVANCÉE
             all_apps = []
             seen_paths = set()
             seen_names = set()
             
-            for app_list in [registry_apps, program_apps, system_apps, running_apps]:
+            for app_list in [registry_apps, program_apps, system_apps, running_apps, vault_apps]:
                 for app in app_list:
                     # Normaliser le chemin pour éviter les doublons
                     if app["path"]:
@@ -140,6 +167,13 @@ class ExocortexApp:
                             seen_paths.add(norm_path)
                             seen_names.add(app["name"])
             
+            # Les applications autorisées la dernière fois restent activées
+            allowed_paths = {os.path.normcase(os.path.normpath(path))
+                             for path in self.config["apps_permissions"].values() if path}
+            for app in all_apps:
+                if os.path.normcase(os.path.normpath(app["path"])) in allowed_paths:
+                    app["default_enabled"] = True
+            
             self.scan_cache["all_apps"] = all_apps
             
             print(f"✅ Scan complet terminé: {len(all_apps)} applications uniques trouvées")
@@ -885,9 +919,27 @@ En mode local, aucune connexion internet requise."""
         self.root.destroy()
         
         # Lancer l'interface principale
-        main_app = ExocortexMainInterface(self.config, self.scan_cache)
+        main_app = ExocortexMainInterface(self.config, self.scan_cache, self._startup_ai_clients())
         main_app.run()
         
+    def _startup_ai_clients(self):
+        """Client IA préparé pendant le splash, s'il correspond au choix final"""
+        client = self._startup_result("ai_client")
+        provider = self.config["ai_provider"]
+        if client is None or provider not in ("deepseek", "gemini"):
+            return None
+        # Le client a été créé avec la configuration sauvegardée: le réutiliser
+        # seulement si l'assistant de configuration n'a rien changé
+        expected = {"deepseek": DeepSeekAPI, "gemini": GeminiAPI}.get(provider)
+        if expected is None or not isinstance(client, expected):
+            return None
+        if getattr(client, "api_key", None) != self.config["api_key"]:
+            return None
+        if getattr(client, "use_internet", None) != self.config["use_internet"]:
+            return None
+        print(f"♻️ Client {provider} préparé au démarrage réutilisé")
+        return {provider: client}
+        
     def _create_progress_bar(self, parent, step):
         """Crée une barre de progression"""
         prog_frame = ctk.CTkFrame(parent, fg_color="transparent")
@@ -914,12 +966,17 @@ En mode local, aucune connexion internet requise."""
 class ExocortexMainInterface:
     """Interface principale avec assistant IA avancé"""
     
-    def __init__(self, config, scan_cache):
+    def __init__(self, config, scan_cache, ai_clients=None):
         self.config = config
         self.scan_cache = scan_cache
         
-        # Initialiser l'assistant avancé
-        self.assistant = AdvancedAssistant(config)
+        # Initialiser l'assistant avancé (avec le client préparé au démarrage s'il y en a un)
+        self.assistant = AdvancedAssistant(
+            config.get("ai_provider", "local"),
+            config.get("api_key"),
+            config.get("use_internet", True),
+            clients=ai_clients
+        )
         
         # Gestion des fichiers
         self.pending_files = []
@@ -1595,5 +1652,20 @@ if __name__ == "__main__":
         os.makedirs(dir_name, exist_ok=True)
         print(f"  ✅ {dir_name}")
     
-    app = ExocortexApp()
-    app.run()
\ No newline at end of file
+    # Splash screen piloté par l'initialisation réelle: la configuration et
+    # l'index des applications sont chargés pendant l'animation, le client IA
+    # continue de se préparer pendant l'assistant de configuration
+    try:
+        from core.startup import build_default_startup
+        from ui.splash_screen import EvaSplashScreen
+    except ImportError as e:
+        print(f"⚠️ Splash screen non disponible: {e}")
+        ExocortexApp().run()
+    else:
+        orchestrator = build_default_startup()
+        
+        def launch_exocortex():
+            print(f"⏱️ Démarrage: {orchestrator.get_report()}")
+            ExocortexApp(startup=orchestrator).run()
+        
+        EvaSplashScreen(launch_exocortex, orchestrator).run()
\ No newline at end of file
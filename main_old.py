@@ -63,7 +63,7 @@ class ZodiacVoiceAssistant:
         # Services
         self.recognizer = None
         self.microphone = None
-        self.tts_engine = None
+        self.tts_worker = None
         
         # Setup
         self.setup_directories()
@@ -120,13 +120,22 @@ class ZodiacVoiceAssistant:
             
         # Synthèse vocale
         if tts:
-            try:
-                self.tts_engine = pyttsx3.init()
-                self.tts_engine.setProperty('rate', 150)
+            # Un seul thread possède le moteur: plus de runAndWait concurrents
+            from core.tts_worker import TTSWorker
+            from core.tts_cache import TTSCache, collect_phrases
+            self.tts_worker = TTSWorker(
+                rate=150,
+                engine_factory=lambda: self._create_tts_engine(150),
+                cache=TTSCache(rate=150)
+            )
+            if self.tts_worker.start():
                 self.voice_enabled = True
                 self.add_to_log("✅", "Synthèse vocale activée")
-            except Exception as e:
-                self.add_to_log("❌", f"Erreur synthèse vocale: {e}")
+                self.tts_worker.prerender(collect_phrases())
+            else:
+                self.add_to_log("❌", "Erreur synthèse vocale: moteur indisponible")
+                self.tts_worker.stop()
+                self.tts_worker = None
         else:
             self.add_to_log("⚠️", "pyttsx3 non installé")
             
@@ -587,20 +596,19 @@ class ZodiacVoiceAssistant:
         import random
         return random.choice(responses)
         
-    def speak(self, text):
+    def _create_tts_engine(self, rate):
+        """Crée le moteur pyttsx3 (dans le thread de synthèse)"""
+        engine = tts.init()
+        engine.setProperty('rate', rate)
+        return engine
+        
+    def speak(self, text, interrupt=False):
         """Parle le texte"""
-        if not self.tts_engine:
+        if not self.tts_worker:
             self.add_to_log("🔇", f"(Voix): {text}", "yellow")
             return
             
-        def speak_thread():
-            try:
-                self.tts_engine.say(text)
-                self.tts_engine.runAndWait()
-            except Exception as e:
-                self.log_error(f"Erreur synthèse vocale: {e}")
-                
-        threading.Thread(target=speak_thread, daemon=True).start()
+        self.tts_worker.say(text, interrupt=interrupt)
         self.add_to_log("🔊", text, "green")
         
     def show_commands(self):
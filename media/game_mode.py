@@ -4,14 +4,18 @@ Optimisation pour jeux
 """
 import psutil
 import os
+import threading
 
 class GameMode:
     def __init__(self):
         self.original_processes = []
+        self.active = False
+        self.own_windows = set()  # Fenêtres de Zodiac (handles Windows)
     
     def enable(self):
         # Sauvegarder les processus actuels
         self.original_processes = [p.info for p in psutil.process_iter(['pid', 'name'])]
+        self.active = True
         
         # Fermer les applications non essentielles
         non_essential = ['chrome', 'firefox', 'spotify', 'discord']
@@ -24,4 +28,62 @@ class GameMode:
     
     def disable(self):
         # Réactiver les processus (simplifié)
-        print("Game Mode désactivé")
\ No newline at end of file
+        self.active = False
+        print("Game Mode désactivé")
+    
+    def exclude_window(self, hwnd):
+        """Ignore une fenêtre de Zodiac dans la détection plein écran"""
+        if hwnd:
+            self.own_windows.add(int(hwnd))
+    
+    @staticmethod
+    def _window_pid(hwnd):
+        """PID du processus propriétaire d'une fenêtre (None hors Windows)"""
+        try:
+            import ctypes
+            from ctypes import wintypes
+            
+            pid = wintypes.DWORD()
+            ctypes.windll.user32.GetWindowThreadProcessId(wintypes.HWND(hwnd), ctypes.byref(pid))
+            return pid.value or None
+        except Exception:
+            return None
+    
+    def is_fullscreen_app_running(self):
+        """Détecte une application plein écran au premier plan (jeu, vidéo)"""
+        try:
+            import pygetwindow as gw
+            import pyautogui
+            
+            window = gw.getActiveWindow()
+            if window is None:
+                return False
+            
+            # Le tableau de bord de Zodiac maximisé n'est pas un jeu
+            hwnd = getattr(window, "_hWnd", None)
+            if hwnd is not None:
+                if hwnd in self.own_windows or self._window_pid(hwnd) == os.getpid():
+                    return False
+            
+            screen_width, screen_height = pyautogui.size()
+            return window.width >= screen_width and window.height >= screen_height
+        except Exception:
+            return False
+    
+    def is_heavy_load(self):
+        """Vrai si le mode jeu est actif ou si un jeu plein écran tourne"""
+        return self.active or self.is_fullscreen_app_running()
+
+
+_game_mode = None
+_game_mode_lock = threading.Lock()
+
+
+def get_game_mode():
+    """Mode jeu partagé par l'application (créé au premier appel)"""
+    global _game_mode
+    if _game_mode is None:
+        with _game_mode_lock:
+            if _game_mode is None:
+                _game_mode = GameMode()
+    return _game_mode
@@ -1,13 +1,13 @@
 # screens/main_dashboard.py - Dashboard responsive
 import customtkinter as ctk
-from ui.tabs.assistant_tab import AssistantTab
-from ui.tabs.vault_tab import VaultTab
-from ui.tabs.dashboard_tab import DashboardTab
 
 class MainDashboard(ctk.CTkFrame):
     """Dashboard principal EXOCORTEX - Version responsive"""
     
-    def __init__(self, parent, controller, mobile_mode):
+    # Délai avant de pré-construire les onglets cachés (ms)
+    PREWARM_DELAY_MS = 300
+    
+    def __init__(self, parent, controller, mobile_mode, prewarm=True):
         super().__init__(parent, fg_color="#0A0A0F")
         self.controller = controller
         self.mobile_mode = mobile_mode
@@ -20,6 +20,10 @@ class MainDashboard(ctk.CTkFrame):
             # Mode mobile - utiliser pack
             self._setup_mobile_ui()
             
+        # Pré-construire les autres onglets une fois le premier affiché
+        if prewarm:
+            self.after(self.PREWARM_DELAY_MS, self.prewarm_tabs)
+            
     def _setup_mobile_ui(self):
         """Interface mobile (votre design existant)"""
         # Header
@@ -96,16 +100,55 @@ class MainDashboard(ctk.CTkFrame):
         self._switch_tab("assistant")
         
     def _create_tabs(self):
-        """Crée les onglets"""
+        """Déclare les onglets (construits au premier affichage)"""
         # Note: On passe le mobile_mode aux onglets
-        self.tabs = {
-            "assistant": AssistantTab(self.content_frame, None, None, self.mobile_mode),
-            "vault": VaultTab(self.content_frame, self.mobile_mode),
-            "dashboard": DashboardTab(self.content_frame, self.mobile_mode)
+        self.tab_factories = {
+            "assistant": self._build_assistant_tab,
+            "vault": self._build_vault_tab,
+            "dashboard": self._build_dashboard_tab
         }
+        self.tabs = {}
+        
+        # Aucun onglet affiché tant que _switch_tab n'a pas été appelé
+        self.current_tab = None
+        
+    def _build_assistant_tab(self):
+        from ui.tabs.assistant_tab import AssistantTab
+        return AssistantTab(self.content_frame, None, None, self.mobile_mode)
+        
+    def _build_vault_tab(self):
+        from ui.tabs.vault_tab import VaultTab
+        return VaultTab(self.content_frame, self.mobile_mode)
+        
+    def _build_dashboard_tab(self):
+        from ui.tabs.dashboard_tab import DashboardTab
+        return DashboardTab(self.content_frame, self.mobile_mode)
         
-        # Stocker l'onglet courant
-        self.current_tab = "assistant"
+    def _get_tab(self, tab_key):
+        """Retourne un onglet, en le construisant au premier accès"""
+        if tab_key not in self.tabs:
+            factory = self.tab_factories.get(tab_key)
+            if factory is None:
+                return None
+            self.tabs[tab_key] = factory()
+        return self.tabs[tab_key]
+        
+    def prewarm_tabs(self):
+        """Construit les onglets restants, un par cycle idle, sans bloquer l'interface"""
+        # Préparer l'assistant et la voix hors du thread de l'interface
+        assistant_tab = self.tabs.get("assistant")
+        if assistant_tab is not None and hasattr(assistant_tab, "prewarm"):
+            assistant_tab.prewarm()
+            
+        pending = [key for key in self.tab_factories if key not in self.tabs]
+        
+        def build_next():
+            if not pending or not self.winfo_exists():
+                return
+            self._get_tab(pending.pop(0))
+            self.after_idle(build_next)
+            
+        self.after_idle(build_next)
         
     def _create_mobile_navigation(self):
         """Navigation mobile (bas de l'écran)"""
@@ -145,20 +188,26 @@ class MainDashboard(ctk.CTkFrame):
                     btn.configure(fg_color="#6C63FF")
                     
             # Afficher l'onglet assistant par défaut
-            self.tabs["assistant"].pack(fill="both", expand=True)
+            self._switch_tab("assistant")
             
     def _switch_tab(self, tab_key):
         """Change d'onglet"""
         if tab_key == self.current_tab:
             return
             
+        # Construire l'onglet au premier affichage
+        new_tab = self._get_tab(tab_key)
+        if new_tab is None:
+            return
+            
         # Mode mobile
         if self.mobile_mode:
             # 1. Cacher l'onglet actuel
-            self.tabs[self.current_tab].pack_forget()
+            if self.current_tab is not None:
+                self.tabs[self.current_tab].pack_forget()
             
             # 2. Afficher le nouveau
-            self.tabs[tab_key].pack(fill="both", expand=True)
+            new_tab.pack(fill="both", expand=True)
             
             # 3. Mettre à jour le style des boutons
             for btn, key in self.nav_buttons:
@@ -170,10 +219,11 @@ class MainDashboard(ctk.CTkFrame):
         # Mode desktop
         else:
             # 1. Cacher l'onglet actuel
-            self.tabs[self.current_tab].grid_remove()
+            if self.current_tab is not None:
+                self.tabs[self.current_tab].grid_remove()
             
             # 2. Afficher le nouveau
-            self.tabs[tab_key].grid(row=0, column=0, sticky="nsew")
+            new_tab.grid(row=0, column=0, sticky="nsew")
             
             # 3. Mettre à jour le style des boutons sidebar
             for key, btn in self.sidebar_buttons.items():
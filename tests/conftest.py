@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Les modules de Zodiac OS s'importent depuis la racine du dépôt (ai.*, core.*, ui.*)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
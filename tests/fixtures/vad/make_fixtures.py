@@ -0,0 +1,40 @@
+"""
+Génère les WAV de test du VAD (8 kHz, 16 bits mono)
+Usage: python tests/fixtures/vad/make_fixtures.py
+"""
+import os
+import wave
+
+import numpy as np
+
+RATE = 8000
+# Rafales de pseudo-parole de speech_bursts.wav: (début, fin) en secondes
+BURSTS = ((0.5, 1.3), (2.0, 2.8))
+
+
+def _write(name, signal):
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), name)
+    with wave.open(path, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(RATE)
+        wav.writeframes(np.clip(signal, -32768, 32767).astype(np.int16).tobytes())
+
+
+def main():
+    rng = np.random.default_rng(0)
+
+    t = np.arange(int(RATE * 3.8)) / RATE
+    signal = rng.normal(0, 100, t.size)
+    for start, end in BURSTS:
+        mask = (t >= start) & (t < end)
+        envelope = np.sin(np.pi * (t[mask] - start) / (end - start)) ** 0.3
+        signal[mask] += 4000 * envelope * np.sin(2 * np.pi * 180 * t[mask]) * (1 + np.sin(2 * np.pi * 4 * t[mask]))
+    _write("speech_bursts.wav", signal)
+
+    _write("noise.wav", rng.normal(0, 300, RATE * 2))
+    _write("silence.wav", np.zeros(int(RATE * 1.5)))
+
+
+if __name__ == "__main__":
+    main()
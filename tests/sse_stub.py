@@ -0,0 +1,66 @@
+"""
+Serveur SSE local pour tester les clients IA en flux (DeepSeek, Gemini)
+"""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List, Optional
+
+
+def serve_stub(tokens: List[str], delay: float = 0.05, port: int = 0, dialect: str = "openai",
+               cut_after: Optional[int] = None):
+    """
+    Démarre un serveur HTTP local qui renvoie les jetons en SSE
+
+    Args:
+        tokens: Jetons envoyés un par un
+        delay: Pause entre deux jetons (s)
+        port: Port d'écoute (0 = libre)
+        dialect: "openai" (DeepSeek) ou "gemini"
+        cut_after: Connexion coupée après ce nombre de jetons (réponse interrompue)
+
+    Returns:
+        (serveur, url de base) - appeler serveur.shutdown() pour l'arrêter
+    """
+    def event(token):
+        if dialect == "gemini":
+            body = {"candidates": [{"content": {"parts": [{"text": token}], "role": "model"}}]}
+        else:
+            body = {"choices": [{"index": 0, "delta": {"content": token}}]}
+        return f"data: {json.dumps(body)}\n\n".encode("utf-8")
+
+    class Handler(BaseHTTPRequestHandler):
+        # Envoi par blocs HTTP/1.1, comme les vraies API
+        protocol_version = "HTTP/1.1"
+
+        def send_chunk(self, data: bytes):
+            self.wfile.write(b"%x\r\n%s\r\n" % (len(data), data))
+            self.wfile.flush()
+
+        def do_POST(self):
+            length = int(self.headers.get("Content-Length", 0))
+            self.rfile.read(length)
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Transfer-Encoding", "chunked")
+            self.send_header("Connection", "close")
+            self.end_headers()
+            for i, token in enumerate(tokens):
+                if i == cut_after:
+                    # Fermeture sans bloc final: le client voit une réponse tronquée
+                    self.close_connection = True
+                    return
+                self.send_chunk(event(token))
+                time.sleep(delay)
+            if dialect != "gemini":
+                self.send_chunk(b"data: [DONE]\n\n")
+            self.send_chunk(b"")
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", port), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
@@ -0,0 +1,70 @@
+from ai.provider_router import Provider, ProviderRouter
+from ai.response_cache import ResponseCache
+from core.advanced_assistant import AdvancedAssistant
+
+
+class StreamingClient:
+    model = "test-model"
+
+    def __init__(self, tokens):
+        self.tokens = tokens
+
+    def chat(self, message, context=None):
+        return "".join(self.tokens)
+
+    def chat_stream(self, message, context=None):
+        yield from self.tokens
+
+
+def make_assistant(tmp_path, providers):
+    assistant = AdvancedAssistant()  # mode démo: pas de réseau
+    assistant.router = ProviderRouter(providers, fallback=lambda m: "local", adaptive=False)
+    assistant.ai_engine = providers[0].client
+    assistant.response_cache = ResponseCache(path=None)
+    return assistant
+
+
+def test_stream_failing_midway_is_not_cached(tmp_path):
+    client = StreamingClient(["La photosynthèse ", "est", "\n❌ Erreur Gemini: coupure"])
+    assistant = make_assistant(tmp_path, [Provider("gemini", client)])
+
+    "".join(assistant.process_query_stream("c'est quoi la photosynthèse"))
+    assert assistant.router.last_failed
+    assert assistant.response_cache.get_stats()["entries"] == 0
+
+    client.tokens = ["La photosynthèse convertit la lumière."]
+    reply = assistant.process_query("c'est quoi la photosynthèse")
+    assert reply.startswith("La photosynthèse convertit")
+
+
+def test_failover_answer_is_cached_under_serving_provider(tmp_path):
+    failing = StreamingClient(["❌ Erreur API: 500"])
+    working = StreamingClient(["Paris est la capitale de la France."])
+    assistant = make_assistant(tmp_path, [Provider("deepseek", failing), Provider("gemini", working)])
+
+    "".join(assistant.process_query_stream("quelle est la capitale de la France"))
+    cache = assistant.response_cache
+    assert cache.get("quelle est la capitale de la France", "gemini", assistant._cache_context("gemini"))
+    assert cache.get("quelle est la capitale de la France", "deepseek", assistant._cache_context("deepseek")) is None
+
+
+def test_web_command_answers_from_parallel_research(monkeypatch):
+    import ai.async_client
+
+    calls = []
+
+    def fake_research(query, city=None, **options):
+        calls.append((query, city))
+        return {"wiki": {"summary": "Lyon est une ville française.", "url": "https://fr.wikipedia.org/wiki/Lyon"},
+                "quick_answer": None, "web": [], "weather": None}
+
+    monkeypatch.setattr(ai.async_client, "research", fake_research)
+    assistant = AdvancedAssistant()
+    reply = assistant.process_query("recherche web météo à Lyon")
+    assert calls == [("météo à Lyon", "Lyon")]
+    assert reply.startswith("Lyon est une ville française.")
+
+    # Une question ordinaire en mode démo reste instantanée, sans réseau
+    assert assistant.process_query("c'est quoi Lyon").startswith("Mode démo")
+    assert len(calls) == 1
+
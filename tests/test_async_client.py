@@ -0,0 +1,15 @@
+import ai.async_client as async_client
+
+
+def test_research_reuses_its_services():
+    created = []
+
+    class FakeService:
+        def __init__(self, *args, runner=None):
+            created.append(args)
+
+    runner = object()
+    first = async_client._shared_service(FakeService, runner, "fr")
+    assert async_client._shared_service(FakeService, runner, "fr") is first
+    assert async_client._shared_service(FakeService, runner, "en") is not first
+    assert created == [("fr",), ("en",)]
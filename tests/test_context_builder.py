@@ -0,0 +1,24 @@
+import random
+
+from ai.context_builder import ContextBuilder
+
+
+def random_history(rng, length):
+    history = []
+    for i in range(length):
+        role = "user" if i % 2 == 0 else "assistant"
+        history.append({"role": role, "content": f"{role} {i} " + "mot " * rng.randint(1, 200)})
+    return history
+
+
+def test_kept_history_starts_with_user_turn():
+    rng = random.Random(42)
+    builder = ContextBuilder(max_tokens=1500, reserve_reply=500)
+    for _ in range(200):
+        history = random_history(rng, rng.randint(1, 40))
+        if rng.random() < 0.3:
+            history = history[1:]  # historique qui commence par une réponse
+        built = builder.build("Et ensuite ?", history)
+        if built.history:
+            assert built.history[0]["role"] == "user"
+        assert built.dropped >= 0
@@ -0,0 +1,78 @@
+from ai.context_memory import ContextMemory
+from ai.conversation_log import ConversationLog
+
+
+def test_cleared_session_is_not_reloaded(tmp_path):
+    memory = ContextMemory(data_dir=str(tmp_path))
+    memory.add_message("user", "Bonjour")
+    memory.add_message("assistant", "Bonjour !")
+    memory.clear_memory()
+    memory.save_history()
+    memory.log.close()
+
+    restarted = ContextMemory(data_dir=str(tmp_path))
+    assert restarted.get_recent_context() == []
+    # Les messages effacés restent dans le journal (recherche dans l'historique)
+    assert [m["content"] for m in restarted.search_in_memory("bonjour")]
+
+
+def test_start_marker_survives_compaction(tmp_path):
+    log = ConversationLog(str(tmp_path / "conversations.jsonl"))
+    log.append("s1", {"role": "user", "content": "ancien", "timestamp": "2026-01-01T10:00:00"})
+    log.start_session("s2")
+    log.compact()
+    log.flush()
+    log.close()
+
+    sessions = ConversationLog(str(tmp_path / "conversations.jsonl")).read_sessions()
+    assert list(sessions) == ["s1", "s2"]
+    assert sessions["s2"] == []
+
+
+def test_context_survives_two_restarts(tmp_path):
+    memory = ContextMemory(data_dir=str(tmp_path))
+    memory.add_message("user", "A")
+    memory.add_message("assistant", "B")
+    memory.save_history()
+    memory.log.close()
+
+    second = ContextMemory(data_dir=str(tmp_path))
+    assert [m["content"] for m in second.get_recent_context()] == ["A", "B"]
+    second.add_message("user", "C")
+    second.add_message("assistant", "D")
+    second.save_history()
+    second.log.close()
+
+    third = ContextMemory(data_dir=str(tmp_path), max_history=3)
+    assert [m["content"] for m in third.get_recent_context()] == ["B", "C", "D"]
+
+
+def test_index_build_does_not_block_add_message(tmp_path):
+    import threading
+    import time
+
+    memory = ContextMemory(data_dir=str(tmp_path))
+    memory.add_message("user", "ancienne question sur le jardin")
+    memory.save_history()
+
+    reading, release = threading.Event(), threading.Event()
+    read_sessions = memory.log.read_sessions
+
+    def slow_read():
+        reading.set()
+        release.wait(5.0)
+        return read_sessions()
+
+    memory.log.read_sessions = slow_read
+    search = threading.Thread(target=memory.search_in_memory, args=("jardin",))
+    search.start()
+    assert reading.wait(5.0)
+
+    start = time.monotonic()
+    memory.add_message("user", "nouvelle question sur le jardin")
+    assert time.monotonic() - start < 1.0
+    release.set()
+    search.join()
+
+    found = [m["content"] for m in memory.search_in_memory("jardin")]
+    assert sorted(found) == ["ancienne question sur le jardin", "nouvelle question sur le jardin"]
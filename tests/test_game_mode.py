@@ -0,0 +1,31 @@
+import os
+import sys
+import types
+
+import pytest
+
+pytest.importorskip("psutil")
+
+from media.game_mode import GameMode
+
+
+def fake_desktop(monkeypatch, hwnd):
+    window = types.SimpleNamespace(_hWnd=hwnd, width=1920, height=1080)
+    monkeypatch.setitem(sys.modules, "pygetwindow", types.SimpleNamespace(getActiveWindow=lambda: window))
+    monkeypatch.setitem(sys.modules, "pyautogui", types.SimpleNamespace(size=lambda: (1920, 1080)))
+
+
+def test_own_fullscreen_window_is_not_a_game(monkeypatch):
+    fake_desktop(monkeypatch, hwnd=42)
+    monkeypatch.setattr(GameMode, "_window_pid", staticmethod(lambda hwnd: None))
+    game_mode = GameMode()
+    assert game_mode.is_fullscreen_app_running()
+
+    game_mode.exclude_window(42)
+    assert not game_mode.is_fullscreen_app_running()
+
+
+def test_window_of_this_process_is_ignored(monkeypatch):
+    fake_desktop(monkeypatch, hwnd=7)
+    monkeypatch.setattr(GameMode, "_window_pid", staticmethod(lambda hwnd: os.getpid()))
+    assert not GameMode().is_fullscreen_app_running()
@@ -0,0 +1,41 @@
+import threading
+import time
+
+from ai.gemini_api import GeminiAPI
+
+
+class FakeResponse:
+    def __init__(self, text):
+        self.text = text
+
+
+class FakeSession:
+    """Session de chat qui vérifie que son historique ne change pas pendant un envoi"""
+
+    def __init__(self):
+        self.history = []
+        self.sent = []
+
+    def send_message(self, prompt):
+        history = self.history
+        time.sleep(0.05)
+        # Une autre requête a remplacé l'historique pendant l'envoi?
+        self.sent.append((prompt, history is self.history))
+        return FakeResponse(f"réponse à {prompt}")
+
+
+def test_concurrent_chats_do_not_mix_session_history():
+    client = GeminiAPI("stub")
+    client._model = object()
+    client._chat_session = session = FakeSession()
+    client.conversation_history = [{"role": "user", "content": "ancienne question"},
+                                   {"role": "assistant", "content": "ancienne réponse"}]
+
+    threads = [threading.Thread(target=client.chat, args=(f"question {i}",)) for i in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(session.sent) == 4
+    assert all(unchanged for _, unchanged in session.sent)
@@ -0,0 +1,21 @@
+from ai.history_index import HistoryIndex
+
+
+def message(content, minute=0):
+    return {"role": "user", "content": content, "timestamp": f"2026-03-01T10:{minute:02d}:00"}
+
+
+def test_prefix_keeps_exact_term_and_most_frequent_completions():
+    index = HistoryIndex()
+    # Plus de complétions que la limite, indexées avant le mot exact
+    for i in range(HistoryIndex.MAX_EXPANSIONS + 20):
+        index.add(message(f"photo{i:03d}z"))
+    for _ in range(3):
+        index.add(message("photosynthese frequente"))
+    index.add(message("photo"))
+
+    found = [r["content"] for r in index.search("photo", limit=100)]
+    assert "photo" in found
+    assert "photosynthese frequente" in found
+    # "photo", les 3 "photosynthese" et 49 complétions peu fréquentes
+    assert len(found) == 1 + 3 + HistoryIndex.MAX_EXPANSIONS - 1
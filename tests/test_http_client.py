@@ -0,0 +1,26 @@
+import time
+
+import pytest
+
+from ai.http_client import HttpClient, SlotTimeout
+
+
+def test_waiting_for_a_slot_is_bounded_by_the_request_timeout():
+    client = HttpClient(max_concurrency=2, per_host=1)
+    client._acquire("example.invalid")  # requête en cours vers l'hôte
+
+    start = time.monotonic()
+    with pytest.raises(SlotTimeout):
+        client.get("http://example.invalid/page", timeout=(0.2, 5))
+    assert time.monotonic() - start < 1.0
+
+
+def test_global_limit_timeout_gives_back_the_host_slot():
+    client = HttpClient(max_concurrency=1, per_host=1)
+    client._acquire("a.invalid")
+
+    with pytest.raises(SlotTimeout):
+        client.get("http://b.invalid/", timeout=0.1)
+    # La place de b.invalid a été rendue: seule la limite globale bloquait
+    client._slots.release()
+    client._acquire("b.invalid", timeout=0.1)
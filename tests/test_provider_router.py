@@ -0,0 +1,97 @@
+import time
+
+from ai.provider_router import CircuitBreaker, Provider, ProviderRouter, build_router
+
+
+class FakeClient:
+    def __init__(self, reply="ok", delay=0.0):
+        self.reply = reply
+        self.delay = delay
+        self.calls = 0
+
+    def chat(self, message, context=None):
+        self.calls += 1
+        time.sleep(self.delay)
+        return self.reply
+
+
+def test_candidates_does_not_reserve_trial():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.0)
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    for _ in range(3):
+        assert breaker.available()
+    assert breaker.state == CircuitBreaker.OPEN
+
+
+def test_recovered_provider_is_not_shut_out():
+    a = Provider("a", FakeClient("réponse a"), failure_threshold=1, reset_timeout=0.0)
+    b = Provider("b", FakeClient("réponse b"), failure_threshold=1, reset_timeout=0.0)
+    router = ProviderRouter([a, b], fallback=lambda m: "local", race_delay=5.0, adaptive=False)
+
+    b.breaker.record_failure()  # b en panne puis rétabli (reset_timeout écoulé)
+    for _ in range(3):
+        assert router.chat("question") == ("réponse a", "a")  # b jamais lancé
+    assert b.breaker.state == CircuitBreaker.OPEN
+
+    a.client.reply = "❌ Erreur a"
+    assert router.chat("question") == ("réponse b", "b")
+    assert b.breaker.state == CircuitBreaker.CLOSED
+    router.shutdown()
+
+
+def test_half_open_trial_expires():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.0, trial_timeout=0.05)
+    breaker.record_failure()
+    assert breaker.allow()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert not breaker.allow()
+    time.sleep(0.06)
+    assert breaker.allow()
+
+
+class RememberingClient(FakeClient):
+    def __init__(self, reply, delay):
+        super().__init__(reply, delay)
+        self.conversation_history = []
+
+    def chat(self, message, context=None):
+        reply = super().chat(message, context)
+        self.conversation_history += [{"role": "user", "content": message},
+                                      {"role": "assistant", "content": reply}]
+        return reply
+
+
+def test_losing_racer_forgets_its_exchange():
+    slow = Provider("lent", RememberingClient("réponse lente", delay=0.3))
+    fast = Provider("rapide", RememberingClient("réponse rapide", delay=0.0))
+    router = ProviderRouter([slow, fast], fallback=lambda m: "local", race_delay=0.05, adaptive=False)
+
+    assert router.chat("question") == ("réponse rapide", "rapide")
+    time.sleep(0.5)  # le perdant finit sa réponse
+    assert slow.client.conversation_history == []
+    assert len(fast.client.conversation_history) == 2
+    router.shutdown()
+
+
+def test_counters_are_exact_under_concurrent_callers():
+    import threading
+
+    router = ProviderRouter([Provider("a", FakeClient("ok"))], fallback=lambda m: "local", adaptive=False)
+    threads = [threading.Thread(target=lambda: [router.chat("q") for _ in range(50)]) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    stats = router.get_stats()
+    assert stats["router"]["requests"] == 400
+    assert stats["providers"]["a"]["wins"] == 400
+    router.shutdown()
+
+
+def test_build_router_reuses_prepared_clients():
+    warmed = FakeClient("prêt")
+    router = build_router({"gemini": "clé"}, clients={"gemini": warmed})
+    assert router.providers[0].client is warmed
+    assert router.chat("q") == ("prêt", "gemini")
+    router.shutdown()
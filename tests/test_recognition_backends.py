@@ -0,0 +1,26 @@
+import os
+
+from core.recognition_backends import (GoogleBackend, RecognizerBackend, ReplayBackend, benchmark_pipeline,
+                                       recognition_workers)
+
+BURSTS_WAV = os.path.join(os.path.dirname(__file__), "fixtures", "vad", "speech_bursts.wav")
+
+
+def test_replay_backend_requires_ordered_recognition():
+    assert ReplayBackend.ordered
+    assert not GoogleBackend.ordered
+
+
+def test_ordered_backend_gets_a_single_recognition_worker():
+    assert recognition_workers(ReplayBackend(), 2) == 1
+    assert recognition_workers(RecognizerBackend(), 2) == 2
+
+
+def test_replay_pipeline_benchmark_is_reproducible():
+    # Deux rafales de parole: deux segments, reconnus dans l'ordre à chaque passage
+    for _ in range(3):
+        backend = ReplayBackend(["phrase 0", "phrase 1"], latency_ms=5)
+        stats = benchmark_pipeline(backend, [BURSTS_WAV], speed=0)
+        assert stats["workers"] == 1
+        assert stats["vad"]["segments"] == 2
+        assert stats["transcripts"] == ["phrase 0", "phrase 1"]
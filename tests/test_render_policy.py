@@ -0,0 +1,48 @@
+import threading
+import time
+
+from ui.render_policy import RenderQualityPolicy
+
+
+class FakeScheduler:
+    def __init__(self):
+        self.tasks = {}
+        self.applied_from = []
+
+    def register(self, name, callback, interval_ms=None, priority=1, degradable=True):
+        self.tasks[name] = callback
+
+    def set_quality(self, interval_multiplier=1, max_priority=None):
+        self.applied_from.append((threading.current_thread().name, interval_multiplier, max_priority))
+
+    def run_tasks(self):
+        for name, callback in list(self.tasks.items()):
+            if callback(0.25) is False:
+                del self.tasks[name]
+
+
+class FakeMonitor:
+    cpu = 95.0
+
+    def get_system_info(self):
+        return {"cpu_percent": self.cpu}
+
+
+def test_levels_are_applied_by_scheduler_task_only():
+    scheduler = FakeScheduler()
+    policy = RenderQualityPolicy(scheduler, FakeMonitor(), check_interval=0.01)
+    policy.start()
+    time.sleep(0.1)
+
+    # Le thread d'échantillonnage ne touche pas au planificateur
+    assert scheduler.applied_from == []
+    assert policy.level == "full"
+
+    scheduler.run_tasks()
+    assert policy.level == "off"
+    assert scheduler.applied_from == [(threading.current_thread().name, 4, 1)]
+
+    policy.stop()
+    scheduler.run_tasks()
+    assert policy.level == "full"
+    assert "render_policy" not in scheduler.tasks
@@ -0,0 +1,37 @@
+import time
+
+from core.speculative import SpeculativeExecutor
+
+
+def test_commit_miss_does_not_block_on_network():
+    executor = SpeculativeExecutor(app_index={"chrome": {"name": "Chrome", "path": "/nope/chrome"}})
+
+    def slow_prepare(intent):
+        time.sleep(2.0)
+        return {"summary": "trop tard"}
+
+    original = executor._prepare
+    executor._prepare = lambda intent: slow_prepare(intent) if intent.kind != "open_app" else original(intent)
+
+    start = time.perf_counter()
+    intent, prepared = executor.commit("qui est ada lovelace")
+    assert intent.kind == "wiki"
+    assert prepared is None
+    assert time.perf_counter() - start < 0.5
+
+    intent, prepared = executor.commit("ouvre chrome")
+    assert intent.kind == "open_app" and prepared["name"] == "Chrome"
+    executor.shutdown()
+
+
+def test_commit_does_not_wait_for_a_slow_speculative_result():
+    executor = SpeculativeExecutor()
+    executor._prepare = lambda intent: time.sleep(2.0) or {"summary": "trop tard"}
+
+    assert executor.speculate("qui est ada lovelace").kind == "wiki"
+    start = time.perf_counter()
+    intent, prepared = executor.commit("qui est ada lovelace")
+    assert intent.kind == "wiki" and prepared is None
+    assert time.perf_counter() - start < 0.5
+    assert executor.stats["late"] == 1
+    executor.shutdown()
@@ -0,0 +1,22 @@
+import threading
+
+from core.startup import StartupOrchestrator, build_default_startup
+
+
+def test_failing_progress_callback_does_not_block_ready():
+    ready = threading.Event()
+    orchestrator = StartupOrchestrator()
+    orchestrator.add_task("a", lambda deps: 1)
+    orchestrator.add_task("b", lambda deps: 2, depends_on=["a"])
+
+    def broken_progress(progress, message):
+        raise RuntimeError("fenêtre détruite")
+
+    orchestrator.run(on_progress=broken_progress, on_ready=ready.set)
+    assert ready.wait(2.0)
+    assert orchestrator.wait(2.0)
+
+
+def test_default_startup_builds_no_voice_engine(tmp_path):
+    orchestrator = build_default_startup(str(tmp_path))
+    assert "voice_engine" not in orchestrator.tasks
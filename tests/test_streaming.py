@@ -0,0 +1,40 @@
+import pytest
+
+from ai.deepseek_api import DeepSeekAPI
+from ai.gemini_api import GeminiAPI
+from tests.sse_stub import serve_stub
+
+TOKENS = ["Bonjour ! ", "Voici ", "la ", "réponse."]
+CLIENTS = [(DeepSeekAPI, "openai"), (GeminiAPI, "gemini")]
+
+
+@pytest.fixture
+def stub():
+    servers = []
+
+    def start(dialect, **options):
+        server, url = serve_stub(TOKENS, delay=0.01, dialect=dialect, **options)
+        servers.append(server)
+        return url
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+@pytest.mark.parametrize("client_class, dialect", CLIENTS)
+def test_stream_yields_tokens_in_order(stub, client_class, dialect):
+    client = client_class("stub", base_url=stub(dialect))
+    assert list(client.chat_stream("Bonjour")) == TOKENS
+    assert client.conversation_history[-1]["content"] == "".join(TOKENS)
+
+
+@pytest.mark.parametrize("client_class, dialect", CLIENTS)
+def test_stream_cut_midway_ends_with_an_error(stub, client_class, dialect):
+    client = client_class("stub", base_url=stub(dialect, cut_after=2))
+    tokens = list(client.chat_stream("Bonjour"))
+    assert tokens[:2] == TOKENS[:2]
+    assert len(tokens) == 3 and tokens[2].startswith("\n❌")
+    # Réponse incomplète: pas gardée dans l'historique
+    assert client.conversation_history == []
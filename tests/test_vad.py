@@ -0,0 +1,43 @@
+import os
+
+import numpy as np
+import pytest
+
+from core.audio_capture import load_wav
+from core.vad import VoiceActivityDetector
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures", "vad")
+# Rafales de speech_bursts.wav (voir fixtures/vad/make_fixtures.py)
+BURSTS = ((0.5, 1.3), (2.0, 2.8))
+
+
+def segment_bounds(name):
+    """Segments détectés dans un fixture: [(début, fin)] en secondes"""
+    data, rate = load_wav(os.path.join(FIXTURES, name))
+    data = np.frombuffer(data, dtype=np.int16)
+    vad = VoiceActivityDetector(rate)
+    step = vad.frame_size  # une trame par bloc: position exacte à la fermeture
+    position, bounds = 0, []
+    for i in range(0, len(data), step):
+        chunk = data[i:i + step]
+        position += len(chunk)
+        for segment in vad.process(chunk.tobytes()):
+            bounds.append(((position - len(segment) // 2) / rate, position / rate))
+    segment = vad.flush()
+    if segment:
+        bounds.append(((position - len(segment) // 2) / rate, position / rate))
+    return bounds
+
+
+def test_speech_bursts_give_one_segment_each():
+    bounds = segment_bounds("speech_bursts.wav")
+    assert len(bounds) == len(BURSTS)
+    for (start, end), (burst_start, burst_end) in zip(bounds, BURSTS):
+        # Pré-roll de 300 ms au début, 600 ms de silence avant la fermeture
+        assert burst_start - 0.35 <= start <= burst_start
+        assert burst_end <= end <= burst_end + 0.7
+
+
+@pytest.mark.parametrize("name", ["noise.wav", "silence.wav"])
+def test_noise_and_silence_give_no_segment(name):
+    assert segment_bounds(name) == []
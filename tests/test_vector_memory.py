@@ -0,0 +1,66 @@
+import os
+
+from ai.vector_memory import LongTermMemory
+
+
+def write_note(path, text, mtime):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text)
+    os.utime(path, (mtime, mtime))
+
+
+def note_texts(memory, query):
+    return [item["text"] for _, item in memory.recall(query, k=10) if item["kind"] == "note"]
+
+
+def test_edited_note_replaces_its_old_version(tmp_path):
+    path = str(tmp_path / "courses.txt")
+    write_note(path, "Acheter des pommes et du fromage", 1_000_000)
+    memory = LongTermMemory(notes_dir=str(tmp_path), min_score=0.05)
+    memory._refresh_notes()
+    memory.ready.set()
+    assert note_texts(memory, "pommes fromage") == ["Acheter des pommes et du fromage"]
+
+    write_note(path, "Acheter des pommes et du pain", 1_000_100)
+    memory._refresh_notes()
+    assert note_texts(memory, "pommes fromage") == ["Acheter des pommes et du pain"]
+    assert len(memory.store) == 1
+
+    os.remove(path)
+    memory._refresh_notes()
+    assert note_texts(memory, "pommes pain") == []
+    assert len(memory.store) == 0
+
+
+def test_concurrent_refreshes_index_an_edited_note_once(tmp_path):
+    import threading
+
+    path = str(tmp_path / "idee.txt")
+    write_note(path, "Apprendre le violon", 1_000_000)
+    memory = LongTermMemory(notes_dir=str(tmp_path))
+    memory._refresh_notes()
+    write_note(path, "Apprendre la guitare", 1_000_100)
+
+    threads = [threading.Thread(target=memory._refresh_notes) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(memory.store) == 1
+
+
+def test_store_compacts_removed_rows():
+    import numpy as np
+
+    from ai.vector_memory import VectorStore
+
+    store = VectorStore(dim=4, capacity=4)
+    for i in range(100):
+        vector = np.zeros(4, dtype=np.float32)
+        vector[i % 4] = 1.0
+        store.add(vector, {"id": i})
+    store.remove(lambda item: item["id"] < 60)
+    assert len(store) == 40
+    assert len(store.items) == 40  # lignes retirées effacées, pas seulement masquées
+    results, _ = store.search(np.array([1, 0, 0, 0], dtype=np.float32), k=3)
+    assert all(item["id"] >= 60 and item["id"] % 4 == 0 for _, item in results)
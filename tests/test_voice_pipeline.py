@@ -0,0 +1,39 @@
+import threading
+import time
+
+from core.voice_pipeline import VoicePipeline
+
+
+def test_stale_worker_does_not_consume_next_session():
+    release = threading.Event()
+    handled_by = []
+    dispatched = threading.Event()
+
+    def recognize(segment):
+        if segment == "lent":
+            release.wait(5.0)  # reconnaissance plus longue que le délai d'arrêt
+        handled_by.append((segment, threading.current_thread().ident))
+        return segment
+
+    def dispatch(result):
+        if result == "nouveau 19":
+            dispatched.set()
+
+    pipeline = VoicePipeline(recognize, dispatch, workers=1)
+    pipeline.start()
+    pipeline.submit("lent")
+    time.sleep(0.3)
+    stale = pipeline._threads[0].ident
+    pipeline.stop()  # le worker reste bloqué dans recognize()
+
+    pipeline.start()
+    release.set()
+    time.sleep(0.1)
+    for i in range(20):
+        pipeline.submit(f"nouveau {i}")
+        time.sleep(0.01)
+    assert dispatched.wait(3.0)
+    pipeline.stop()
+
+    stale_segments = [segment for segment, ident in handled_by if ident == stale and segment != "lent"]
+    assert stale_segments == []
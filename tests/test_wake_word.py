@@ -0,0 +1,50 @@
+import numpy as np
+
+from core.wake_word import WakeWordDetector, trim_to_speech
+
+RATE = 16000
+
+
+def word(seconds=0.5, pitch=180.0, seed=0):
+    """Pseudo-mot: voyelle modulée avec un glissement de hauteur"""
+    rng = np.random.default_rng(seed)
+    t = np.arange(int(RATE * seconds)) / RATE
+    sweep = pitch * (1 + 0.5 * t / seconds)
+    signal = np.sin(2 * np.pi * np.cumsum(sweep) / RATE) * (1 + np.sin(2 * np.pi * 6 * t))
+    signal *= np.sin(np.pi * t / seconds) * 6000
+    return (signal + rng.normal(0, 60, t.size)).astype(np.int16)
+
+
+def silence(seconds, seed=1):
+    return np.random.default_rng(seed).normal(0, 60, int(RATE * seconds)).astype(np.int16)
+
+
+def test_trim_removes_pre_roll_and_hangover():
+    segment = np.concatenate((silence(0.3), word(0.5), silence(0.6)))
+    trimmed = trim_to_speech(segment, RATE)
+    assert 0.4 < trimmed.size / RATE < 0.6
+
+
+def test_enrolled_template_excludes_silence(tmp_path):
+    detector = WakeWordDetector(RATE, template_dir=str(tmp_path))
+    segment = np.concatenate((silence(0.3), word(0.5), silence(0.6))).tobytes()
+    detector.enroll(segment)
+    frames = len(detector.templates[0])
+    assert frames < 65  # ~0.5 s de mot, pas 1.4 s de segment
+
+    reloaded = WakeWordDetector(RATE, template_dir=str(tmp_path))
+    assert len(reloaded.templates) == 1
+
+
+def test_detects_word_after_pre_roll(tmp_path):
+    detector = WakeWordDetector(RATE, template_dir=str(tmp_path))
+    for seed in range(3):
+        detector.enroll(np.concatenate((silence(0.3, seed), word(0.5, seed=seed), silence(0.6, seed))).tobytes())
+
+    spoken = np.concatenate((silence(0.3, 7), word(0.5, seed=7), silence(0.6, 7))).tobytes()
+    detected, _, end = detector.detect(spoken)
+    assert detected
+    assert 0.6 * RATE * 2 < end < 1.0 * RATE * 2
+
+    other = np.concatenate((silence(0.3, 8), word(0.5, pitch=420.0, seed=8)[::-1], silence(0.6, 8))).tobytes()
+    assert not detector.detect(other)[0]
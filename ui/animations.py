@@ -7,13 +7,33 @@ import random
 import math
 from PIL import Image, ImageDraw, ImageTk
 import time
+import itertools
+from ui.frame_scheduler import FrameScheduler
+from ui.render_policy import RenderQualityPolicy
+from ui.sprite_atlas import SpriteAtlas
+
+# Palette des particules et tailles possibles (pré-rendues dans l'atlas)
+PARTICLE_COLORS = ["#00FFFF", "#FF00FF", "#00FFAA", "#FFAA00"]
+PARTICLE_SIZES = [2, 3, 4, 5]
 
 class ZodiacAnimations:
-    def __init__(self, root):
+    def __init__(self, root, scheduler=None, game_mode=None):
         self.root = root
         self.canvas = None
         self.effects = []
         
+        # Toutes les animations passent par un planificateur unique
+        self.scheduler = scheduler or FrameScheduler(root)
+        self._effect_ids = itertools.count()
+        
+        # Mode économie: effets réduits sous charge ou en jeu
+        self.game_mode = game_mode
+        self.render_policy = None
+        
+        # Sprites pré-rendus une seule fois, partagés par tous les effets
+        self.sprites = SpriteAtlas(root)
+        self._pulse_frames = SpriteAtlas.pulse_frames()
+        
     def setup_canvas(self, parent):
         """Configure le canvas pour les animations"""
         self.canvas = ctk.CTkCanvas(
@@ -24,11 +44,56 @@ class ZodiacAnimations:
         self.canvas.place(x=0, y=0, relwidth=1, relheight=1)
         self.canvas.lower()  # Mettre en arrière-plan
         
+        # Construire l'atlas avant la première image
+        self.build_sprites()
+        
+    def build_sprites(self, pulse_color="#00FFFF"):
+        """Pré-rend les particules et les anneaux de pulsation"""
+        ring_frames = [
+            (radius, alpha, pulse_color)
+            for frames in self._pulse_frames
+            for radius, alpha in frames
+        ]
+        return self.sprites.build(
+            particle_colors=PARTICLE_COLORS,
+            particle_sizes=PARTICLE_SIZES,
+            ring_frames=ring_frames
+        )
+        
     def start_background_effects(self):
         """Démarre les effets de fond"""
         self.create_cyberpunk_grid()
         self.create_floating_particles()
         self.create_data_streams()
+        self.scheduler.start()
+        self.enable_low_power_mode()
+        
+    def enable_low_power_mode(self, monitor=None):
+        """Réduit automatiquement les effets quand le CPU est chargé ou qu'un jeu tourne"""
+        if self.render_policy is None:
+            if self.game_mode is None:
+                from media.game_mode import get_game_mode
+                self.game_mode = get_game_mode()
+            try:
+                # Fenêtre de Zodiac (handle Windows du cadre de la fenêtre Tk)
+                self.game_mode.exclude_window(int(self.canvas.winfo_toplevel().wm_frame(), 16))
+            except Exception:
+                pass
+            self.render_policy = RenderQualityPolicy(self.scheduler, monitor, self.game_mode)
+        self.render_policy.start()
+        
+    def disable_low_power_mode(self):
+        """Arrête l'adaptation et restaure tous les effets"""
+        if self.render_policy:
+            self.render_policy.stop()
+        
+    def get_animation_stats(self):
+        """Retourne les compteurs de coût des animations"""
+        return self.scheduler.get_stats()
+        
+    def _unique_name(self, prefix):
+        """Nom unique pour un effet ponctuel"""
+        return f"{prefix}_{next(self._effect_ids)}"
         
     def create_cyberpunk_grid(self):
         """Crée une grille cyberpunk animée"""
@@ -45,31 +110,29 @@ class ZodiacAnimations:
             grid_lines.append(line)
             
         # Animation de la grille
-        def animate_grid():
+        def animate_grid(dt):
             for line in grid_lines:
                 # Variation légère de l'opacité
                 current_color = self.canvas.itemcget(line, "fill")
                 if random.random() > 0.95:
                     new_color = "#00FFFF22" if "11" in current_color else "#00FFFF11"
                     self.canvas.itemconfig(line, fill=new_color)
-            self.root.after(1000, animate_grid)
             
-        animate_grid()
+        self.scheduler.register("grid", animate_grid, interval_ms=1000, priority=3)
         
     def create_floating_particles(self):
         """Crée des particules flottantes"""
-        colors = ["#00FFFF", "#FF00FF", "#00FFAA", "#FFAA00"]
-        
         for _ in range(30):
             x = random.randint(0, self.canvas.winfo_width())
             y = random.randint(0, self.canvas.winfo_height())
-            size = random.randint(2, 5)
-            color = random.choice(colors)
+            size = random.choice(PARTICLE_SIZES)
+            color = random.choice(PARTICLE_COLORS)
+            alpha = random.uniform(0.3, 0.8)
             
-            particle = self.canvas.create_oval(
-                x, y, x + size, y + size,
-                fill=color,
-                outline=""
+            particle = self.canvas.create_image(
+                x, y,
+                image=self.sprites.particle(color, size, alpha),
+                anchor="nw"
             )
             
             self.effects.append({
@@ -80,19 +143,24 @@ class ZodiacAnimations:
                 "dx": random.uniform(-0.3, 0.3),
                 "dy": random.uniform(-0.3, 0.3),
                 "color": color,
-                "alpha": random.uniform(0.3, 0.8)
+                "size": size,
+                "alpha": alpha,
+                "alpha_step": SpriteAtlas.quantize_alpha(alpha)
             })
             
-        self.animate_particles()
+        self.scheduler.register("particles", self.animate_particles, interval_ms=50, priority=2)
         
-    def animate_particles(self):
+    def animate_particles(self, dt=0.05):
         """Anime les particules"""
+        # Vitesse constante quelle que soit la fréquence réelle
+        step = dt / 0.05
         for effect in self.effects:
             if effect["type"] == "particle":
                 # Déplacer
-                self.canvas.move(effect["id"], effect["dx"], effect["dy"])
-                effect["x"] += effect["dx"]
-                effect["y"] += effect["dy"]
+                dx, dy = effect["dx"] * step, effect["dy"] * step
+                self.canvas.move(effect["id"], dx, dy)
+                effect["x"] += dx
+                effect["y"] += dy
                 
                 # Rebond sur les bords
                 if effect["x"] <= 0 or effect["x"] >= self.canvas.winfo_width():
@@ -104,7 +172,14 @@ class ZodiacAnimations:
                 effect["alpha"] += random.uniform(-0.02, 0.02)
                 effect["alpha"] = max(0.1, min(1.0, effect["alpha"]))
                 
-        self.root.after(50, self.animate_particles)
+                # Changer de sprite seulement quand le pas d'alpha change
+                alpha_step = SpriteAtlas.quantize_alpha(effect["alpha"])
+                if alpha_step != effect["alpha_step"]:
+                    effect["alpha_step"] = alpha_step
+                    self.canvas.itemconfig(
+                        effect["id"],
+                        image=self.sprites.particle(effect["color"], effect["size"], effect["alpha"])
+                    )
         
     def create_data_streams(self):
         """Crée des flux de données (effet Matrix)"""
@@ -130,22 +205,22 @@ class ZodiacAnimations:
                 "speed": speed
             })
             
-        self.animate_data_streams()
+        self.scheduler.register("data_streams", self.animate_data_streams, interval_ms=30, priority=2)
         
-    def animate_data_streams(self):
+    def animate_data_streams(self, dt=0.03):
         """Anime les flux de données"""
+        step = dt / 0.03
         for effect in self.effects:
             if effect["type"] == "stream":
                 # Déplacer vers le bas
-                self.canvas.move(effect["id"], 0, effect["speed"])
-                effect["y"] += effect["speed"]
+                dy = effect["speed"] * step
+                self.canvas.move(effect["id"], 0, dy)
+                effect["y"] += dy
                 
                 # Réinitialiser en haut si hors écran
                 if effect["y"] > self.canvas.winfo_height():
                     self.canvas.coords(effect["id"], effect["x"], 0, effect["x"], effect["length"])
                     effect["y"] = 0
-                    
-        self.root.after(30, self.animate_data_streams)
         
     def create_scan_effect(self, widget):
         """Crée un effet de scan sur un widget"""
@@ -158,15 +233,18 @@ class ZodiacAnimations:
             width=2
         )
         
-        def animate_scan():
+        def animate_scan(dt):
             current_y = self.canvas.coords(scan_line)[1]
             if current_y < y + height:
-                self.canvas.coords(scan_line, x, current_y + 5, x + width, current_y + 5)
-                self.root.after(10, animate_scan)
-            else:
-                self.canvas.delete(scan_line)
+                # 5 px toutes les 10 ms
+                new_y = current_y + 5 * max(1.0, dt / 0.01)
+                self.canvas.coords(scan_line, x, new_y, x + width, new_y)
+                return True
+            self.canvas.delete(scan_line)
+            return False
                 
-        animate_scan()
+        self.scheduler.register(self._unique_name("scan"), animate_scan, interval_ms=10, priority=1)
+        self.scheduler.start()
         
     def create_pulse_effect(self, widget, color="#00FFFF"):
         """Crée un effet de pulsation sur un widget"""
@@ -174,47 +252,38 @@ class ZodiacAnimations:
         width, height = widget.winfo_width(), widget.winfo_height()
         
         center_x, center_y = x + width//2, y + height//2
-        max_radius = max(width, height) // 2
         
+        # Chaque cercle concentrique parcourt ses images pré-rendues (rayon, alpha)
         circles = []
-        
-        def create_circle(radius, alpha):
-            circle = self.canvas.create_oval(
-                center_x - radius, center_y - radius,
-                center_x + radius, center_y + radius,
-                outline=color,
-                width=2
+        for frames in self._pulse_frames:
+            radius, alpha = frames[0]
+            circle = self.canvas.create_image(
+                center_x, center_y,
+                image=self.sprites.ring(radius, alpha, color)
             )
-            circles.append((circle, radius, alpha))
-            
-        # Créer plusieurs cercles concentriques
-        for i in range(3):
-            create_circle(10 + i*20, 0.5 - i*0.15)
+            circles.append({"id": circle, "frames": frames, "frame": 0, "progress": 0.0})
             
-        def animate_pulse():
-            for i, (circle, radius, alpha) in enumerate(circles):
-                # Agrandir le cercle
-                new_radius = radius + 2
-                new_alpha = alpha - 0.05
+        def animate_pulse(dt):
+            # Une image pré-rendue toutes les 30 ms, même si le planificateur prend du retard
+            step = dt / 0.03
+            for circle in circles:
+                # Agrandir le cercle et l'estomper
+                circle["progress"] += step
+                circle["frame"] = int(circle["progress"])
                 
-                if new_alpha > 0:
-                    self.canvas.coords(
-                        circle,
-                        center_x - new_radius, center_y - new_radius,
-                        center_x + new_radius, center_y + new_radius
-                    )
-                    circles[i] = (circle, new_radius, new_alpha)
+                if circle["frame"] < len(circle["frames"]):
+                    radius, alpha = circle["frames"][circle["frame"]]
+                    self.canvas.itemconfig(circle["id"], image=self.sprites.ring(radius, alpha, color))
                 else:
-                    self.canvas.delete(circle)
-                    circles[i] = None
+                    self.canvas.delete(circle["id"])
                     
-            # Nettoyer les cercles supprimés
-            circles[:] = [c for c in circles if c is not None]
+            # Nettoyer les cercles terminés
+            circles[:] = [c for c in circles if c["frame"] < len(c["frames"])]
             
-            if circles:
-                self.root.after(30, animate_pulse)
+            return bool(circles)
                 
-        animate_pulse()
+        self.scheduler.register(self._unique_name("pulse"), animate_pulse, interval_ms=30, priority=1)
+        self.scheduler.start()
         
     def create_typing_effect(self, label, text, speed=50):
         """Effet de frappe pour le texte"""
@@ -252,10 +321,11 @@ class ZodiacAnimations:
             )
             scan_lines.append(line)
             
-        def animate_transition():
-            # Animer les lignes
+        def animate_transition(dt):
+            # Animer les lignes (5 px toutes les 16 ms)
+            offset = 5 * dt / 0.016
             for line in scan_lines:
-                self.canvas.move(line, 0, 5)
+                self.canvas.move(line, 0, offset)
                 
             # Vérifier si terminé
             coords = self.canvas.coords(scan_lines[0])
@@ -265,7 +335,12 @@ class ZodiacAnimations:
                 for line in scan_lines:
                     self.canvas.delete(line)
                 callback()
-            else:
-                self.root.after(16, animate_transition)
+                return False
+            return True
                 
-        animate_transition()
\ No newline at end of file
+        # La transition doit toujours aller au bout: jamais sautée
+        self.scheduler.register(
+            self._unique_name("transition"), animate_transition,
+            interval_ms=16, priority=0, degradable=False
+        )
+        self.scheduler.start()
\ No newline at end of file
@@ -0,0 +1,261 @@
+"""
+Planificateur d'images pour Zodiac OS
+Une seule boucle root.after pour toutes les animations, avec budget par image
+Auteur: tvcraft01
+"""
+import time
+
+
+class FrameScheduler:
+    """Fait tourner toutes les animations enregistrées dans une boucle unique"""
+
+    # Nombre d'images en retard consécutives avant de dégrader les effets
+    LATE_FRAMES_BEFORE_DEGRADE = 5
+    # Nombre d'images à l'heure consécutives avant de restaurer un niveau
+    ON_TIME_FRAMES_BEFORE_RESTORE = 60
+    MAX_DEGRADE_LEVEL = 3
+    # Intervalle de vérification quand la fenêtre est cachée (ms)
+    PAUSED_POLL_MS = 250
+
+    def __init__(self, root, fps=30, budget_ms=None):
+        """
+        Initialise le planificateur
+
+        Args:
+            root: Fenêtre Tk/CTk qui porte la boucle
+            fps: Fréquence d'images cible
+            budget_ms: Temps maximum consacré aux effets par image
+        """
+        self.root = root
+        self.frame_interval = max(1, int(1000 / fps))
+        self.budget_ms = budget_ms if budget_ms is not None else self.frame_interval * 0.5
+
+        self.effects = {}
+        self.running = False
+        self.paused = False
+        self.degrade_level = 0
+
+        # Qualité imposée de l'extérieur (mode économie d'énergie)
+        self.quality_multiplier = 1
+        self.max_priority = None
+
+        self.frame_count = 0
+        self.late_frames = 0
+        self._late_streak = 0
+        self._on_time_streak = 0
+        self._last_frame = None
+        self._after_id = None
+
+        # Pause automatique quand la fenêtre est minimisée / cachée
+        self.root.bind("<Unmap>", self._on_unmap, add="+")
+        self.root.bind("<Map>", self._on_map, add="+")
+
+    def register(self, name, callback, interval_ms=None, priority=1, degradable=True):
+        """
+        Enregistre une animation
+
+        Args:
+            name: Nom unique de l'effet (sert aux compteurs)
+            callback: Fonction appelée avec dt (secondes écoulées depuis son dernier
+                passage). Retourner False désinscrit l'effet.
+            interval_ms: Intervalle souhaité (par défaut: chaque image)
+            priority: 0 = essentiel, plus grand = plus décoratif
+            degradable: Peut être sauté ou ralenti quand les images sont en retard
+        """
+        now = time.perf_counter()
+        self.effects[name] = {
+            "callback": callback,
+            "interval": interval_ms or self.frame_interval,
+            "priority": priority,
+            "degradable": degradable,
+            "enabled": True,
+            "next_run": now,
+            "last_run": now,
+            "calls": 0,
+            "skipped": 0,
+            "total_ms": 0.0,
+            "max_ms": 0.0
+        }
+        return name
+
+    def unregister(self, name):
+        """Retire une animation"""
+        self.effects.pop(name, None)
+
+    def set_interval(self, name, interval_ms):
+        """Change l'intervalle d'une animation"""
+        if name in self.effects:
+            self.effects[name]["interval"] = max(1, int(interval_ms))
+
+    def set_enabled(self, name, enabled):
+        """Active/désactive une animation sans la désinscrire"""
+        if name in self.effects:
+            effect = self.effects[name]
+            if enabled and not effect["enabled"]:
+                # Éviter un énorme dt au réveil
+                effect["last_run"] = time.perf_counter()
+            effect["enabled"] = enabled
+
+    def set_quality(self, interval_multiplier=1, max_priority=None):
+        """
+        Limite la qualité des effets décoratifs
+
+        Args:
+            interval_multiplier: Facteur appliqué aux intervalles des effets dégradables
+            max_priority: Les effets dégradables de priorité supérieure sont suspendus
+                (None = aucun effet suspendu)
+        """
+        self.quality_multiplier = max(1, interval_multiplier)
+        self.max_priority = max_priority
+
+    def _is_suspended(self, effect):
+        """Vérifie si un effet est suspendu par la politique de qualité"""
+        return (effect["degradable"] and self.max_priority is not None and
+                effect["priority"] > self.max_priority)
+
+    def start(self):
+        """Démarre la boucle"""
+        if self.running:
+            return
+        self.running = True
+        self._last_frame = time.perf_counter()
+        self._after_id = self.root.after(self.frame_interval, self._tick)
+
+    def stop(self):
+        """Arrête la boucle"""
+        self.running = False
+        if self._after_id is not None:
+            try:
+                self.root.after_cancel(self._after_id)
+            except Exception:
+                pass
+            self._after_id = None
+
+    def _on_unmap(self, event):
+        """La fenêtre a été minimisée ou cachée"""
+        if event.widget is self.root:
+            self.paused = True
+
+    def _on_map(self, event):
+        """La fenêtre est de nouveau visible"""
+        if event.widget is self.root:
+            self.paused = False
+
+    def _is_hidden(self):
+        """Vérifie si la fenêtre est minimisée / cachée"""
+        try:
+            return self.paused or self.root.state() in ("iconic", "withdrawn")
+        except Exception:
+            return True
+
+    def _effective_interval(self, effect):
+        """Intervalle tenant compte du niveau de dégradation"""
+        if effect["degradable"]:
+            return effect["interval"] * (2 ** self.degrade_level) * self.quality_multiplier
+        return effect["interval"]
+
+    def _update_degrade_level(self, frame_delay_ms):
+        """Dégrade ou restaure les effets selon la régularité des images"""
+        if frame_delay_ms > self.frame_interval * 1.5:
+            self.late_frames += 1
+            self._late_streak += 1
+            self._on_time_streak = 0
+            if (self._late_streak >= self.LATE_FRAMES_BEFORE_DEGRADE and
+                    self.degrade_level < self.MAX_DEGRADE_LEVEL):
+                self.degrade_level += 1
+                self._late_streak = 0
+        else:
+            self._on_time_streak += 1
+            self._late_streak = 0
+            if (self._on_time_streak >= self.ON_TIME_FRAMES_BEFORE_RESTORE and
+                    self.degrade_level > 0):
+                self.degrade_level -= 1
+                self._on_time_streak = 0
+
+    def _tick(self):
+        """Une image: exécute les effets dus dans la limite du budget"""
+        if not self.running:
+            return
+
+        if self._is_hidden():
+            self._last_frame = None
+            self._after_id = self.root.after(self.PAUSED_POLL_MS, self._tick)
+            return
+
+        frame_start = time.perf_counter()
+        if self._last_frame is not None:
+            self._update_degrade_level((frame_start - self._last_frame) * 1000)
+        self._last_frame = frame_start
+        self.frame_count += 1
+
+        finished = []
+        ordered = sorted(self.effects.items(), key=lambda item: item[1]["priority"])
+
+        for name, effect in ordered:
+            if not effect["enabled"]:
+                continue
+
+            now = time.perf_counter()
+            if self._is_suspended(effect):
+                # Repartir d'un dt normal à la reprise
+                effect["last_run"] = now
+                continue
+
+            if now < effect["next_run"]:
+                continue
+
+            # Budget dépassé: on saute les effets décoratifs jusqu'à l'image suivante
+            spent_ms = (now - frame_start) * 1000
+            if effect["degradable"] and spent_ms > self.budget_ms:
+                effect["skipped"] += 1
+                continue
+
+            dt = now - effect["last_run"]
+            try:
+                keep = effect["callback"](dt)
+            except Exception as e:
+                print(f"⚠️ Animation '{name}' arrêtée: {e}")
+                keep = False
+
+            end = time.perf_counter()
+            cost_ms = (end - now) * 1000
+            effect["calls"] += 1
+            effect["total_ms"] += cost_ms
+            effect["max_ms"] = max(effect["max_ms"], cost_ms)
+            effect["last_run"] = now
+            effect["next_run"] = now + self._effective_interval(effect) / 1000
+
+            if keep is False:
+                finished.append(name)
+
+        for name in finished:
+            self.unregister(name)
+
+        elapsed_ms = (time.perf_counter() - frame_start) * 1000
+        delay = max(1, int(self.frame_interval - elapsed_ms))
+        self._after_id = self.root.after(delay, self._tick)
+
+    def get_stats(self):
+        """Retourne les compteurs de coût par effet"""
+        effects = {}
+        for name, effect in self.effects.items():
+            calls = effect["calls"]
+            effects[name] = {
+                "calls": calls,
+                "skipped": effect["skipped"],
+                "total_ms": round(effect["total_ms"], 3),
+                "avg_ms": round(effect["total_ms"] / calls, 3) if calls else 0.0,
+                "max_ms": round(effect["max_ms"], 3),
+                "interval_ms": self._effective_interval(effect),
+                "enabled": effect["enabled"],
+                "suspended": self._is_suspended(effect)
+            }
+
+        return {
+            "frames": self.frame_count,
+            "late_frames": self.late_frames,
+            "degrade_level": self.degrade_level,
+            "quality_multiplier": self.quality_multiplier,
+            "paused": self._is_hidden() if self.running else self.paused,
+            "effects": effects
+        }
@@ -1,13 +1,13 @@
 # ui/main_window.py - VERSION SIMPLIFIÉE MOBILE
 import customtkinter as ctk
-from ui.tabs.assistant_tab import AssistantTab
-from ui.tabs.vault_tab import VaultTab
-from ui.tabs.dashboard_tab import DashboardTab
 
 class MainWindow:
     """Fenêtre principale MOBILE SIMPLIFIÉE"""
     
-    def __init__(self, assistant=None, voice_engine=None, mobile_mode=True):
+    # Délai avant de pré-construire les onglets cachés (ms)
+    PREWARM_DELAY_MS = 300
+    
+    def __init__(self, assistant=None, voice_engine=None, mobile_mode=True, prewarm=True):
         self.assistant = assistant
         self.voice_engine = voice_engine
         self.mobile_mode = mobile_mode
@@ -17,6 +17,10 @@ class MainWindow:
         self._setup_window()
         self._setup_ui()
         
+        # Pré-construire les autres onglets une fois la fenêtre affichée
+        if prewarm:
+            self.root.after(self.PREWARM_DELAY_MS, self.prewarm_tabs)
+        
     def _setup_window(self):
         """Configuration mobile simple"""
         ctk.set_appearance_mode("dark")
@@ -50,17 +54,56 @@ class MainWindow:
         self.content_frame.pack(fill="both", expand=True, padx=0, pady=0)
         self.content_frame.pack_propagate(False)  # Garde la hauteur
         
-        # Créer les onglets MAIS NE PAS LES AFFICHER TOUT DE SUITE
-        self.tabs = {
-            "assistant": AssistantTab(self.content_frame, self.assistant, self.voice_engine),
-            "vault": VaultTab(self.content_frame),
-            "dashboard": DashboardTab(self.content_frame)
+        # Les onglets sont construits au premier affichage
+        self.tab_factories = {
+            "assistant": self._build_assistant_tab,
+            "vault": self._build_vault_tab,
+            "dashboard": self._build_dashboard_tab
         }
+        self.tabs = {}
         
         # Afficher seulement l'assistant
-        self.tabs["assistant"].pack(fill="both", expand=True)
+        self._get_tab("assistant").pack(fill="both", expand=True)
         self.current_tab = "assistant"
         
+    def _build_assistant_tab(self):
+        from ui.tabs.assistant_tab import AssistantTab
+        return AssistantTab(self.content_frame, self.assistant, self.voice_engine)
+        
+    def _build_vault_tab(self):
+        from ui.tabs.vault_tab import VaultTab
+        return VaultTab(self.content_frame)
+        
+    def _build_dashboard_tab(self):
+        from ui.tabs.dashboard_tab import DashboardTab
+        return DashboardTab(self.content_frame)
+        
+    def _get_tab(self, tab_key):
+        """Retourne un onglet, en le construisant au premier accès"""
+        if tab_key not in self.tabs:
+            factory = self.tab_factories.get(tab_key)
+            if factory is None:
+                return None
+            self.tabs[tab_key] = factory()
+        return self.tabs[tab_key]
+        
+    def prewarm_tabs(self):
+        """Construit les onglets restants, un par cycle idle, sans bloquer l'interface"""
+        # Préparer l'assistant et la voix hors du thread de l'interface
+        assistant_tab = self.tabs.get("assistant")
+        if assistant_tab is not None and hasattr(assistant_tab, "prewarm"):
+            assistant_tab.prewarm()
+            
+        pending = [key for key in self.tab_factories if key not in self.tabs]
+        
+        def build_next():
+            if not pending:
+                return
+            self._get_tab(pending.pop(0))
+            self.root.after_idle(build_next)
+            
+        self.root.after_idle(build_next)
+        
     def _create_navigation(self):
         """Navigation bas - SIMPLE"""
         # Frame de navigation (10% de l'écran)
@@ -109,11 +152,15 @@ class MainWindow:
         if tab_key == self.current_tab:
             return
             
+        new_tab = self._get_tab(tab_key)
+        if new_tab is None:
+            return
+            
         # 1. Cacher l'onglet actuel
         self.tabs[self.current_tab].pack_forget()
         
         # 2. Afficher le nouveau
-        self.tabs[tab_key].pack(fill="both", expand=True)
+        new_tab.pack(fill="both", expand=True)
         
         # 3. Mettre à jour le style des boutons
         for btn, key in self.nav_buttons:
@@ -0,0 +1,135 @@
+"""
+Politique de qualité d'affichage pour Zodiac OS
+Réduit ou suspend les animations décoratives quand la machine est chargée
+Auteur: tvcraft01
+"""
+import queue
+import threading
+
+
+class RenderQualityPolicy:
+    """Ajuste le planificateur d'images selon la charge CPU et le mode jeu"""
+
+    # Réglages par niveau: (multiplicateur d'intervalle, priorité max encore animée)
+    QUALITY_SETTINGS = {
+        "full": (1, None),
+        "reduced": (3, 2),
+        "off": (4, 1)
+    }
+
+    # Fréquence à laquelle le planificateur applique les niveaux demandés
+    APPLY_INTERVAL_MS = 250
+
+    def __init__(self, scheduler, monitor=None, game_mode=None,
+                 high_cpu=75.0, critical_cpu=90.0, low_cpu=50.0, check_interval=2.0):
+        """
+        Initialise la politique
+
+        Args:
+            scheduler: FrameScheduler à piloter
+            monitor: SystemMonitor (échantillonneur de métriques)
+            game_mode: GameMode dont l'état suspend les effets
+            high_cpu: CPU (%) à partir duquel les effets sont ralentis
+            critical_cpu: CPU (%) à partir duquel les effets décoratifs sont suspendus
+            low_cpu: CPU (%) sous lequel la qualité complète est restaurée
+            check_interval: Intervalle d'échantillonnage en secondes
+        """
+        if monitor is None:
+            from core.system_monitor import SystemMonitor
+            monitor = SystemMonitor()
+
+        self.scheduler = scheduler
+        self.monitor = monitor
+        self.game_mode = game_mode
+        self.high_cpu = high_cpu
+        self.critical_cpu = critical_cpu
+        self.low_cpu = low_cpu
+        self.check_interval = check_interval
+
+        self.level = "full"
+        self.last_cpu = None
+        self.running = False
+        self._stop_event = threading.Event()
+        self._thread = None
+        # Niveaux demandés par le thread d'échantillonnage, appliqués par le planificateur
+        self._pending = queue.Queue()
+
+    def start(self):
+        """Démarre l'échantillonnage en arrière-plan"""
+        if self.running:
+            return
+        self.running = True
+        self._stop_event.clear()
+        self.scheduler.register("render_policy", self._apply_pending,
+                                interval_ms=self.APPLY_INTERVAL_MS, priority=0, degradable=False)
+        self._thread = threading.Thread(target=self._sampling_loop, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """Arrête l'échantillonnage et restaure la qualité complète"""
+        self.running = False
+        self._stop_event.set()
+        self._pending.put("full")
+
+    def _sampling_loop(self):
+        """Boucle d'échantillonnage (thread séparé)"""
+        while not self._stop_event.is_set():
+            level = self.evaluate()
+            if level != self.level and not self._stop_event.is_set():
+                self._pending.put(level)
+            self._stop_event.wait(self.check_interval)
+
+    def evaluate(self):
+        """Calcule le niveau de qualité souhaité à partir des métriques"""
+        if self.game_mode is not None:
+            try:
+                if self.game_mode.is_heavy_load():
+                    return "off"
+            except Exception:
+                pass
+
+        info = self.monitor.get_system_info()
+        cpu = info.get("cpu_percent")
+        if cpu is None:
+            return self.level
+        self.last_cpu = cpu
+
+        if cpu >= self.critical_cpu:
+            return "off"
+        if cpu >= self.high_cpu:
+            # Ne pas remonter de "off" à "reduced" tant que la charge reste haute
+            return "off" if self.level == "off" else "reduced"
+        if cpu <= self.low_cpu:
+            return "full"
+
+        # Zone d'hystérésis: garder le niveau actuel
+        return self.level
+
+    def _apply_pending(self, dt):
+        """Tâche du planificateur: applique le dernier niveau demandé (thread de l'interface)"""
+        level = None
+        while True:
+            try:
+                level = self._pending.get_nowait()
+            except queue.Empty:
+                break
+        if level is not None:
+            self.apply(level)
+        # Une fois arrêtée, la tâche se désinscrit après avoir restauré la qualité
+        return self.running
+
+    def apply(self, level):
+        """Applique un niveau de qualité au planificateur"""
+        interval_multiplier, max_priority = self.QUALITY_SETTINGS[level]
+        self.scheduler.set_quality(interval_multiplier, max_priority)
+        if level != self.level:
+            print(f"🎞️ Qualité des animations: {self.level} → {level}")
+        self.level = level
+
+    def get_status(self):
+        """Retourne l'état de la politique"""
+        return {
+            "level": self.level,
+            "cpu_percent": self.last_cpu,
+            "game_mode": bool(self.game_mode and self.game_mode.active)
+        }
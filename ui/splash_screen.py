@@ -4,20 +4,30 @@ Inspiré de: https://www.youtube.com/watch?v=yRA5jS7q05A
 Auteur: tvcraft01
 """
 import customtkinter as ctk
-import threading
 import time
 import sys
 import os
-from PIL import Image, ImageTk, ImageDraw, ImageFont
 import random
 import math
+import queue
+from ui.frame_scheduler import FrameScheduler
+from ui.sprite_atlas import SpriteAtlas
 
 class EvaSplashScreen:
-    def __init__(self, on_complete_callback):
+    def __init__(self, on_complete_callback, orchestrator=None):
         """
         Initialise le splash screen style EVA AI
+        
+        Args:
+            on_complete_callback: Appelé quand le chemin critique du démarrage est terminé
+            orchestrator: StartupOrchestrator à exécuter (par défaut: tâches de Zodiac)
         """
         self.on_complete = on_complete_callback
+        if orchestrator is None:
+            from core.startup import build_default_startup
+            orchestrator = build_default_startup()
+        self.orchestrator = orchestrator
+        self._closing = False
         self.root = ctk.CTk()
         
         # Configuration de la fenêtre
@@ -54,12 +64,22 @@ class EvaSplashScreen:
         self.hologram_effects = []
         self.terminal_text = []
         
+        # Planificateur unique pour toutes les animations
+        self.scheduler = FrameScheduler(self.root)
+        
+        # Sprites pré-rendus (particules à chaque pas d'alpha)
+        self.sprites = SpriteAtlas(self.root)
+        self.sprites.build(particle_colors=[self.primary_color], particle_sizes=[1, 2, 3])
+        
         # Créer le contenu
         self.setup_ui()
         
         # Démarrer les animations
         self.start_animations()
         
+        # Lancer la vraie initialisation pendant l'apparition
+        self.start_loading_sequence()
+        
         # Faire apparaître la fenêtre
         self.fade_in()
         
@@ -234,10 +254,11 @@ class EvaSplashScreen:
             x = random.randint(0, 900)
             y = random.randint(0, 600)
             size = random.randint(1, 3)
-            particle = self.canvas.create_oval(
-                x, y, x + size, y + size,
-                fill=self.primary_color,
-                outline=""
+            alpha = random.uniform(0.3, 0.8)
+            particle = self.canvas.create_image(
+                x, y,
+                image=self.sprites.particle(self.primary_color, size, alpha),
+                anchor="nw"
             )
             self.particles.append({
                 "id": particle,
@@ -245,36 +266,42 @@ class EvaSplashScreen:
                 "y": y,
                 "dx": random.uniform(-0.5, 0.5),
                 "dy": random.uniform(-0.5, 0.5),
-                "alpha": random.uniform(0.3, 0.8)
+                "size": size,
+                "alpha": alpha,
+                "alpha_step": SpriteAtlas.quantize_alpha(alpha)
             })
             
     def fade_in(self):
         """Animation d'apparition en fondu"""
         def fade(alpha):
+            # Le démarrage peut finir avant la fin du fondu
+            if self._closing:
+                return
             if alpha <= 1.0:
                 self.root.attributes('-alpha', alpha)
                 self.root.after(20, lambda: fade(alpha + 0.05))
-            else:
-                self.start_loading_sequence()
                 
         fade(0.0)
         
     def start_animations(self):
         """Démarre toutes les animations"""
-        self.animate_particles()
-        self.animate_scan_lines()
-        self.animate_cursor()
-        self.animate_logo()
+        self.scheduler.register("particles", self.animate_particles, interval_ms=50, priority=2)
+        self.scheduler.register("scan_lines", self.animate_scan_lines, interval_ms=30, priority=2)
+        self.scheduler.register("cursor", self.animate_cursor, interval_ms=500, priority=1)
+        self.scheduler.register("logo", self.animate_logo, interval_ms=1000, priority=3)
+        self.scheduler.start()
         
-    def animate_particles(self):
+    def animate_particles(self, dt=0.05):
         """Anime les particules"""
+        step = dt / 0.05
         for particle in self.particles:
             # Déplacer la particule
-            self.canvas.move(particle["id"], particle["dx"], particle["dy"])
+            dx, dy = particle["dx"] * step, particle["dy"] * step
+            self.canvas.move(particle["id"], dx, dy)
             
             # Mettre à jour la position
-            particle["x"] += particle["dx"]
-            particle["y"] += particle["dy"]
+            particle["x"] += dx
+            particle["y"] += dy
             
             # Rebond sur les bords
             if particle["x"] <= 0 or particle["x"] >= 900:
@@ -286,89 +313,83 @@ class EvaSplashScreen:
             particle["alpha"] += random.uniform(-0.02, 0.02)
             particle["alpha"] = max(0.1, min(1.0, particle["alpha"]))
             
-        self.root.after(50, self.animate_particles)
-        
-    def animate_scan_lines(self):
+            # Changer de sprite seulement quand le pas d'alpha change
+            alpha_step = SpriteAtlas.quantize_alpha(particle["alpha"])
+            if alpha_step != particle["alpha_step"]:
+                particle["alpha_step"] = alpha_step
+                self.canvas.itemconfig(
+                    particle["id"],
+                    image=self.sprites.particle(self.primary_color, particle["size"], particle["alpha"])
+                )
+        
+    def animate_scan_lines(self, dt=0.03):
         """Anime les lignes de scan"""
+        step = dt / 0.03
         for line in self.scan_lines:
             # Déplacer la ligne
-            self.canvas.move(line["id"], 0, line["speed"])
-            line["y"] += line["speed"]
+            dy = line["speed"] * step
+            self.canvas.move(line["id"], 0, dy)
+            line["y"] += dy
             
             # Réinitialiser si hors écran
             if line["y"] > 600:
                 self.canvas.coords(line["id"], 0, 0, 900, 0)
                 line["y"] = 0
-                
-        self.root.after(30, self.animate_scan_lines)
         
-    def animate_cursor(self):
+    def animate_cursor(self, dt=None):
         """Fait clignoter le curseur du terminal"""
         current_color = self.cursor_label.cget("text_color")
         new_color = self.bg_color if current_color == self.primary_color else self.primary_color
         self.cursor_label.configure(text_color=new_color)
-        self.root.after(500, self.animate_cursor)
         
-    def animate_logo(self):
+    def animate_logo(self, dt=None):
         """Animation du logo avec effet glow"""
         colors = [self.primary_color, self.accent_color, self.secondary_color]
         current_color = self.logo_label.cget("text_color")
         new_color = random.choice([c for c in colors if c != current_color])
         self.logo_label.configure(text_color=new_color)
-        self.root.after(1000, self.animate_logo)
         
     def start_loading_sequence(self):
-        """Démarre la séquence de chargement"""
-        loading_steps = [
-            ("INITIALIZING CORE SYSTEMS...", 0.1),
-            ("LOADING NEURAL NETWORK...", 0.2),
-            ("CONNECTING TO VOICE ENGINE...", 0.35),
-            ("BOOTING AI MODULES...", 0.5),
-            ("CALIBRATING SENSORS...", 0.65),
-            ("LOADING INTERFACE MODULES...", 0.8),
-            ("SYNCHRONIZING DATABASES...", 0.9),
-            ("SYSTEM READY...", 1.0)
-        ]
-        
-        # Démarrer l'animation dans un thread séparé
-        thread = threading.Thread(target=self.run_loading_steps, args=(loading_steps,), daemon=True)
-        thread.start()
-        
-    def run_loading_steps(self, steps):
-        """Exécute les étapes de chargement"""
-        for step_text, target_progress in steps:
-            # Mettre à jour le statut
-            self.root.after(0, self.status_label.configure, {"text": f"> {step_text}"})
-            
-            # Ajouter au terminal
-            self.root.after(0, self.add_terminal_text, f"[{time.strftime('%H:%M:%S')}] {step_text}")
-            
-            # Animer la progression
-            current_progress = self.get_current_progress()
-            steps_count = 15
-            step_increment = (target_progress - current_progress) / steps_count
-            
-            for i in range(steps_count):
-                new_progress = current_progress + (step_increment * (i + 1))
-                self.root.after(0, self.update_progress, new_progress)
-                time.sleep(0.1)  # Vitesse d'animation
-            
-            # Petite pause entre les étapes
-            time.sleep(0.3)
-            
-        # Chargement terminé
-        self.root.after(0, self.status_label.configure, {"text": "> SYSTEM READY. LAUNCHING ZODIAC OS..."})
-        self.root.after(0, self.add_terminal_text, f"[{time.strftime('%H:%M:%S')}] SYSTEM READY. LAUNCHING...")
-        time.sleep(1.5)
-        
-        # Fermer le splash screen
-        self.root.after(0, self.close_splash)
-        
-    def get_current_progress(self):
-        """Retourne la progression actuelle"""
-        width = self.progress_fill.winfo_width()
-        max_width = self.progress_bg.winfo_width() - 4
-        return width / max_width if max_width > 0 else 0
+        """Démarre l'initialisation réelle et suit sa progression"""
+        self.add_terminal_text(f"[{time.strftime('%H:%M:%S')}] INITIALIZING CORE SYSTEMS...")
+        
+        # Les rappels arrivent depuis les threads de démarrage: ils passent par
+        # une file lue dans le thread Tk (Tk n'est pas thread-safe)
+        self._startup_events = queue.Queue()
+        self.orchestrator.run(
+            on_progress=lambda progress, message: self._startup_events.put((self._on_startup_progress, (progress, message))),
+            on_ready=lambda: self._startup_events.put((self._on_startup_ready, ()))
+        )
+        self._poll_startup_events()
+        
+    def _poll_startup_events(self):
+        """Traite les événements de démarrage en attente (thread Tk)"""
+        while not self._closing:
+            try:
+                handler, args = self._startup_events.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                handler(*args)
+            except Exception as e:
+                print(f"⚠️ Erreur splash: {e}")
+        if not self._closing:
+            self.root.after(30, self._poll_startup_events)
+        
+    def _on_startup_progress(self, progress, message):
+        """Une tâche de démarrage vient de se terminer"""
+        self.status_label.configure(text=f"> {message}")
+        self.add_terminal_text(f"[{time.strftime('%H:%M:%S')}] {message}")
+        self.update_progress(progress)
+        
+    def _on_startup_ready(self):
+        """Chemin critique terminé: passer la main à la fenêtre principale"""
+        if self._closing:
+            return
+        report = self.orchestrator.get_report()
+        self.status_label.configure(text="> SYSTEM READY. LAUNCHING ZODIAC OS...")
+        self.add_terminal_text(f"[{time.strftime('%H:%M:%S')}] SYSTEM READY ({report['elapsed_ms']:.0f} ms). LAUNCHING...")
+        self.close_splash()
         
     def update_progress(self, progress):
         """Met à jour la barre de progression"""
@@ -402,16 +423,19 @@ class EvaSplashScreen:
         
     def close_splash(self):
         """Ferme le splash screen avec animation"""
-        # Animation de fondu
+        self._closing = True
+        
+        # Animation de fondu (repart de l'opacité actuelle)
         def fade_out(alpha):
             if alpha >= 0:
                 self.root.attributes('-alpha', alpha)
-                self.root.after(20, lambda: fade_out(alpha - 0.05))
+                self.root.after(20, lambda: fade_out(alpha - 0.1))
             else:
+                self.scheduler.stop()
                 self.root.destroy()
                 self.on_complete()
                 
-        fade_out(1.0)
+        fade_out(float(self.root.attributes('-alpha')))
         
     def run(self):
         """Lance le splash screen"""
@@ -421,6 +445,7 @@ class EvaSplashScreen:
 if __name__ == "__main__":
     def on_complete():
         print("🚀 Chargement terminé !")
+        print(splash.orchestrator.get_report())
         sys.exit(0)
         
     print("🎬 Lancement du splash screen EVA AI...")
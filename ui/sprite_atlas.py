@@ -0,0 +1,159 @@
+"""
+Atlas de sprites pour Zodiac OS
+Pré-rend une fois les anneaux, particules et halos (à chaque pas d'alpha)
+pour que les animations ne fassent que déplacer des éléments du canvas
+Auteur: tvcraft01
+"""
+from PIL import Image, ImageDraw, ImageColor, ImageTk
+
+
+class SpriteAtlas:
+    """Cache de PhotoImage pré-rendues, partagé par tous les effets d'une fenêtre"""
+
+    # Nombre de niveaux d'opacité pré-rendus (0.1, 0.2, ... 1.0)
+    ALPHA_STEPS = 10
+
+    # Images PIL partagées entre fenêtres (le rendu n'a lieu qu'une fois par processus)
+    _image_cache = {}
+
+    def __init__(self, master=None):
+        """
+        Initialise l'atlas
+
+        Args:
+            master: Fenêtre Tk propriétaire des PhotoImage
+        """
+        self.master = master
+        self._photos = {}
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def quantize_alpha(cls, alpha):
+        """Ramène une opacité (0.0 - 1.0) au pas pré-rendu le plus proche"""
+        step = int(round(alpha * cls.ALPHA_STEPS))
+        return max(1, min(cls.ALPHA_STEPS, step))
+
+    @staticmethod
+    def _rgba(color, alpha_step):
+        """Couleur hexadécimale + pas d'alpha -> tuple RGBA"""
+        r, g, b = ImageColor.getrgb(color)[:3]
+        return (r, g, b, int(255 * alpha_step / SpriteAtlas.ALPHA_STEPS))
+
+    def _get(self, key, render):
+        """Retourne la PhotoImage d'une clé, en la rendant au premier accès"""
+        photo = self._photos.get(key)
+        if photo is not None:
+            self.hits += 1
+            return photo
+
+        self.misses += 1
+        image = self._image_cache.get(key)
+        if image is None:
+            image = render()
+            self._image_cache[key] = image
+
+        photo = ImageTk.PhotoImage(image, master=self.master)
+        self._photos[key] = photo
+        return photo
+
+    def particle(self, color, size, alpha=1.0):
+        """Particule pleine de diamètre size"""
+        step = self.quantize_alpha(alpha)
+
+        def render():
+            image = Image.new("RGBA", (size, size), (0, 0, 0, 0))
+            ImageDraw.Draw(image).ellipse((0, 0, size - 1, size - 1), fill=self._rgba(color, step))
+            return image
+
+        return self._get(("particle", color, size, step), render)
+
+    def ring(self, radius, alpha=1.0, color="#00FFFF", width=2):
+        """Anneau de rayon radius (image de côté 2 * radius)"""
+        step = self.quantize_alpha(alpha)
+
+        def render():
+            side = radius * 2 + width
+            image = Image.new("RGBA", (side, side), (0, 0, 0, 0))
+            ImageDraw.Draw(image).ellipse(
+                (0, 0, side - 1, side - 1),
+                outline=self._rgba(color, step),
+                width=width
+            )
+            return image
+
+        return self._get(("ring", color, radius, step, width), render)
+
+    def glow(self, radius, alpha=1.0, color="#00FFFF"):
+        """Halo radial dégradé du centre vers le bord"""
+        step = self.quantize_alpha(alpha)
+
+        def render():
+            side = radius * 2
+            image = Image.new("RGBA", (side, side), (0, 0, 0, 0))
+            draw = ImageDraw.Draw(image)
+            r, g, b, a = self._rgba(color, step)
+            for i in range(radius, 0, -1):
+                fade = 1 - i / radius
+                draw.ellipse(
+                    (radius - i, radius - i, radius + i - 1, radius + i - 1),
+                    fill=(r, g, b, int(a * fade))
+                )
+            return image
+
+        return self._get(("glow", color, radius, step), render)
+
+    def build(self, particle_colors=(), particle_sizes=(), ring_frames=(), glow_specs=()):
+        """
+        Pré-rend les sprites au démarrage
+
+        Args:
+            particle_colors: Couleurs des particules
+            particle_sizes: Diamètres des particules
+            ring_frames: Tuples (rayon, alpha, couleur) des anneaux
+            glow_specs: Tuples (rayon, couleur) des halos, rendus à chaque pas d'alpha
+        """
+        alphas = [step / self.ALPHA_STEPS for step in range(1, self.ALPHA_STEPS + 1)]
+
+        for color in particle_colors:
+            for size in particle_sizes:
+                for alpha in alphas:
+                    self.particle(color, size, alpha)
+
+        for radius, alpha, color in ring_frames:
+            self.ring(radius, alpha, color)
+
+        for radius, color in glow_specs:
+            for alpha in alphas:
+                self.glow(radius, alpha, color)
+
+        return len(self._photos)
+
+    @staticmethod
+    def pulse_frames(rings=3, start_radius=10, spacing=20, start_alpha=0.5,
+                     alpha_decay=0.15, grow=2, fade=0.05):
+        """
+        Séquence (rayon, alpha) de chaque anneau de l'effet de pulsation
+
+        Returns:
+            Liste (une entrée par anneau) de listes de (rayon, alpha)
+        """
+        sequences = []
+        for i in range(rings):
+            radius = start_radius + i * spacing
+            alpha = start_alpha - i * alpha_decay
+            frames = []
+            while alpha > 0:
+                frames.append((radius, alpha))
+                radius += grow
+                alpha -= fade
+            sequences.append(frames)
+        return sequences
+
+    def get_stats(self):
+        """Compteurs d'utilisation du cache"""
+        return {
+            "sprites": len(self._photos),
+            "hits": self.hits,
+            "misses": self.misses
+        }
@@ -5,26 +5,50 @@ import threading
 class AssistantTab(ctk.CTkFrame):
     """Onglet Assistant EXOCORTEX - Version complète"""
     
+    # Intervalle minimal entre deux rafraîchissements d'une réponse en flux (s)
+    STREAM_REFRESH = 0.05
+    
     def __init__(self, parent, assistant=None, voice_engine=None, mobile_mode=True):
         super().__init__(parent, fg_color="#0A0A0F")
         self.mobile_mode = mobile_mode
         
-        # Si assistant et voice_engine sont None, on les crée
-        if assistant is None:
-            from core.assistant import ZodiacAssistant
-            self.assistant = ZodiacAssistant()
-        else:
-            self.assistant = assistant
-            
-        if voice_engine is None:
-            from core.voice_engine import VoiceEngine
-            self.voice_engine = VoiceEngine()
-        else:
-            self.voice_engine = voice_engine
+        # Si assistant et voice_engine sont None, ils sont créés au premier usage
+        self._assistant = assistant
+        self._voice_engine = voice_engine
+        self._backend_lock = threading.Lock()
             
         self.microphone_active = False
+        self._voice_subscription = None
         self._setup_ui()
         
+    @property
+    def assistant(self):
+        """Assistant, créé au premier accès"""
+        if self._assistant is None:
+            with self._backend_lock:
+                if self._assistant is None:
+                    from core.assistant import ZodiacAssistant
+                    self._assistant = ZodiacAssistant()
+        return self._assistant
+        
+    @property
+    def voice_engine(self):
+        """Moteur vocal, créé au premier accès"""
+        if self._voice_engine is None:
+            with self._backend_lock:
+                if self._voice_engine is None:
+                    from core.voice_engine import VoiceEngine
+                    self._voice_engine = VoiceEngine()
+        return self._voice_engine
+        
+    def prewarm(self):
+        """Prépare l'assistant et le moteur vocal dans un thread d'arrière-plan"""
+        def _warm():
+            self.assistant
+            self.voice_engine
+            
+        threading.Thread(target=_warm, daemon=True).start()
+        
     def _setup_ui(self):
         """Interface responsive"""
         # Header
@@ -57,6 +81,16 @@ class AssistantTab(ctk.CTkFrame):
         # Message de bienvenue
         self._add_welcome_message()
         
+        # Transcription en direct (hypothèses partielles)
+        self.transcript_label = ctk.CTkLabel(
+            self,
+            text="",
+            font=("Segoe UI", 13, "italic"),
+            text_color="#8888AA",
+            anchor="w"
+        )
+        self.transcript_label.pack(fill="x", side="bottom", padx=20 if not self.mobile_mode else 15)
+        
         # Zone de saisie
         input_height = 80 if self.mobile_mode else 90
         input_frame = ctk.CTkFrame(self, fg_color="#111118", height=input_height)
@@ -160,46 +194,109 @@ class AssistantTab(ctk.CTkFrame):
             threading.Thread(target=self._start_listening, daemon=True).start()
         else:
             # Désactiver le micro
-            self.microphone_active = False
-            self.mic_btn.configure(fg_color="#6C63FF", text="🎤")
+            self._stop_mic()
             self._add_message("system", "🎤 Microphone désactivé")
             
+    def _stop_mic(self):
+        """Arrête l'écoute et remet le bouton au repos"""
+        self.microphone_active = False
+        self.mic_btn.configure(fg_color="#6C63FF", text="🎤")
+        self.transcript_label.configure(text="")
+        try:
+            self.voice_engine.stop_listening()
+        except Exception as e:
+            print(f"⚠️ Arrêt de l'écoute: {e}")
+            
     def _start_listening(self):
         """Démarre l'écoute vocale"""
         try:
-            self.voice_engine.start_listening()
-            # Simulation de transcription après 2 secondes
-            threading.Timer(2.0, self._simulate_voice_input).start()
+            engine = self.voice_engine
+            if self._voice_subscription is None and hasattr(engine, "events"):
+                # Les événements arrivent du thread d'écoute: passage au thread Tk
+                self._voice_subscription = engine.events.subscribe(
+                    lambda event: self.after(0, self._on_voice_event, event)
+                )
+            engine.start_listening()
         except Exception as e:
-            self._add_message("error", f"Erreur microphone: {str(e)}")
+            self.after(0, self._add_message, "error", f"Erreur microphone: {str(e)}")
             
-    def _simulate_voice_input(self):
-        """Simule une entrée vocale (pour le mode démo)"""
-        if self.microphone_active:
-            simulated_phrases = [
-                "Bonjour Exocortex",
-                "Quelle heure est-il ?",
-                "Ouvre mes applications",
-                "Quelle est la météo aujourd'hui ?",
-                "Joue de la musique"
-            ]
-            
-            import random
-            phrase = random.choice(simulated_phrases)
-            self._add_message("user", f"🎤 {phrase}")
+    def _on_voice_event(self, event):
+        """Retour immédiat: écoute → parole détectée → texte partiel → texte final"""
+        from core.voice_events import LISTENING, IDLE, SPEECH_DETECTED, PARTIAL, FINAL, ERROR
+        
+        if not self.microphone_active and event.type != IDLE:
+            return
             
-            # Traiter la phrase
-            threading.Timer(1.0, lambda: self._process_voice_input(phrase)).start()
+        if event.type == LISTENING:
+            self.transcript_label.configure(text="🎤 À l'écoute...")
+        elif event.type == SPEECH_DETECTED:
+            self.transcript_label.configure(text="🎤 ...")
+        elif event.type == PARTIAL:
+            self.transcript_label.configure(text=f"🎤 {event.text}...")
+        elif event.type == FINAL:
+            self.transcript_label.configure(text="")
+            self._add_message("user", f"🎤 {event.text}")
+            threading.Thread(target=self._process_voice_input, args=(event.text,), daemon=True).start()
+        elif event.type == ERROR:
+            self.transcript_label.configure(text=f"⚠️ {event.text}")
+        elif event.type == IDLE:
+            self.transcript_label.configure(text="")
             
     def _process_voice_input(self, text):
-        """Traite l'entrée vocale"""
+        """Traite l'entrée vocale (thread d'arrière-plan)"""
+        if hasattr(self.assistant, "process_query_stream"):
+            self._stream_response(text, speak=True)
+            self.after(0, self._on_voice_response, None)
+            return
         response = self.assistant.process_query(text)
-        self._add_message("exocortex", response)
+        self.after(0, self._on_voice_response, response)
         
-        # Désactiver le micro après réponse
+    def _on_voice_response(self, response):
+        """Affiche la réponse et désactive le micro"""
+        if response is not None:
+            self._add_message("exocortex", response)
         if self.microphone_active:
-            self.microphone_active = False
-            self.mic_btn.configure(fg_color="#6C63FF", text="🎤")
+            self._stop_mic()
+            
+    def _stream_response(self, text, speak=False):
+        """
+        Affiche la réponse au fil de l'eau (thread d'arrière-plan)
+        
+        Args:
+            speak: Lit chaque phrase terminée sans attendre la fin de la réponse
+        """
+        import time
+        from ai.streaming import SentenceChunker
+        
+        bubble = {}
+        chunker = SentenceChunker()
+        response = ""
+        last_update = 0.0
+        
+        for token in self.assistant.process_query_stream(text):
+            response += token
+            if speak:
+                for sentence in chunker.feed(token):
+                    self.voice_engine.speak(sentence)
+            # Au plus ~20 rafraîchissements par seconde
+            now = time.perf_counter()
+            if now - last_update >= self.STREAM_REFRESH:
+                last_update = now
+                self.after(0, self._update_streamed_message, bubble, response)
+                
+        self.after(0, self._update_streamed_message, bubble, response)
+        if speak:
+            rest = chunker.flush()
+            if rest:
+                self.voice_engine.speak(rest)
+                
+    def _update_streamed_message(self, bubble, text):
+        """Crée puis met à jour la bulle de la réponse en cours"""
+        if "label" not in bubble:
+            bubble["label"] = self._add_message("exocortex", text)
+        else:
+            bubble["label"].configure(text=text)
+            self.chat_container._parent_canvas.yview_moveto(1.0)
             
     def _send_message(self):
         """Envoie un message texte"""
@@ -218,6 +315,10 @@ class AssistantTab(ctk.CTkFrame):
         
     def _process_text_input(self, text):
         """Traite l'entrée texte"""
+        if hasattr(self.assistant, "process_query_stream"):
+            self._stream_response(text)
+            return
+            
         # Simuler un délai de traitement
         import time
         time.sleep(0.5)
@@ -286,6 +387,7 @@ class AssistantTab(ctk.CTkFrame):
         
         # Défiler vers le bas pour voir le nouveau message
         self.chat_container._parent_canvas.yview_moveto(1.0)
+        return msg_label
         
     def clear_chat(self):
         """Efface la conversation"""